@@ -0,0 +1,77 @@
+"""Compare the peak memory of EbookSaver and StreamingEbookSaver.
+
+Saves CHAPTERS generated chapters of PARAGRAPHS paragraphs, handed to the saver
+slightly out of order, and prints the peak RSS of a fresh process per saver::
+
+    PYTHONPATH=src uv run python benchmarks/ebook.py --chapters 10000
+"""
+
+import argparse
+import asyncio
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from yarl import URL
+
+from domain import LoadedChapter, SaverContext
+from infra.saver import EbookSaver, StreamingEbookSaver
+
+SAVERS = {i.__name__: i for i in (EbookSaver, StreamingEbookSaver)}
+
+
+async def save_book(saver: str, chapters: int, paragraphs: int, directory: Path):
+    ids = list(range(chapters))
+    # loaded concurrently, chapters finish a little out of order
+    rng = random.Random(0)
+    for i in range(0, chapters - 8, 8):
+        ids[i : i + 8] = rng.sample(ids[i : i + 8], 8)
+    context = SaverContext(title="Book", language="ru", covers=[], directory=directory)
+    with SAVERS[saver](context) as book:
+        for id in ids:
+            text = [f"Paragraph {i} of chapter {id}. " * 20 for i in range(paragraphs)]
+            chapter = LoadedChapter(
+                id=id,
+                name=f"Chapter {id}",
+                url=URL(f"http://e.com/{id}"),
+                paragraphs=text,
+                images=[],
+                title=f"Chapter {id}",
+            )
+            await book.save_chapter(chapter)
+
+
+def peak_rss(saver: str, chapters: int, paragraphs: int) -> float:
+    """Peak RSS in MiB of a child process saving the book with saver."""
+    command = [sys.executable, __file__, "--child", saver]
+    command += ["--chapters", str(chapters), "--paragraphs", str(paragraphs)]
+    output = subprocess.run(command, capture_output=True, check=True, text=True)
+    return float(output.stdout)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chapters", type=int, default=10000)
+    parser.add_argument("--paragraphs", type=int, default=20)
+    parser.add_argument("--child", choices=SAVERS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child is not None:
+        with tempfile.TemporaryDirectory() as directory:
+            coroutine = save_book(
+                args.child, args.chapters, args.paragraphs, Path(directory)
+            )
+            asyncio.run(coroutine)
+        # kilobytes on linux
+        print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)
+        return
+    print(f"{args.chapters} chapters of {args.paragraphs} paragraphs")
+    for saver in SAVERS:
+        rss = peak_rss(saver, args.chapters, args.paragraphs)
+        print(f"{saver:>20}: peak RSS {rss:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
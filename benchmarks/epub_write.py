@@ -0,0 +1,73 @@
+"""Time writing an image-heavy EPUB with ebooklib and with the saver's writer.
+
+Builds a book of CHAPTERS chapters of text with an image of SIZE KiB each
+(random bytes behind a JPEG signature, as incompressible as a photo) and times
+``epub.write_epub`` against ``write_book``::
+
+    PYTHONPATH=src uv run python benchmarks/epub_write.py --chapters 500 --size 256
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+# pyright: reportMissingTypeStubs=false
+from ebooklib import epub
+
+from infra.saver.epub_writer import write_book
+
+
+def make_book(chapters: int, size: int) -> epub.EpubBook:
+    book = epub.EpubBook()
+    book.set_title("Book")  # type: ignore
+    book.set_language("ru")  # type: ignore
+    pages: list[epub.EpubHtml] = []
+    for id in range(chapters):
+        image = epub.EpubImage()
+        image.file_name = f"images/{id}.jpg"
+        image.media_type = "image/jpeg"
+        image.content = b"\xff\xd8\xff\xe0" + os.urandom(size * 1024)
+        book.add_item(image)  # type: ignore
+        page = epub.EpubHtml(title=f"Chapter {id}", file_name=f"chapters/{id}.xhtml")
+        text = "".join(f"<p>Paragraph {i} of chapter {id}.</p>" * 20 for i in range(40))
+        page.set_content(  # type: ignore
+            f'<html><body>{text}<img src="../images/{id}.jpg"/></body></html>'
+        )
+        book.add_item(page)  # type: ignore
+        pages.append(page)
+    book.toc = pages  # type: ignore
+    book.spine = ["nav", *pages]
+    book.add_item(epub.EpubNcx())  # type: ignore
+    book.add_item(epub.EpubNav())  # type: ignore
+    return book
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chapters", type=int, default=500)
+    parser.add_argument("--size", help="KiB per image", type=int, default=256)
+    parser.add_argument("--level", help="zlib level", type=int, default=6)
+    args = parser.parse_args()
+    book = make_book(args.chapters, args.size)
+    total = args.chapters * args.size / 1024
+    print(f"{args.chapters} chapters, {total:.0f} MiB of images")
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "book.epub"
+        writers = {
+            "write_epub": lambda: epub.write_epub(  # type: ignore
+                str(path), book, {"compresslevel": args.level}
+            ),
+            "write_book": lambda: write_book(path, book, args.level),
+        }
+        for name, write in writers.items():
+            started = time.perf_counter()
+            write()
+            elapsed = time.perf_counter() - started
+            size = path.stat().st_size / 2**20
+            print(f"{name:>10}: {elapsed:6.2f} s, {size:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Compare the asyncio and uvloop event loops on real book downloads.
+
+Loads the main page and the first chapters of every given book once per loop
+and prints the best wall time per site::
+
+    PYTHONPATH=src uv run --extra speedups python benchmarks/event_loop.py \
+        https://tl.rulate.ru/book/12345 https://ranobes.com/ranobe/123-x.html
+"""
+
+import argparse
+import asyncio
+import time
+
+import aiohttp
+from yarl import URL
+
+from config.data import SessionSettings
+from containers import LoaderService
+from infra.loader import BasicImageLoader
+from utils import get_loop_factory
+
+LOOPS = ("asyncio", "uvloop")
+
+
+async def download(url: URL, chapters: int) -> None:
+    settings = SessionSettings()
+    async with aiohttp.ClientSession(
+        cookies=settings.cookies, timeout=settings.timeout, headers=settings.headers
+    ) as session:
+        loader = LoaderService(BasicImageLoader(session), session).get(url)
+        main_page = await loader.load()
+        chapter_loader = loader.get_loader_for_chapter()
+        async with asyncio.TaskGroup() as tg:
+            for chapter in main_page.chapters[:chapters]:
+                tg.create_task(chapter_loader.load_chapter(chapter))
+
+
+def measure(url: URL, chapters: int, loop: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        asyncio.run(download(url, chapters), loop_factory=get_loop_factory(loop))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("urls", nargs="+", type=URL)
+    parser.add_argument("-n", "--chapters", type=int, default=20)
+    parser.add_argument("-r", "--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'site':<16}{'asyncio, s':>12}{'uvloop, s':>12}{'speedup':>10}")
+    for url in args.urls:
+        baseline, candidate = (
+            measure(url, args.chapters, loop, args.repeat) for loop in LOOPS
+        )
+        print(
+            f"{url.host:<16}{baseline:>12.2f}{candidate:>12.2f}"
+            f"{baseline / candidate:>9.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
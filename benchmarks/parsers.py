@@ -0,0 +1,112 @@
+"""Compare the BeautifulSoup and lxml parser backends on real pages.
+
+Fetches the main page and the first chapters of every given book once, then
+times parsing plus extraction with the site parsers on each backend::
+
+    PYTHONPATH=src uv run python benchmarks/parsers.py \
+        https://tl.rulate.ru/book/12345 https://ranobes.com/ranobe/123-x.html
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Callable
+from typing import Any
+
+import aiohttp
+from yarl import URL
+
+from config.data import SessionSettings
+from containers import LoaderService
+from infra.loader import BasicImageLoader
+from infra.main_page.document import PARSER_BACKENDS, Node
+from infra.main_page.ifreedom import IfreedomChapterParser, IfreedomMainPageParser
+from infra.main_page.ranobes import RanobesChapterParser, RanobesMainPageParser
+from infra.main_page.tlrulate import TextContainerParser, TlRulateMainPageParser
+from utils.bs4 import get_html
+
+BACKENDS = ("bs4", "lxml")
+
+type SiteParser = Callable[[Node, URL], Any]
+
+# main page and chapter parser of every site serving html
+PARSERS: dict[str, tuple[SiteParser, SiteParser]] = {
+    "tl.rulate.ru": (
+        lambda page, url: TlRulateMainPageParser(page, url, url.origin()).parse(),
+        lambda page, _: TextContainerParser(page).parse(),
+    ),
+    "ranobes.com": (
+        lambda page, url: RanobesMainPageParser(page, url).parse(),
+        lambda page, url: RanobesChapterParser(page, url).parse(),
+    ),
+    "ifreedom.su": (
+        lambda page, url: IfreedomMainPageParser(page, url).parse(),
+        lambda page, url: IfreedomChapterParser(page, url).parse(),
+    ),
+}
+
+
+async def fetch(url: URL, chapters: int) -> tuple[str, list[tuple[URL, str]]]:
+    settings = SessionSettings()
+    async with aiohttp.ClientSession(
+        cookies=settings.cookies, timeout=settings.timeout, headers=settings.headers
+    ) as session:
+        loader = LoaderService(BasicImageLoader(session), session).get(url)
+        main_page = await get_html(session, url)
+        info = await loader.load()
+        pages = [
+            (i.url, await get_html(session, i.url)) for i in info.chapters[:chapters]
+        ]
+    return main_page, pages
+
+
+def measure(parse: SiteParser, url: URL, html: str, backend: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(PARSER_BACKENDS[backend].parse(html), url)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(host: str, kind: str, timings: dict[str, float]) -> None:
+    baseline, candidate = (timings[i] * 1000 for i in BACKENDS)
+    print(
+        f"{host:<16}{kind:<10}{baseline:>10.2f}{candidate:>10.2f}"
+        f"{baseline / candidate:>9.2f}x"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("urls", nargs="+", type=URL)
+    parser.add_argument("-n", "--chapters", type=int, default=5)
+    parser.add_argument("-r", "--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'site':<16}{'page':<10}{'bs4, ms':>10}{'lxml, ms':>10}{'speedup':>10}")
+    for url in args.urls:
+        if url.host not in PARSERS:
+            print(f"{url.host:<16}no html parsers")
+            continue
+        parse_main, parse_chapter = PARSERS[url.host]
+        main_page, chapters = asyncio.run(fetch(url, args.chapters))
+        report(
+            url.host,
+            "main",
+            {i: measure(parse_main, url, main_page, i, args.repeat) for i in BACKENDS},
+        )
+        timings = dict.fromkeys(BACKENDS, 0.0)
+        for chapter_url, html in chapters:
+            for backend in BACKENDS:
+                timings[backend] += measure(
+                    parse_chapter, chapter_url, html, backend, args.repeat
+                )
+        if chapters:
+            report(
+                url.host, "chapter", {i: timings[i] / len(chapters) for i in timings}
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Compare full and region filtered parses of real chapter pages.
+
+Fetches the first chapters of every given book once, then times parsing plus
+extraction with and without the regions declared by the chapter parser, and
+counts the elements each document keeps::
+
+    PYTHONPATH=src uv run python benchmarks/regions.py \
+        https://tl.rulate.ru/book/12345 https://ranobes.com/ranobe/123-x.html
+"""
+
+import argparse
+import asyncio
+import time
+
+from parsers import PARSERS, SiteParser, fetch
+from yarl import URL
+
+from infra.main_page.document import PARSER_BACKENDS, Regions
+from infra.main_page.ifreedom import IfreedomChapterParser
+from infra.main_page.ranobes import RanobesChapterParser
+from infra.main_page.tlrulate import TextContainerParser
+
+REGIONS: dict[str, Regions] = {
+    "tl.rulate.ru": TextContainerParser.regions,
+    "ranobes.com": RanobesChapterParser.regions,
+    "ifreedom.su": IfreedomChapterParser.regions,
+}
+
+
+def measure(
+    parse: SiteParser,
+    pages: list[tuple[URL, str]],
+    backend: str,
+    regions: Regions,
+    repeat: int,
+) -> tuple[float, int]:
+    """Mean of the best time per page, and the elements kept per page."""
+    total, elements = 0.0, 0
+    for url, html in pages:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            parse(PARSER_BACKENDS[backend].parse(html, regions), url)
+            best = min(best, time.perf_counter() - start)
+        total += best
+        elements += len(PARSER_BACKENDS[backend].parse(html, regions).find_all())
+    return total / len(pages), elements // len(pages)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("urls", nargs="+", type=URL)
+    parser.add_argument("-n", "--chapters", type=int, default=5)
+    parser.add_argument("-r", "--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(
+        f"{'site':<16}{'backend':<9}{'full, ms':>10}{'filtered, ms':>14}"
+        f"{'speedup':>9}{'elements':>18}"
+    )
+    for url in args.urls:
+        if url.host not in REGIONS:
+            print(f"{url.host:<16}no html parsers")
+            continue
+        _, pages = asyncio.run(fetch(url, args.chapters))
+        if not pages:
+            continue
+        parse = PARSERS[url.host][1]
+        for backend in PARSER_BACKENDS:
+            full, full_elements = measure(parse, pages, backend, (), args.repeat)
+            filtered, filtered_elements = measure(
+                parse, pages, backend, REGIONS[url.host], args.repeat
+            )
+            print(
+                f"{url.host:<16}{backend:<9}{full * 1000:>10.2f}"
+                f"{filtered * 1000:>14.2f}{full / filtered:>8.2f}x"
+                f"{f'{full_elements} -> {filtered_elements}':>18}"
+            )
+
+
+if __name__ == "__main__":
+    main()
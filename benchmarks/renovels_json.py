@@ -0,0 +1,156 @@
+"""Compare ways of validating Renovels chapter responses.
+
+Fetches the first chapters of every given book once, then times the per
+chapter cost of the former path (``json.loads`` and the full response model)
+against the lean model after ``json.loads``, after ``orjson.loads`` when orjson
+is installed, and validated by pydantic straight from bytes::
+
+    PYTHONPATH=src uv run python benchmarks/renovels_json.py \
+        https://renovels.org/novel/some-title
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+import aiohttp
+from yarl import URL
+
+from config.data import SessionSettings
+from containers import LoaderService
+from infra.loader import BasicImageLoader
+from infra.main_page.renovels.models import RenovelsBaseModel, RenovelsChapter
+from utils.bs4 import get_bytes_response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# the full chapter response the loader validated before
+class CoverImage(RenovelsBaseModel):
+    mid: str
+    high: str
+
+
+class Publisher(RenovelsBaseModel):
+    id: int
+    name: str
+    dir: str
+    show_donate: bool
+    donate_page_text: str | None = None
+    cover: CoverImage
+    tagline: str | None = None
+    img: CoverImage
+
+
+class Server(RenovelsBaseModel):
+    id: int
+    name: str
+    link: str
+    fallback_link: str
+
+
+class ChapterNavigation(RenovelsBaseModel):
+    id: int
+    tome: int
+    chapter: str
+    index: int
+    is_paid: bool
+
+
+class RenovelsChapterResponse(RenovelsBaseModel):
+    id: int
+    tome: int
+    chapter: str
+    name: str
+    score: int
+    upload_date: datetime
+    content: str
+    is_paid: bool
+    purchase_type: int
+    title_id: int
+    volume_id: int | None = None
+    branch_id: int
+    price: int | None = None
+    pub_date: datetime | None = None
+    index: int
+    delay_pub_date: datetime | None = None
+    is_published: bool
+    server: Server | None = None
+    publishers: list[Publisher]
+    rated: bool
+    is_bought: bool
+    previous: ChapterNavigation | None = None
+    next: ChapterNavigation | None = None
+    content_type: str
+
+
+type Validate = Callable[[bytes], Any]
+
+PATHS: dict[str, Validate] = {
+    "json + full": lambda body: RenovelsChapterResponse.model_validate(
+        json.loads(body)
+    ),
+    "json + lean": lambda body: RenovelsChapter.model_validate(json.loads(body)),
+    "bytes + lean": RenovelsChapter.model_validate_json,
+}
+if orjson is not None:
+    PATHS["orjson + lean"] = lambda body: RenovelsChapter.model_validate(
+        orjson.loads(body)
+    )
+
+
+async def fetch(url: URL, chapters: int) -> list[bytes]:
+    settings = SessionSettings()
+    async with aiohttp.ClientSession(
+        cookies=settings.cookies, timeout=settings.timeout, headers=settings.headers
+    ) as session:
+        loader = LoaderService(BasicImageLoader(session), session).get(url)
+        info = await loader.load()
+        return [
+            await get_bytes_response(session, i.url) for i in info.chapters[:chapters]
+        ]
+
+
+def measure(validate: Validate, bodies: list[bytes], repeat: int) -> float:
+    """Mean over the chapters of the best time per chapter."""
+    total = 0.0
+    for body in bodies:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            validate(body)
+            best = min(best, time.perf_counter() - start)
+        total += best
+    return total / len(bodies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("urls", nargs="+", type=URL)
+    parser.add_argument("-n", "--chapters", type=int, default=10)
+    parser.add_argument("-r", "--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'book':<40}{'path':<16}{'per chapter, us':>16}{'speedup':>9}")
+    for url in args.urls:
+        bodies = asyncio.run(fetch(url, args.chapters))
+        if not bodies:
+            continue
+        timings = {i: measure(v, bodies, args.repeat) for i, v in PATHS.items()}
+        baseline = timings["json + full"]
+        for name, timing in timings.items():
+            print(
+                f"{url.path[-39:]:<40}{name:<16}{timing * 10**6:>16.1f}"
+                f"{baseline / timing:>8.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
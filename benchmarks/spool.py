@@ -0,0 +1,97 @@
+"""Compare the peak memory of saving images kept in memory and spooled to disk.
+
+Serves IMAGES random images of SIZE KiB from a local server, loads them all
+through ``BasicImageLoader`` into an ``EbookSaver`` and prints the peak RSS of a
+fresh process per mode::
+
+    PYTHONPATH=src uv run python benchmarks/spool.py --images 400 --size 512
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+from yarl import URL
+
+from domain import Image, LoadedChapter, SaverContext
+from infra.loader import BasicImageLoader
+from infra.loader.spool import SpoolScope
+from infra.saver import EbookSaver
+
+MODES = ("memory", "spool")
+# start of a JPEG, so the body passes as an image
+JPEG = b"\xff\xd8\xff\xe0"
+
+
+async def save_book(mode: str, images: int, size: int, directory: Path) -> None:
+    body = os.urandom(size * 1024)
+
+    async def image(request: web.Request) -> web.Response:
+        # distinct content, or the saver would store a single image
+        tag = int(request.match_info["id"]).to_bytes(4)
+        return web.Response(body=JPEG + tag + body, content_type="image/jpeg")
+
+    app = web.Application()
+    app.router.add_get("/{id}.jpg", image)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    base = URL(f"http://127.0.0.1:{runner.addresses[0][1]}")
+    context = SaverContext(title="Book", language="ru", covers=[], directory=directory)
+    spool = SpoolScope(directory / "spool") if mode == "spool" else None
+    try:
+        async with aiohttp.ClientSession() as session:
+            loader = BasicImageLoader(session)
+            with spool or contextlib.nullcontext(), EbookSaver(context) as saver:
+                for id in range(images):
+                    loaded = await loader.load_image(Image(base / f"{id}.jpg"))
+                    assert loaded is not None
+                    chapter = LoadedChapter(
+                        id=id,
+                        name=f"Chapter {id}",
+                        url=base / str(id),
+                        paragraphs=["text"],
+                        images=[loaded],
+                        title=f"Chapter {id}",
+                    )
+                    await saver.save_chapter(chapter)
+    finally:
+        await runner.cleanup()
+
+
+def peak_rss(mode: str, images: int, size: int) -> float:
+    """Peak RSS in MiB of a child process saving the book in mode."""
+    command = [sys.executable, __file__, "--child", mode]
+    command += ["--images", str(images), "--size", str(size)]
+    output = subprocess.run(command, capture_output=True, check=True, text=True)
+    return float(output.stdout)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", type=int, default=400)
+    parser.add_argument("--size", help="KiB per image", type=int, default=512)
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child is not None:
+        with tempfile.TemporaryDirectory() as directory:
+            asyncio.run(save_book(args.child, args.images, args.size, Path(directory)))
+        # kilobytes on linux
+        print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)
+        return
+    total = args.images * args.size / 1024
+    print(f"{args.images} images, {total:.0f} MiB")
+    for mode in MODES:
+        print(f"{mode:>8}: peak RSS {peak_rss(mode, args.images, args.size):7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
+import secrets
 from pathlib import Path
-from typing import Annotated
+from typing import Annotated, Literal
 
 from aiohttp import ClientTimeout
-from pydantic import AfterValidator, BaseModel, Field, HttpUrl
+from pydantic import AfterValidator, BaseModel, Field, HttpUrl, SecretStr
 from pydantic_settings import BaseSettings
 from yarl import URL
 
@@ -20,6 +21,83 @@ class LimiterSettings(BaseModel):
     time_period: float
 
 
+class DeadlineSettings(BaseModel):
+    chapter: float | None = Field(default=None, gt=0)
+    run: float | None = Field(default=None, gt=0)
+
+
+class WatchSettings(BaseModel):
+    interval: float = Field(default=3600.0, gt=0)
+    jitter: float = Field(default=0.2, ge=0, lt=1)
+    polls_per_minute: float = Field(default=6.0, gt=0)
+
+
+def generate_token() -> SecretStr:
+    return SecretStr(secrets.token_urlsafe(24))
+
+
+class JobServerSettings(BaseModel):
+    host: str = "127.0.0.1"
+    port: int = Field(default=8700, ge=0, lt=2**16)
+    lease: float = Field(default=60.0, gt=0)
+    # shared with the remote workers, generated when not given
+    token: SecretStr = Field(default_factory=generate_token, min_length=16)
+
+
+class DaemonSettings(BaseModel):
+    host: str = "127.0.0.1"
+    port: int = Field(default=8765, ge=0, lt=2**16)
+
+
+class ImageSettings(BaseModel):
+    """How chapter and cover images are requested.
+
+    A url answered as gone is skipped for ``dead_ttl`` seconds, ``0`` keeps no
+    record of such urls.
+    """
+
+    timeout: float = Field(default=10.0, gt=0)
+    attempts: int = Field(default=3, gt=0)
+    backoff: float = Field(default=1.0, ge=0)
+    per_host: int = Field(default=4, gt=0)
+    dead_ttl: float = Field(default=7 * 24 * 3600, ge=0)
+
+
+class VolumeSettings(BaseModel):
+    """Where EbookSaver cuts a book into volumes, ``size`` is in bytes."""
+
+    chapters: int | None = Field(default=None, gt=0)
+    size: int | None = Field(default=None, gt=0)
+    source: bool = False
+
+
+class TranscodeSettings(BaseModel):
+    """How loaded images are recompressed before they are saved.
+
+    ``format`` ``None`` keeps the format of every image, and sizes ``None`` keep
+    its resolution. ``processes`` ``0`` starts one process per core.
+    """
+
+    max_width: int | None = Field(default=None, gt=0)
+    max_height: int | None = Field(default=None, gt=0)
+    format: Literal["JPEG", "PNG", "WEBP"] | None = None
+    quality: int = Field(default=85, ge=1, le=100)
+    strip_metadata: bool = True
+    processes: int = Field(default=0, ge=0)
+
+
+TRANSCODE_PROFILES: dict[str, TranscodeSettings] = {
+    # 6-8" e-ink screens show no more pixels than this, nor colors
+    "ereader": TranscodeSettings(
+        max_width=1264, max_height=1680, format="JPEG", quality=75
+    ),
+    "tablet": TranscodeSettings(
+        max_width=2048, max_height=2048, format="JPEG", quality=85
+    ),
+    "strip": TranscodeSettings(quality=95),
+}
+
+
 class SessionSettings(BaseModel):
     model_config = {"arbitrary_types_allowed": True}
 
@@ -48,9 +126,56 @@ def http_url(value: URL) -> URL:
 
 class Settings(BaseSettings):
     working_directory: Path = Path(".")
+    state_directory: Path = Path(".requests_u")
     chunk_size: int = 40
-    url: Annotated[URL, AfterValidator(http_url)]
+    urls: list[Annotated[URL, AfterValidator(http_url)]] = Field(
+        default_factory=list[URL]
+    )
+    parallel_books: int = Field(default=4, gt=0)
+    workers: int = Field(default=0, ge=0)
+    job_server: JobServerSettings | None = None
     trim_args: TrimSettings
     saver: type
     limiter: LimiterSettings
+    deadline: DeadlineSettings = Field(default=DeadlineSettings())
+    memory_budget: int | None = Field(default=None, gt=0)
+    journal: bool = True
+    update: bool = False
+    shared_images: bool = False
+    images: ImageSettings = Field(default=ImageSettings())
+    transcode: TranscodeSettings | None = None
+    volumes: VolumeSettings | None = None
+    epub_compression: int = Field(default=6, ge=0, le=9)
+    watch: WatchSettings | None = None
+    daemon: DaemonSettings | None = None
+    archive: Path | None = None
+    replay: list[Path] = Field(default_factory=list[Path])
+    event_loop: Literal["asyncio", "uvloop", "auto"] = "asyncio"
+    parser: Literal["lxml", "bs4"] = "lxml"
+    session: SessionSettings = Field(default=SessionSettings())
+
+
+class WorkerSettings(BaseModel):
+    """Settings a worker process loads chapters with."""
+
+    session: SessionSettings = Field(default=SessionSettings())
+    limiter: LimiterSettings
+    deadline: DeadlineSettings = Field(default=DeadlineSettings())
+    chunk_size: int = Field(default=40, gt=0)
+    state_directory: Path = Path(".requests_u")
+    images: ImageSettings = Field(default=ImageSettings())
+    transcode: TranscodeSettings | None = None
+    event_loop: Literal["asyncio", "uvloop", "auto"] = "asyncio"
+    parser: Literal["lxml", "bs4"] = "lxml"
+
+
+class RemoteWorkerSettings(BaseModel):
+    model_config = {"arbitrary_types_allowed": True}
+
+    coordinator: Annotated[URL, AfterValidator(http_url)]
+    token: SecretStr
+    name: str | None = None
+    concurrency: int = Field(default=8, gt=0)
+    event_loop: Literal["asyncio", "uvloop", "auto"] = "asyncio"
+    parser: Literal["lxml", "bs4"] = "lxml"
     session: SessionSettings = Field(default=SessionSettings())
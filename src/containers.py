@@ -1,23 +1,42 @@
 from __future__ import annotations
 
+import multiprocessing
 from collections.abc import AsyncIterator
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from pathlib import Path
 
 import aiohttp
 from aiohttp.client import ClientSession
-from aiolimiter import AsyncLimiter
 from dependency_injector import containers, providers
 from loguru import logger
 from yarl import URL
 
-from config.data import LimiterSettings, SessionSettings, Settings
+from config.data import (
+    ImageSettings,
+    LimiterSettings,
+    SessionSettings,
+    Settings,
+    TranscodeSettings,
+)
+from infra.archive import ArchiveRecorder
 from infra.console.settings_provider import ConsoleSettingsProvider
-from infra.loader import BasicImageLoader
+from infra.journal import (
+    FileBookManifest,
+    FileChapterJournal,
+    FileDeadUrls,
+    FileWatchState,
+)
+from infra.loader import ResilientImageLoader, TranscodingImageLoader
+from infra.loader.transcoding import require_pillow
 from infra.main_page.ifreedom import IfreefomLoader
 from infra.main_page.ranobes import RanobesLoader
 from infra.main_page.renovels import RenovelsLoader
 from infra.main_page.tlrulate import TlRulateLoader
 from logic import ImageLoader, MainPageLoader
+from logic.dead_urls import DeadUrls
+from logic.memory_budget import MemoryBudget
+from logic.rate_limit import HostLimiter
 
 
 @dataclass()
@@ -35,7 +54,10 @@ def init_settings() -> Settings:
 
 async def init_session(settings: SessionSettings) -> AsyncIterator[ClientSession]:
     s = aiohttp.ClientSession(
-        cookies=settings.cookies, timeout=settings.timeout, headers=settings.headers
+        cookies=settings.cookies,
+        timeout=settings.timeout,
+        headers=settings.headers,
+        middlewares=(ArchiveRecorder(),),
     )
     try:
         yield s
@@ -43,10 +65,43 @@ async def init_session(settings: SessionSettings) -> AsyncIterator[ClientSession
         await s.close()
 
 
+def init_dead_urls(state_directory: Path, settings: ImageSettings) -> DeadUrls | None:
+    if not settings.dead_ttl:
+        return None
+    return FileDeadUrls.for_state(state_directory, settings.dead_ttl)
+
+
+async def init_image_loader(
+    session: ClientSession,
+    images: ImageSettings,
+    settings: TranscodeSettings | None,
+    dead_urls: DeadUrls | None = None,
+) -> AsyncIterator[ImageLoader]:
+    loader = ResilientImageLoader(session, images, dead_urls)
+    if settings is None:
+        yield loader
+        return
+    require_pillow()
+    with ProcessPoolExecutor(
+        settings.processes or None, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        transcoding = TranscodingImageLoader(loader, settings, pool)
+        try:
+            yield transcoding
+        finally:
+            logger.info(transcoding.report.summary)
+
+
 class LoaderService:
-    def __init__(self, image_loader: ImageLoader, session: ClientSession) -> None:
+    def __init__(
+        self,
+        image_loader: ImageLoader,
+        session: ClientSession,
+        limiter: HostLimiter | None = None,
+    ) -> None:
         self.image_loader = image_loader
         self.session = session
+        self.limiter = limiter
 
     def get(self, url: URL) -> MainPageLoader:
         logger.debug(f"get {url.host=}")
@@ -62,11 +117,11 @@ class LoaderService:
                 parser = IfreefomLoader
             case _:
                 raise FindLoaderException(url)
-        return parser(url, self.image_loader, self.session)
+        return parser(url, self.image_loader, self.session, self.limiter)
 
 
-def setup_limiter(settings: LimiterSettings) -> AsyncLimiter:
-    return AsyncLimiter(settings.max_rate, settings.time_period)
+def setup_limiter(settings: LimiterSettings) -> HostLimiter:
+    return HostLimiter(settings.max_rate, settings.time_period)
 
 
 class Container(containers.DeclarativeContainer):
@@ -74,13 +129,31 @@ class Container(containers.DeclarativeContainer):
     session: providers.Resource[ClientSession] = providers.Resource(
         init_session, settings=settings.provided.session
     )
-    image_loader: providers.Singleton[ImageLoader] = providers.Singleton(
-        BasicImageLoader, session
+    dead_urls: providers.Singleton[DeadUrls | None] = providers.Singleton(
+        init_dead_urls, settings.provided.state_directory, settings.provided.images
     )
-    loader_service = providers.Singleton(
-        LoaderService, image_loader=image_loader, session=session
+    image_loader: providers.Resource[ImageLoader] = providers.Resource(
+        init_image_loader,
+        session,
+        settings.provided.images,
+        settings.provided.transcode,
+        dead_urls,
     )
-
-    limiter: providers.Singleton[AsyncLimiter] = providers.Singleton(
+    limiter: providers.Singleton[HostLimiter] = providers.Singleton(
         setup_limiter, settings.provided.limiter
     )
+    loader_service = providers.Singleton(
+        LoaderService, image_loader=image_loader, session=session, limiter=limiter
+    )
+    memory_budget: providers.Singleton[MemoryBudget] = providers.Singleton(
+        MemoryBudget, settings.provided.memory_budget
+    )
+    journal_factory: providers.Factory[FileChapterJournal] = providers.Factory(
+        FileChapterJournal.for_book, root=settings.provided.state_directory
+    )
+    manifest_factory: providers.Factory[FileBookManifest] = providers.Factory(
+        FileBookManifest.for_book, root=settings.provided.state_directory
+    )
+    watch_state_factory: providers.Factory[FileWatchState] = providers.Factory(
+        FileWatchState.for_book, root=settings.provided.state_directory
+    )
@@ -0,0 +1,196 @@
+import asyncio
+import shutil
+import uuid
+from dataclasses import dataclass, field
+from enum import StrEnum
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote
+
+from aiohttp import web
+from loguru import logger
+from pydantic import BaseModel, Field, ValidationError
+from yarl import URL
+
+from config import TrimSettings
+from config.data import http_url
+from containers import FindLoaderException
+from downloader import BookDownloader, BookStatus
+from logic.exceptions.base import BookAlreadyQueuedError
+from utils import get_saver_by_name
+from utils.exceptions import FindSaverError
+
+
+class JobState(StrEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class JobRequest(BaseModel):
+    url: str
+    from_: int = Field(default=0, alias="from", ge=0)
+    to: int = Field(default=10**10, ge=0)
+    saver: str | None = None
+    update: bool = False
+
+
+@dataclass(eq=False)
+class DownloadJob:
+    id: str
+    url: URL
+    state: JobState = JobState.QUEUED
+    status: BookStatus = field(default_factory=BookStatus)
+    error: str | None = None
+    task: asyncio.Task[None] | None = None
+
+    def cancelled_before_start(self) -> None:
+        if self.state == JobState.QUEUED:
+            self.state = JobState.CANCELLED
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (JobState.DONE, JobState.FAILED, JobState.CANCELLED)
+
+    def to_json(self) -> dict[str, Any]:
+        progress = self.status.progress
+        artifact = self.status.artifact
+        return {
+            "id": self.id,
+            "url": str(self.url),
+            "state": self.state,
+            "title": self.status.title,
+            "done": progress.n if progress is not None else 0,
+            "total": progress.total if progress is not None else None,
+            "deferred": [i.base_name for i in self.status.deferred],
+            "error": self.error,
+            "artifact": str(artifact.resolve()) if artifact is not None else None,
+        }
+
+
+@dataclass(eq=False)
+class DownloadDaemon:
+    """Local HTTP API running downloads in one warm process.
+
+    Every job shares the session, the per-host limiter, the memory budget and
+    the worker pool of the process, and at most ``parallel_books`` jobs run at
+    the same time.
+    """
+
+    downloader: BookDownloader
+    books: asyncio.Semaphore
+    jobs: dict[str, DownloadJob] = field(default_factory=dict[str, DownloadJob])
+
+    def application(self) -> web.Application:
+        app = web.Application()
+        app.add_routes(
+            [
+                web.post("/jobs", self._submit),
+                web.get("/jobs", self._list),
+                web.get("/jobs/{id}", self._status),
+                web.delete("/jobs/{id}", self._cancel),
+                web.get("/jobs/{id}/artifact", self._artifact),
+            ]
+        )
+        app.on_shutdown.append(self._cancel_all)
+        return app
+
+    async def serve(self, host: str, port: int) -> None:
+        runner = web.AppRunner(self.application(), access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, host, port).start()
+            logger.info(f"daemon listens on http://{host}:{port}")
+            await asyncio.Event().wait()
+        finally:
+            await runner.cleanup()
+
+    def submit(self, request: JobRequest) -> DownloadJob:
+        url = URL(request.url)
+        http_url(url)
+        self.downloader.loader_service.get(url)
+        if any(i.url == url and not i.finished for i in self.jobs.values()):
+            raise BookAlreadyQueuedError(book_url=str(url))
+        update: dict[str, Any] = {
+            "trim_args": TrimSettings(
+                from_=request.from_, to=request.to, interactive=False
+            ),
+            "update": request.update,
+        }
+        if request.saver is not None:
+            update["saver"] = get_saver_by_name(request.saver)
+        downloader = self.downloader.with_args(**update)
+        job = DownloadJob(uuid.uuid4().hex[:12], url)
+        job.task = asyncio.create_task(self._run(job, downloader))
+        job.task.add_done_callback(lambda _: job.cancelled_before_start())
+        self.jobs[job.id] = job
+        return job
+
+    async def _run(self, job: DownloadJob, downloader: BookDownloader) -> None:
+        try:
+            async with self.books:
+                job.state = JobState.RUNNING
+                await downloader.download_book(job.url, True, job.status)
+        except asyncio.CancelledError:
+            job.state = JobState.CANCELLED
+            logger.info(f"job {job.id} cancelled")
+        except Exception as e:
+            job.state = JobState.FAILED
+            job.error = repr(e)
+            logger.opt(exception=e).error(f"job {job.id} failed")
+        else:
+            job.state = JobState.DONE
+            logger.info(f"job {job.id} done: {job.status.artifact}")
+
+    def _get(self, request: web.Request) -> DownloadJob:
+        job = self.jobs.get(request.match_info["id"])
+        if job is None:
+            raise web.HTTPNotFound(text="unknown job")
+        return job
+
+    async def _submit(self, request: web.Request) -> web.Response:
+        try:
+            job = self.submit(JobRequest.model_validate(await request.json()))
+        except ValidationError as e:
+            raise web.HTTPBadRequest(text=str(e)) from e
+        except (FindLoaderException, FindSaverError) as e:
+            raise web.HTTPBadRequest(text=e.message) from e
+        except BookAlreadyQueuedError as e:
+            raise web.HTTPConflict(text=e.message) from e
+        return web.json_response(job.to_json(), status=201)
+
+    async def _list(self, _: web.Request) -> web.Response:
+        return web.json_response([i.to_json() for i in self.jobs.values()])
+
+    async def _status(self, request: web.Request) -> web.Response:
+        return web.json_response(self._get(request).to_json())
+
+    async def _cancel(self, request: web.Request) -> web.Response:
+        job = self._get(request)
+        if job.finished or job.task is None:
+            raise web.HTTPConflict(text=f"job is {job.state}")
+        job.task.cancel()
+        return web.json_response(job.to_json(), status=202)
+
+    async def _artifact(self, request: web.Request) -> web.StreamResponse:
+        job = self._get(request)
+        artifact = job.status.artifact
+        if job.state != JobState.DONE or artifact is None or not artifact.exists():
+            raise web.HTTPConflict(text=f"job is {job.state}")
+        if artifact.is_dir():
+            artifact = await asyncio.to_thread(make_archive, artifact)
+        disposition = f"attachment; filename*=UTF-8''{quote(artifact.name)}"
+        return web.FileResponse(artifact, headers={"Content-Disposition": disposition})
+
+    async def _cancel_all(self, _: web.Application) -> None:
+        tasks = [i.task for i in self.jobs.values() if i.task and not i.finished]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def make_archive(directory: Path) -> Path:
+    """Zip a book directory next to it."""
+    return Path(shutil.make_archive(str(directory), "zip", directory))
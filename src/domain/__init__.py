@@ -1,13 +1,16 @@
 from .chapters import Chapter, LoadedChapter
-from .images import Image, LoadedImage
+from .images import AnyLoadedImage, Image, LoadedImage, SpooledImage
 from .main_page import MainPageInfo
-from .saver_context import SaverContext
+from .saver_context import SaverContext, VolumeSplit
 
 __all__ = [
     "Chapter",
     "LoadedChapter",
     "Image",
     "LoadedImage",
+    "SpooledImage",
+    "AnyLoadedImage",
     "SaverContext",
+    "VolumeSplit",
     "MainPageInfo",
 ]
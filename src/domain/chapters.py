@@ -1,9 +1,9 @@
 from collections.abc import Sequence
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from yarl import URL
 
-from domain.images import LoadedImage
+from domain.images import AnyLoadedImage
 
 
 @dataclass(frozen=True, slots=True)
@@ -11,6 +11,8 @@ class Chapter:
     id: int
     name: str
     url: URL
+    # volume of the book on the site, when the site groups chapters in volumes
+    volume: int | None = field(default=None, kw_only=True, compare=False)
 
     def __str__(self) -> str:
         return self.base_name
@@ -23,5 +25,13 @@ class Chapter:
 @dataclass(frozen=True, slots=True)
 class LoadedChapter(Chapter):
     paragraphs: Sequence[str]
-    images: Sequence[LoadedImage]
+    images: Sequence[AnyLoadedImage]
     title: str
+
+    @property
+    def text_nbytes(self) -> int:
+        return sum(len(i.encode()) for i in self.paragraphs)
+
+    @property
+    def nbytes(self) -> int:
+        return self.text_nbytes + sum(i.nbytes for i in self.images)
@@ -1,4 +1,6 @@
+import hashlib
 from dataclasses import dataclass
+from pathlib import Path
 
 from yarl import URL
 
@@ -19,3 +21,40 @@ class Image:
 @dataclass(frozen=True, slots=True)
 class LoadedImage(Image):
     data: bytes
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data)
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    @property
+    def digest(self) -> str:
+        """Hash of the content, equal for the same image under other urls."""
+        return hashlib.sha256(self.data).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class SpooledImage(Image):
+    """Loaded image kept in a file, read only when its content is needed.
+
+    ``digest`` is computed while the file is written, as ``LoadedImage.digest``.
+    """
+
+    path: Path
+    size: int
+    digest: str
+
+    @property
+    def data(self) -> bytes:
+        return self.path.read_bytes()
+
+    @property
+    def nbytes(self) -> int:
+        # nothing of it stays in memory
+        return 0
+
+
+type AnyLoadedImage = LoadedImage | SpooledImage
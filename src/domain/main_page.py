@@ -2,11 +2,11 @@ from collections.abc import Sequence
 from dataclasses import dataclass
 
 from domain.chapters import Chapter
-from domain.images import LoadedImage
+from domain.images import AnyLoadedImage
 
 
 @dataclass(frozen=True, slots=True)
 class MainPageInfo:
     chapters: Sequence[Chapter]
     title: str
-    covers: Sequence[LoadedImage]
+    covers: Sequence[AnyLoadedImage]
@@ -1,12 +1,42 @@
 from collections.abc import Sequence
 from dataclasses import dataclass
+from pathlib import Path
 
-from domain.images import LoadedImage
+from domain.chapters import Chapter
+from domain.images import AnyLoadedImage
+
+
+@dataclass(frozen=True, slots=True)
+class VolumeSplit:
+    """Where a book is cut into volumes; a volume ends at the first limit reached.
+
+    ``nbytes`` counts chapter text and image bytes, so a volume may go over it
+    by one chapter. ``source`` ends a volume with every volume of the site.
+    """
+
+    chapters: int | None = None
+    nbytes: int | None = None
+    source: bool = False
 
 
 @dataclass(frozen=True, slots=True)
 class SaverContext:
     title: str
     language: str
-    covers: Sequence[LoadedImage]
+    covers: Sequence[AnyLoadedImage]
     author: str = "nikmosi"
+    directory: Path = Path(".")
+    image_store: Path | None = None
+    # chapters the saver is going to get, in catalog order
+    chapters: Sequence[Chapter] = ()
+    volumes: VolumeSplit | None = None
+    # zlib level of EPUB entries that are not compressed media, 0 stores all
+    compress_level: int = 6
+
+    @property
+    def file_stem(self) -> str:
+        return "".join(
+            x
+            for x in self.title.replace(" ", "_").replace("/", ":")
+            if x.isalnum() or x in ["_", "-", ":"]
+        )
@@ -0,0 +1,324 @@
+import asyncio
+import random
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field, replace
+from itertools import batched
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+from tqdm import tqdm
+from yarl import URL
+
+from config import Settings
+from config.data import WatchSettings
+from containers import LoaderService
+from domain import Chapter, MainPageInfo, SaverContext, VolumeSplit
+from infra.archive import (
+    DiscardSaver,
+    FetchOnlyChapterLoader,
+    RecordingScope,
+    WarcWriter,
+    archive_name,
+)
+from infra.loader.spool import SpoolScope
+from logic import ChapterJournal, MainPageLoader, SaverLoaderConnector
+from logic.deadline import DeadlineScope
+from logic.exceptions.base import PageNotModifiedError
+from logic.journal import restore_from_journal
+from logic.manifest import BookManifest, diff_catalog
+from logic.memory_budget import MemoryBudget
+from logic.rate_limit import HostLimiter
+from logic.watch import (
+    RevalidationScope,
+    SeenIndex,
+    Validators,
+    WatchState,
+    jittered,
+)
+from utils import trim
+from worker import WorkerPool
+
+
+@dataclass
+class BookStatus:
+    """Live view of one book download, filled in as the download goes."""
+
+    title: str | None = None
+    progress: tqdm | None = None
+    artifact: Path | None = None
+    deferred: Sequence[Chapter] = ()
+
+
+@dataclass
+class BookDownloader:
+    """Download books with the services shared by every book of the process."""
+
+    args: Settings
+    loader_service: LoaderService
+    limiter: HostLimiter
+    memory_budget: MemoryBudget
+    journal_factory: Callable[[URL], ChapterJournal]
+    manifest_factory: Callable[[URL], BookManifest]
+    workers: WorkerPool | None = None
+    root: Path = Path(".")
+
+    def with_args(self, **update: Any) -> "BookDownloader":
+        """Copy sharing the services of this one, with some settings replaced."""
+        return replace(self, args=self.args.model_copy(update=update))
+
+    @logger.catch
+    async def download(self, url: URL, book_directory: bool = False) -> None:
+        await self.download_book(url, book_directory)
+
+    async def download_book(
+        self,
+        url: URL,
+        book_directory: bool = False,
+        status: BookStatus | None = None,
+    ) -> None:
+        logger.info(f"download {url}")
+        loader = self.loader_service.get(url)
+        with DeadlineScope(self.args.deadline.run):
+            if self.args.archive is not None:
+                await self.archive(loader, status)
+            else:
+                await self.run(loader, book_directory, status)
+
+    async def archive(
+        self, main_page_loader: MainPageLoader, status: BookStatus | None = None
+    ) -> None:
+        """Fetch a book into a WARC archive without saving it.
+
+        Main page, catalog, chapter and image responses are recorded as
+        received; chapters that fail to parse are still fetched and archived.
+        """
+        assert self.args.archive is not None
+        path = self.root / self.args.archive / archive_name(main_page_loader.url)
+        writer = WarcWriter(path, main_page_loader.url)
+        with writer, RecordingScope(writer):
+            main_page = await main_page_loader.load()
+            if status is not None:
+                status.title = main_page.title
+            chapters = trim(self.args.trim_args, main_page.chapters)
+            progress = tqdm(total=len(chapters), desc=main_page.title)
+            if status is not None:
+                status.progress = progress
+            connector = SaverLoaderConnector(
+                DiscardSaver(
+                    SaverContext(title=main_page.title, language="ru", covers=[])
+                ),
+                FetchOnlyChapterLoader(
+                    main_page_loader.session, main_page_loader.get_loader_for_chapter()
+                ),
+                chapter_deadline=self.args.deadline.chapter,
+                memory_budget=self.memory_budget,
+            )
+            await self.load_chapters(connector, chapters, progress)
+        logger.info(f"{main_page.title}: archived {writer.count} responses to {path}")
+        if status is not None:
+            status.artifact = path
+            status.deferred = connector.deferred
+
+    async def run(
+        self,
+        main_page_loader: MainPageLoader,
+        book_directory: bool,
+        status: BookStatus | None = None,
+    ):
+        main_page = await main_page_loader.load()
+        await self.save_book(main_page_loader, main_page, book_directory, status)
+
+    async def save_book(
+        self,
+        main_page_loader: MainPageLoader,
+        main_page: MainPageInfo,
+        book_directory: bool,
+        status: BookStatus | None = None,
+    ) -> Sequence[Chapter]:
+        """Download and save the chapters of a loaded main page.
+
+        Returns the chapters deferred because their deadline ran out.
+        """
+        args = self.args
+        journal = manifest = None
+        if args.journal:
+            journal = self.journal_factory(main_page_loader.url)
+            manifest = self.manifest_factory(main_page_loader.url)
+
+        trimmed_chapters = trim(args.trim_args, main_page.chapters)
+        volumes = None
+        if args.volumes is not None:
+            volumes = VolumeSplit(
+                chapters=args.volumes.chapters,
+                nbytes=args.volumes.size,
+                source=args.volumes.source,
+            )
+        saver_context = SaverContext(
+            title=main_page.title,
+            language="ru",
+            covers=main_page.covers,
+            directory=self.root,
+            image_store=args.state_directory / "images" if args.shared_images else None,
+            chapters=trimmed_chapters,
+            volumes=volumes,
+            compress_level=args.epub_compression,
+        )
+        if book_directory:
+            saver_context = replace(
+                saver_context, directory=self.root / saver_context.file_stem
+            )
+        if status is not None:
+            status.title = main_page.title
+
+        refresh: set[Chapter] = set()
+        if args.update and manifest is not None:
+            diff = diff_catalog(manifest.entries(), trimmed_chapters)
+            logger.info(
+                f"{main_page.title}: {len(diff.new)} new, "
+                f"{len(diff.changed)} changed chapters"
+            )
+            if not diff.stale:
+                logger.info(f"{main_page.title} is up to date")
+                if status is not None:
+                    status.artifact = args.saver(saver_context).artifact()
+                return []
+            refresh = set(diff.changed)
+
+        progress = tqdm(total=len(trimmed_chapters), desc=main_page.title)
+        if status is not None:
+            status.progress = progress
+        # the covers stay in memory with the saver context
+        covers = sum(i.nbytes for i in main_page.covers)
+        self.memory_budget.charge(covers)
+        try:
+            # images are spooled to disk until the saver is done with them
+            with (
+                SpoolScope(args.state_directory / "spool"),
+                args.saver(saver_context) as saver,
+                self.memory_budget.holding(saver),
+            ):
+                pending = trimmed_chapters
+                if journal is not None:
+                    restorable = [i for i in trimmed_chapters if i not in refresh]
+                    left = await restore_from_journal(
+                        journal, saver, restorable, manifest
+                    )
+                    pending = [i for i in trimmed_chapters if i in refresh or i in left]
+                    progress.update(len(trimmed_chapters) - len(pending))
+                connector = SaverLoaderConnector(
+                    saver,
+                    main_page_loader.get_loader_for_chapter(),
+                    chapter_deadline=args.deadline.chapter,
+                    memory_budget=self.memory_budget,
+                    journal=journal,
+                    manifest=manifest,
+                )
+                if self.workers is not None:
+                    await self.workers.collect(
+                        main_page_loader.url, pending, connector, progress
+                    )
+                else:
+                    await self.load_chapters(connector, pending, progress)
+        finally:
+            self.memory_budget.release(covers)
+
+        if manifest is not None:
+            await manifest.save()
+        if journal is not None:
+            # what the site dropped and older records of the same chapter
+            await journal.prune({str(i.url) for i in main_page.chapters})
+        if status is not None:
+            status.artifact = saver.artifact()
+            status.deferred = connector.deferred
+        if connector.deferred:
+            deferred = ", ".join(i.base_name for i in connector.deferred)
+            logger.warning(
+                f"{main_page.title}: {len(connector.deferred)} chapters deferred: "
+                f"{deferred}"
+            )
+        return connector.deferred
+
+    async def load_chapters(
+        self,
+        connector: SaverLoaderConnector,
+        chapters: Sequence[Chapter],
+        progress: tqdm | None = None,
+    ) -> None:
+        for chunked in batched(chapters, n=self.args.chunk_size):
+            async with asyncio.TaskGroup() as tg:
+                for chapter in chunked:
+                    async with self.limiter.for_url(chapter.url):
+                        tg.create_task(connector.handle(chapter))
+            if progress is not None:
+                progress.update(len(chunked))
+
+
+@dataclass
+class WatchedBook:
+    loader: MainPageLoader
+    state: WatchState
+    seen: SeenIndex
+    validators: Validators
+
+
+@dataclass
+class BookWatcher:
+    """Poll main pages on a jittered schedule and download new chapters."""
+
+    settings: WatchSettings
+    downloader: BookDownloader
+    state_factory: Callable[[URL], WatchState]
+    books: asyncio.Semaphore
+    book_directory: bool = False
+    limiter: HostLimiter = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.limiter = HostLimiter(self.settings.polls_per_minute, 60)
+
+    async def watch(self, urls: Sequence[URL]) -> None:
+        logger.info(f"watch {len(urls)} books every {self.settings.interval:g}s")
+        async with asyncio.TaskGroup() as tg:
+            for url in urls:
+                tg.create_task(self.watch_book(url))
+
+    async def watch_book(self, url: URL) -> None:
+        state = self.state_factory(url)
+        seen, validators = state.load()
+        loader = self.downloader.loader_service.get(url)
+        book = WatchedBook(loader, state, seen, validators)
+        interval, jitter = self.settings.interval, self.settings.jitter
+        delay = random.uniform(0, interval * jitter)
+        while True:
+            await asyncio.sleep(delay)
+            await self.poll(book)
+            delay = jittered(interval, jitter)
+
+    @logger.catch
+    async def poll(self, book: WatchedBook) -> None:
+        url = book.loader.url
+        try:
+            # the request loading the main page is the conditional one
+            async with self.limiter.for_url(url):
+                with RevalidationScope(url, book.validators) as revalidation:
+                    main_page = await book.loader.load()
+        except PageNotModifiedError:
+            logger.debug(f"{url} not modified")
+            return
+        validators = revalidation.received
+        new = book.seen.unseen(main_page.chapters)
+        if new:
+            logger.info(f"{main_page.title}: {len(new)} new chapters")
+            async with self.books:
+                deferred = await self.downloader.save_book(
+                    book.loader, main_page, self.book_directory
+                )
+            if deferred:
+                # keep the deferred chapters unseen and the page unvalidated,
+                # the next poll picks them up again
+                first = min(i.id for i in deferred)
+                new = [i for i in new if i.id < first]
+                validators = book.validators
+            book.seen.add(i.url for i in new)
+        book.validators = validators
+        await book.state.save(book.seen, book.validators)
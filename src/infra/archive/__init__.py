@@ -0,0 +1,15 @@
+from .fetch import DiscardSaver, FetchOnlyChapterLoader
+from .recorder import ArchiveRecorder, RecordingScope
+from .replay import ArchiveSession
+from .warc import WarcArchive, WarcWriter, archive_name
+
+__all__ = [
+    "ArchiveRecorder",
+    "ArchiveSession",
+    "DiscardSaver",
+    "FetchOnlyChapterLoader",
+    "RecordingScope",
+    "WarcArchive",
+    "WarcWriter",
+    "archive_name",
+]
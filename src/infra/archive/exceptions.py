@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+from infra.exceptions.base import BaseInfraError
+
+
+@dataclass(eq=False, slots=True, kw_only=True)
+class WarcFormatError(BaseInfraError):
+    path: Path
+    detail: str
+
+    @property
+    def message(self) -> str:
+        return f"Can't read WARC archive {self.path}: {self.detail}."
@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+from types import TracebackType
+from typing import override
+
+from loguru import logger
+
+from domain import Chapter, LoadedChapter
+from infra.exceptions.base import BaseInfraError
+from logic import ChapterLoader, Saver
+
+
+@dataclass(eq=False)
+class FetchOnlyChapterLoader(ChapterLoader):
+    """Chapter loader of fetch-only runs, which go on past pages that fail to parse.
+
+    The page was recorded before it failed, so replaying the archive with a
+    fixed parser restores the chapter. Retryable errors, such as captchas, are
+    still retried.
+    """
+
+    chapter_loader: ChapterLoader
+
+    @override
+    async def load_chapter(self, chapter: Chapter) -> LoadedChapter:
+        try:
+            return await self.chapter_loader.load_chapter(chapter)
+        except BaseInfraError as e:
+            logger.warning(f"archived {chapter.base_name}, but can't parse it: {e}")
+        return LoadedChapter(
+            id=chapter.id,
+            name=chapter.name,
+            url=chapter.url,
+            title=chapter.name,
+            paragraphs=[],
+            images=[],
+        )
+
+
+@dataclass
+class DiscardSaver(Saver):
+    """Saver of fetch-only runs, the chapters are in the archive already."""
+
+    @override
+    def __enter__(self) -> "DiscardSaver":
+        return self
+
+    @override
+    def __exit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception_value: BaseException | None,
+        exception_traceback: TracebackType | None,
+    ) -> bool:
+        return False
+
+    @override
+    async def save_chapter(self, loaded_chapter: LoadedChapter) -> None:
+        pass
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+
+from aiohttp import ClientHandlerType, ClientRequest, ClientResponse
+
+from infra.archive.warc import WarcWriter
+
+_current_writer: ContextVar[WarcWriter | None] = ContextVar(
+    "current_warc_writer", default=None
+)
+
+
+class ArchiveRecorder:
+    """Session middleware recording responses to the WARC of the current book.
+
+    Requests outside a ``RecordingScope`` pass untouched. Redirects reach the
+    middleware hop by hop, so each of them is recorded as received.
+    """
+
+    async def __call__(
+        self, request: ClientRequest, handler: ClientHandlerType
+    ) -> ClientResponse:
+        response = await handler(request)
+        writer = _current_writer.get()
+        if writer is not None:
+            # read once here, later reads of the response return the same body
+            body = await response.read()
+            writer.write_response(
+                request.url,
+                response.status,
+                response.reason or "",
+                response.headers,
+                body,
+            )
+        return response
+
+
+@dataclass
+class RecordingScope:
+    """Record the responses of requests made inside the block into ``writer``.
+
+    Tasks started inside the block record into it as well.
+    """
+
+    writer: WarcWriter
+    _token: Token[WarcWriter | None] | None = None
+
+    def __enter__(self) -> WarcWriter:
+        self._token = _current_writer.set(self.writer)
+        return self.writer
+
+    def __exit__(self, *_: object) -> None:
+        assert self._token is not None
+        _current_writer.reset(self._token)
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any
+
+import aiohttp
+from aiohttp import RequestInfo
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from infra.archive.warc import WarcArchive, WarcResponse
+
+REDIRECTS = frozenset({301, 302, 303, 307, 308})
+MAX_REDIRECTS = 10
+
+
+@dataclass
+class ArchiveSession:
+    """Stand-in for the HTTP session of the loaders, answering from an archive.
+
+    Only the part of ``aiohttp.ClientSession`` the loaders use is provided.
+    Recorded redirects are followed as aiohttp does, urls that were never
+    recorded answer 404 as a page missing on the site would.
+    """
+
+    archive: WarcArchive
+    timeout: aiohttp.ClientTimeout = field(
+        default_factory=lambda: aiohttp.ClientTimeout(total=None)
+    )
+
+    def get(self, url: URL | str, **_: Any) -> ArchivedResponse:
+        url = URL(url)
+        response = self.archive.responses.get(url)
+        for _ in range(MAX_REDIRECTS):
+            if response is None or response.status not in REDIRECTS:
+                break
+            location = response.headers.get("Location")
+            if location is None:
+                break
+            url = url.join(URL(location))
+            response = self.archive.responses.get(url)
+        return ArchivedResponse(url, response)
+
+    async def close(self) -> None:
+        pass
+
+
+@dataclass
+class ArchivedResponse:
+    """Response of ``ArchiveSession``, used as ``async with session.get(...)``."""
+
+    url: URL
+    recorded: WarcResponse | None
+
+    async def __aenter__(self) -> ArchivedResponse:
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        pass
+
+    @property
+    def status(self) -> int:
+        return self.recorded.status if self.recorded is not None else 404
+
+    @property
+    def reason(self) -> str:
+        return self.recorded.reason if self.recorded is not None else "Not Archived"
+
+    @property
+    def headers(self) -> CIMultiDictProxy[str]:
+        if self.recorded is not None:
+            return self.recorded.headers
+        return CIMultiDictProxy(CIMultiDict[str]())
+
+    def raise_for_status(self) -> None:
+        if self.status < 400:
+            return
+        no_headers = CIMultiDictProxy(CIMultiDict[str]())
+        request_info = RequestInfo(self.url, "GET", no_headers, self.url)
+        raise aiohttp.ClientResponseError(
+            request_info,
+            (),
+            status=self.status,
+            message=self.reason,
+            headers=self.headers,
+        )
+
+    @property
+    def content(self) -> ArchivedContent:
+        return ArchivedContent(self.recorded.body if self.recorded is not None else b"")
+
+    async def read(self) -> bytes:
+        return self.recorded.body if self.recorded is not None else b""
+
+    async def text(self, encoding: str | None = None, errors: str = "strict") -> str:
+        if encoding is None:
+            _, _, charset = self.headers.get("Content-Type", "").partition("charset=")
+            encoding = charset.split(";")[0].strip() or "utf-8"
+        return (await self.read()).decode(encoding, errors)
+
+
+@dataclass
+class ArchivedContent:
+    """Body stream of an ``ArchivedResponse``."""
+
+    body: bytes
+
+    async def iter_chunked(self, n: int) -> AsyncIterator[bytes]:
+        for start in range(0, len(self.body), n):
+            yield self.body[start : start + n]
@@ -0,0 +1,161 @@
+"""WARC 1.1 files holding the raw responses of a book.
+
+A file starts with a ``warcinfo`` record naming the book, followed by one
+``response`` record per HTTP response, each compressed as a gzip member of its
+own as WARC tools expect. Bodies are stored decoded, so ``Content-Encoding`` is
+dropped from the recorded headers and ``Content-Length`` matches the body.
+"""
+
+from __future__ import annotations
+
+import gzip
+import uuid
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO
+
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from infra.archive.exceptions import WarcFormatError
+
+WARC_VERSION = b"WARC/1.1"
+# recomputed for the decoded body, so not recorded as received
+DROPPED_HEADERS = frozenset({"content-encoding", "content-length", "transfer-encoding"})
+
+
+@dataclass(frozen=True, slots=True)
+class WarcResponse:
+    url: URL
+    status: int
+    reason: str
+    headers: CIMultiDictProxy[str]
+    body: bytes
+
+
+@dataclass
+class WarcWriter:
+    """Append responses to a new WARC file, open inside a ``with`` block."""
+
+    path: Path
+    book_url: URL
+    _file: BinaryIO | None = None
+    count: int = 0
+
+    def __enter__(self) -> WarcWriter:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("wb")
+        info = f"software: requests_u\r\nbook-url: {self.book_url}\r\n".encode()
+        self._write_record("warcinfo", None, "application/warc-fields", info)
+        return self
+
+    def __exit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception_value: BaseException | None,
+        exception_traceback: TracebackType | None,
+    ) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def write_response(
+        self,
+        url: URL,
+        status: int,
+        reason: str,
+        headers: Mapping[str, str],
+        body: bytes,
+    ) -> None:
+        lines = [f"HTTP/1.1 {status} {reason}"]
+        lines += [
+            f"{k}: {v}" for k, v in headers.items() if k.lower() not in DROPPED_HEADERS
+        ]
+        lines.append(f"Content-Length: {len(body)}")
+        block = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+        self._write_record("response", url, "application/http;msgtype=response", block)
+        self.count += 1
+
+    def _write_record(
+        self, kind: str, url: URL | None, content_type: str, block: bytes
+    ) -> None:
+        assert self._file is not None, "write inside the with block"
+        fields = [
+            WARC_VERSION.decode(),
+            f"WARC-Type: {kind}",
+            f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>",
+            f"WARC-Date: {datetime.now(UTC).strftime('%Y-%m-%dT%H:%M:%SZ')}",
+        ]
+        if url is not None:
+            fields.append(f"WARC-Target-URI: {url}")
+        fields += [f"Content-Type: {content_type}", f"Content-Length: {len(block)}"]
+        header = ("\r\n".join(fields) + "\r\n\r\n").encode()
+        self._file.write(gzip.compress(header + block + b"\r\n\r\n", compresslevel=6))
+
+
+@dataclass
+class WarcArchive:
+    """Responses of a WARC file by url, the last one wins for repeated urls."""
+
+    book_url: URL
+    responses: dict[URL, WarcResponse] = field(default_factory=dict[URL, WarcResponse])
+
+    @classmethod
+    def load(cls, path: Path) -> WarcArchive:
+        book_url: URL | None = None
+        responses: dict[URL, WarcResponse] = {}
+        with gzip.open(path, "rb") as file:
+            for fields, block in _records(file, path):
+                match fields.get("warc-type"):
+                    case "warcinfo":
+                        book_url = URL(_info_fields(block)["book-url"])
+                    case "response":
+                        response = _parse_response(
+                            URL(fields["warc-target-uri"], encoded=True), block
+                        )
+                        responses[response.url] = response
+        if book_url is None:
+            raise WarcFormatError(path=path, detail="no warcinfo record")
+        return cls(book_url, responses)
+
+
+def _records(file: BinaryIO, path: Path) -> Iterator[tuple[dict[str, str], bytes]]:
+    while line := file.readline():
+        if not line.strip():
+            continue
+        if line.rstrip() != WARC_VERSION:
+            raise WarcFormatError(path=path, detail=f"unexpected line {line[:40]!r}")
+        fields: dict[str, str] = {}
+        while (line := file.readline().rstrip(b"\r\n")) != b"":
+            name, _, value = line.decode().partition(":")
+            fields[name.strip().lower()] = value.strip()
+        length = int(fields.get("content-length", "0"))
+        block = file.read(length)
+        if len(block) != length:
+            raise WarcFormatError(path=path, detail="truncated record")
+        yield fields, block
+
+
+def _info_fields(block: bytes) -> dict[str, str]:
+    pairs = (i.partition(":") for i in block.decode().splitlines() if i)
+    return {name.strip(): value.strip() for name, _, value in pairs}
+
+
+def _parse_response(url: URL, block: bytes) -> WarcResponse:
+    head, _, body = block.partition(b"\r\n\r\n")
+    status_line, *header_lines = head.decode("latin-1").split("\r\n")
+    _, status, reason = (status_line.split(" ", 2) + [""])[:3]
+    headers = CIMultiDict[str]()
+    for line in header_lines:
+        name, _, value = line.partition(":")
+        headers.add(name.strip(), value.strip())
+    return WarcResponse(url, int(status), reason, CIMultiDictProxy(headers), body)
+
+
+def archive_name(book_url: URL) -> str:
+    """File name of the archive of a book, from its url."""
+    stem = f"{book_url.host}{book_url.path}".strip("/").replace("/", "_")
+    return f"{stem}.warc.gz"
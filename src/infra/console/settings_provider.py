@@ -1,4 +1,5 @@
 import argparse
+import sys
 from pathlib import Path
 
 from loguru import logger
@@ -6,17 +7,65 @@ from pydantic import ValidationError
 from yarl import URL
 
 from config import Settings, TrimSettings
-from config.data import LimiterSettings
+from config.data import (
+    TRANSCODE_PROFILES,
+    DaemonSettings,
+    DeadlineSettings,
+    ImageSettings,
+    JobServerSettings,
+    LimiterSettings,
+    TranscodeSettings,
+    VolumeSettings,
+    WatchSettings,
+)
 from logic.settings_provider import SettingsProvider
 from utils.saver import get_all_saver_classes, get_saver_by_name
 
 
+def parse_cookies(cookies: str) -> dict[str, str]:
+    if not cookies:
+        return {}
+    pairs = (i.split("=", 1) for i in cookies.split(";"))
+    return {k.strip(): v for k, v in pairs}
+
+
+def parse_size(size: str) -> tuple[int, int]:
+    width, _, height = size.lower().partition("x")
+    if not (width.isdigit() and height.isdigit()):
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {size!r}")
+    return int(width), int(height)
+
+
+def parse_address(address: str) -> tuple[str, int]:
+    host, _, port = address.rpartition(":")
+    if not port.isdigit():
+        raise argparse.ArgumentTypeError(f"expected [HOST:]PORT, got {address!r}")
+    return host, int(port)
+
+
 class ConsoleSettingsProvider(SettingsProvider):
-    def _parse_cookies(self, cookies: str) -> dict[str, str]:
-        if not cookies:
-            return {}
-        pairs = (i.split("=", 1) for i in cookies.split(";"))
-        return {k.strip(): v for k, v in pairs}
+    def _read_batch(self, path: str | None) -> list[URL]:
+        if path is None:
+            return []
+        if path == "-":
+            lines = sys.stdin.read().splitlines()
+        else:
+            lines = Path(path).read_text().splitlines()
+        stripped = (i.strip() for i in lines)
+        return [URL(i) for i in stripped if i and not i.startswith("#")]
+
+    def _transcode_settings(self, args: argparse.Namespace) -> TranscodeSettings:
+        update: dict[str, object] = {}
+        if args.image_max_size is not None:
+            width, height = args.image_max_size
+            update |= {"max_width": width, "max_height": height}
+        if args.image_format is not None:
+            update["format"] = args.image_format
+        if args.image_quality is not None:
+            update["quality"] = args.image_quality
+        profile = TRANSCODE_PROFILES[args.transcode]
+        # validated again, unlike model_copy
+        return TranscodeSettings.model_validate(profile.model_dump() | update)
 
     def get(self) -> Settings:
         parser = argparse.ArgumentParser()
@@ -24,6 +73,41 @@ class ConsoleSettingsProvider(SettingsProvider):
             "url",
             help="url to book (example: https://tl.rulate.ru/book/xxxxx)",
             type=URL,
+            nargs="*",
+        )
+        parser.add_argument(
+            "-b",
+            "--batch",
+            help="file with book urls, one per line ('-' reads stdin)",
+            default=None,
+        )
+        parser.add_argument(
+            "-j",
+            "--parallel-books",
+            help="number of books downloaded at the same time in batch mode.",
+            type=int,
+            default=4,
+        )
+        parser.add_argument(
+            "--workers",
+            help="number of worker processes loading chapters (0 loads in-process).",
+            type=int,
+            default=0,
+        )
+        parser.add_argument(
+            "--serve-jobs",
+            help="serve chapter jobs to remote workers on [HOST:]PORT, host "
+            "127.0.0.1 unless given (start them with "
+            "'python src/worker.py http://HOST:PORT --token TOKEN').",
+            metavar="[HOST:]PORT",
+            type=parse_address,
+            default=None,
+        )
+        parser.add_argument(
+            "--jobs-token",
+            help="token remote workers must send; generated and logged if omitted.",
+            metavar="TOKEN",
+            default=None,
         )
         parser.add_argument(
             "-c",
@@ -80,6 +164,186 @@ class ConsoleSettingsProvider(SettingsProvider):
             type=float,
             default=10.0,
         )
+        parser.add_argument(
+            "--chapter-deadline",
+            help="seconds allowed for one chapter, retries included.",
+            type=float,
+            default=None,
+        )
+        parser.add_argument(
+            "--run-deadline",
+            help="seconds allowed for the whole run.",
+            type=float,
+            default=None,
+        )
+        parser.add_argument(
+            "--memory-budget",
+            help="MiB of chapter and image data buffered before fetching pauses.",
+            type=float,
+            default=None,
+        )
+        parser.add_argument(
+            "--no-journal",
+            dest="journal",
+            action="store_false",
+            help="neither resume from nor record to the progress journal.",
+        )
+        parser.add_argument(
+            "-u",
+            "--update",
+            action="store_true",
+            help="fetch only chapters that are new or renamed since the last run.",
+        )
+        parser.add_argument(
+            "--shared-images",
+            action="store_true",
+            help="keep images of FilesSaver books once in a store shared by all "
+            "books and hardlink them.",
+        )
+        parser.add_argument(
+            "--image-timeout",
+            help="seconds allowed for one image request (default 10).",
+            type=float,
+            default=10.0,
+        )
+        parser.add_argument(
+            "--image-attempts",
+            help="attempts for an image failing with a timeout, 429 or 5xx "
+            "(default 3).",
+            type=int,
+            default=3,
+        )
+        parser.add_argument(
+            "--images-per-host",
+            help="images requested from one host at once (default 4).",
+            type=int,
+            default=4,
+        )
+        parser.add_argument(
+            "--dead-image-days",
+            help="days an image url answered as gone is not requested again "
+            "(default 7, 0 keeps no record).",
+            type=float,
+            default=7.0,
+        )
+        parser.add_argument(
+            "--transcode",
+            help="recompress images with Pillow in a process pool using PROFILE "
+            f"(default ereader; one of {', '.join(TRANSCODE_PROFILES)}).",
+            metavar="PROFILE",
+            choices=list(TRANSCODE_PROFILES),
+            nargs="?",
+            const="ereader",
+            default=None,
+        )
+        parser.add_argument(
+            "--image-max-size",
+            help="largest image resolution kept by --transcode.",
+            metavar="WIDTHxHEIGHT",
+            type=parse_size,
+            default=None,
+        )
+        parser.add_argument(
+            "--image-format",
+            help="format --transcode writes images in.",
+            choices=["JPEG", "PNG", "WEBP"],
+            default=None,
+        )
+        parser.add_argument(
+            "--image-quality",
+            help="JPEG and WEBP quality of --transcode, 1-100.",
+            type=int,
+            default=None,
+        )
+        parser.add_argument(
+            "--volume-chapters",
+            help="cut EbookSaver books into volumes of at most N chapters.",
+            metavar="N",
+            type=int,
+            default=None,
+        )
+        parser.add_argument(
+            "--volume-size",
+            help="cut EbookSaver books into volumes of about MiB of text and images.",
+            metavar="MiB",
+            type=float,
+            default=None,
+        )
+        parser.add_argument(
+            "--volumes-by-source",
+            action="store_true",
+            help="cut EbookSaver books where the site starts a new volume.",
+        )
+        parser.add_argument(
+            "--epub-compression",
+            help="zlib level of EPUB text entries, 0 (store) to 9 (default 6); "
+            "JPEG, PNG, GIF and WebP images are always stored.",
+            metavar="LEVEL",
+            type=int,
+            choices=range(10),
+            default=6,
+        )
+        parser.add_argument(
+            "--watch",
+            help="keep polling the books for new chapters every SECONDS "
+            "(default 3600).",
+            metavar="SECONDS",
+            type=float,
+            nargs="?",
+            const=3600.0,
+            default=None,
+        )
+        parser.add_argument(
+            "--watch-jitter",
+            help="fraction of the watch interval each poll is randomly shifted by.",
+            type=float,
+            default=0.2,
+        )
+        parser.add_argument(
+            "--polls-per-minute",
+            help="main page polls allowed per host and minute in watch mode.",
+            type=float,
+            default=6.0,
+        )
+        parser.add_argument(
+            "--daemon",
+            help="run as a service accepting download jobs over HTTP on "
+            "[HOST:]PORT (default 127.0.0.1:8765).",
+            metavar="[HOST:]PORT",
+            type=parse_address,
+            nargs="?",
+            const=("127.0.0.1", 8765),
+            default=None,
+        )
+        parser.add_argument(
+            "--archive",
+            help="only fetch: record the raw responses of every book into "
+            "DIR/<book>.warc.gz instead of saving it.",
+            metavar="DIR",
+            type=Path,
+            default=None,
+        )
+        parser.add_argument(
+            "--replay",
+            help="save books from archives recorded with --archive, without network, "
+            "in --workers processes (default: one per core).",
+            metavar="WARC",
+            type=Path,
+            nargs="+",
+            default=[],
+        )
+        parser.add_argument(
+            "--event-loop",
+            help="event loop implementation; 'auto' uses uvloop when installed.",
+            choices=["asyncio", "uvloop", "auto"],
+            default="asyncio",
+        )
+        parser.add_argument(
+            "--parser",
+            help="html parser backend; 'bs4' is slower but more forgiving.",
+            choices=["lxml", "bs4"],
+            default="lxml",
+        )
         parser.add_argument(
             "--cookies",
             help="Cookie string like 'a=1; b=2'",
@@ -88,11 +352,43 @@ class ConsoleSettingsProvider(SettingsProvider):
         )
 
         args = parser.parse_args()
+        urls = [*args.url, *self._read_batch(args.batch)]
+        if not urls and args.daemon is None and not args.replay:
+            parser.error("expected book url, --batch or --replay")
+        if args.replay and (urls or args.archive is not None):
+            parser.error("--replay takes no book urls and excludes --archive")
+        if args.archive is not None and (
+            args.workers or args.serve_jobs or args.daemon or args.watch
+        ):
+            parser.error(
+                "--archive excludes --workers, --serve-jobs, --daemon and --watch"
+            )
+        if args.daemon is not None and args.watch is not None:
+            parser.error("--daemon and --watch exclude each other")
+        if args.jobs_token is not None and args.serve_jobs is None:
+            parser.error("--jobs-token requires --serve-jobs")
+        image_options = (args.image_max_size, args.image_format, args.image_quality)
+        if args.transcode is None and any(i is not None for i in image_options):
+            parser.error("--image-* options require --transcode")
+        if args.update and not args.journal:
+            parser.error("--update requires the journal")
+        if args.watch is not None and not args.journal:
+            parser.error("--watch requires the journal")
         if not args.from_:
             args.from_ = 0
         if not args.to:
             args.to = 10**10
         args.saver = get_saver_by_name(args.saver)
+        if args.memory_budget is not None:
+            args.memory_budget = int(args.memory_budget * 2**20)
+        if args.volume_size is not None:
+            args.volume_size = int(args.volume_size * 2**20)
+        volume_options = (args.volume_chapters, args.volume_size)
+        split_volumes = args.volumes_by_source or any(
+            i is not None for i in volume_options
+        )
+        if split_volumes and not getattr(args.saver, "splits_volumes", False):
+            parser.error("--volume-* options require EbookSaver")
 
         trim_args = TrimSettings(
             to=args.to, from_=args.from_, interactive=args.interactive
@@ -102,19 +398,75 @@ class ConsoleSettingsProvider(SettingsProvider):
         )
 
         try:
+            deadline_args = DeadlineSettings(
+                chapter=args.chapter_deadline, run=args.run_deadline
+            )
+            job_server_args = None
+            if args.serve_jobs is not None:
+                host, port = args.serve_jobs
+                token = {"token": args.jobs_token} if args.jobs_token else {}
+                job_server_args = JobServerSettings(
+                    host=host or "127.0.0.1", port=port, **token
+                )
+            daemon_args = None
+            if args.daemon is not None:
+                host, port = args.daemon
+                daemon_args = DaemonSettings(host=host or "127.0.0.1", port=port)
+            watch_args = None
+            if args.watch is not None:
+                watch_args = WatchSettings(
+                    interval=args.watch,
+                    jitter=args.watch_jitter,
+                    polls_per_minute=args.polls_per_minute,
+                )
+            image_args = ImageSettings(
+                timeout=args.image_timeout,
+                attempts=args.image_attempts,
+                per_host=args.images_per_host,
+                dead_ttl=args.dead_image_days * 24 * 3600,
+            )
+            transcode_args = None
+            if args.transcode is not None:
+                transcode_args = self._transcode_settings(args)
+            volume_args = None
+            if split_volumes:
+                volume_args = VolumeSettings(
+                    chapters=args.volume_chapters,
+                    size=args.volume_size,
+                    source=args.volumes_by_source,
+                )
             settings_parsed = Settings(
                 chunk_size=args.chunk_size,
-                url=args.url,
+                urls=urls,
+                parallel_books=args.parallel_books,
+                workers=args.workers,
+                job_server=job_server_args,
                 saver=args.saver,
                 working_directory=args.working_directory,
                 trim_args=trim_args,
                 limiter=limiter_args,
+                deadline=deadline_args,
+                memory_budget=args.memory_budget,
+                journal=args.journal,
+                update=args.update or watch_args is not None,
+                shared_images=args.shared_images,
+                images=image_args,
+                transcode=transcode_args,
+                volumes=volume_args,
+                epub_compression=args.epub_compression,
+                watch=watch_args,
+                daemon=daemon_args,
+                archive=args.archive,
+                # resolved before the working directory changes
+                replay=[i.resolve() for i in args.replay],
+                event_loop=args.event_loop,
+                parser=args.parser,
             )
         except ValidationError as e:
             logger.error(f"Got ValidationError: {e}")
             exit(1)
 
-        cookies = self._parse_cookies(args.cookies)
+        cookies = parse_cookies(args.cookies)
         settings_parsed.session.merge_cookies(cookies)
 
         logger.debug(settings_parsed)
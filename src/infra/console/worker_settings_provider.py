@@ -0,0 +1,77 @@
+import argparse
+
+from loguru import logger
+from pydantic import ValidationError
+from yarl import URL
+
+from config.data import RemoteWorkerSettings
+
+from .settings_provider import parse_cookies
+
+
+class ConsoleWorkerSettingsProvider:
+    def get(self) -> RemoteWorkerSettings:
+        parser = argparse.ArgumentParser(
+            description="load chapters for a coordinator started with --serve-jobs"
+        )
+        parser.add_argument(
+            "coordinator",
+            help="url of the coordinator (example: http://10.0.0.2:8700)",
+            type=URL,
+        )
+        parser.add_argument(
+            "-t",
+            "--token",
+            help="token of the coordinator, logged when it starts serving jobs.",
+            required=True,
+        )
+        parser.add_argument(
+            "-n",
+            "--name",
+            help="name of the worker in the coordinator logs.",
+            default=None,
+        )
+        parser.add_argument(
+            "-c",
+            "--concurrency",
+            help="number of chapters loaded at the same time.",
+            type=int,
+            default=8,
+        )
+        parser.add_argument(
+            "--event-loop",
+            help="event loop implementation; 'auto' uses uvloop when installed.",
+            choices=["asyncio", "uvloop", "auto"],
+            default="asyncio",
+        )
+        parser.add_argument(
+            "--parser",
+            help="html parser backend; 'bs4' is slower but more forgiving.",
+            choices=["lxml", "bs4"],
+            default="lxml",
+        )
+        parser.add_argument(
+            "--cookies",
+            help="Cookie string like 'a=1; b=2'",
+            type=str,
+            default="",
+        )
+        args = parser.parse_args()
+
+        try:
+            settings = RemoteWorkerSettings(
+                coordinator=args.coordinator,
+                token=args.token,
+                name=args.name,
+                concurrency=args.concurrency,
+                event_loop=args.event_loop,
+                parser=args.parser,
+            )
+        except ValidationError as e:
+            logger.error(f"Got ValidationError: {e}")
+            exit(1)
+
+        cookies = parse_cookies(args.cookies)
+        settings.session.merge_cookies(cookies)
+        logger.debug(settings)
+        return settings
@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 
-@dataclass(frozen=True, slots=True, kw_only=True)
+@dataclass(eq=False, slots=True, kw_only=True)
 class BaseInfraError(Exception):
     """Base error for the infrastructure layer."""
 
@@ -17,7 +17,7 @@ class BaseInfraError(Exception):
         return self.message
 
 
-@dataclass(frozen=True, slots=True, kw_only=True)
+@dataclass(eq=False, slots=True, kw_only=True)
 class SaverUsingWithoutWithError(BaseInfraError):
     saver_name: str | None = None
 
@@ -31,7 +31,7 @@ class SaverUsingWithoutWithError(BaseInfraError):
         return "Saver context manager is required but was not used."
 
 
-@dataclass(frozen=True, slots=True, kw_only=True)
+@dataclass(eq=False, slots=True, kw_only=True)
 class CatchImageWithoutSrcError(BaseInfraError):
     tag_name: str | None = None
 
@@ -40,3 +40,13 @@ class CatchImageWithoutSrcError(BaseInfraError):
         if self.tag_name:
             return f"Encountered <{self.tag_name}> tag without an src attribute."
         return "Encountered image element without an src attribute."
+
+
+@dataclass(eq=False, slots=True, kw_only=True)
+class ImageTranscodingUnavailableError(BaseInfraError):
+    @property
+    def message(self) -> str:
+        return (
+            "Image transcoding requires Pillow, install the 'transcode' extra: "
+            "pip install 'requests-u[transcode]'."
+        )
@@ -0,0 +1,4 @@
+from .http import HttpJobSource, JobServer
+from .sqlite import SqliteJobQueue
+
+__all__ = ["SqliteJobQueue", "JobServer", "HttpJobSource"]
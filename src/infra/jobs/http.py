@@ -0,0 +1,278 @@
+import asyncio
+import base64
+import contextlib
+import secrets
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any, override
+
+import aiohttp
+from aiohttp import hdrs, web
+from loguru import logger
+from yarl import URL
+
+from config.data import LimiterSettings
+from domain import Chapter, LoadedChapter, LoadedImage
+from logic.jobs import ChapterJob, JobQueue, JobSource
+
+
+def job_to_json(job: ChapterJob) -> dict[str, Any]:
+    return {
+        "id": job.id,
+        "book": str(job.book),
+        "chapter": {
+            "id": job.chapter.id,
+            "name": job.chapter.name,
+            "url": str(job.chapter.url),
+        },
+    }
+
+
+def job_from_json(data: dict[str, Any]) -> ChapterJob:
+    chapter = data["chapter"]
+    return ChapterJob(
+        id=data["id"],
+        book=URL(data["book"]),
+        chapter=Chapter(chapter["id"], chapter["name"], URL(chapter["url"])),
+    )
+
+
+def chapter_to_json(loaded_chapter: LoadedChapter) -> dict[str, Any]:
+    return {
+        "id": loaded_chapter.id,
+        "name": loaded_chapter.name,
+        "url": str(loaded_chapter.url),
+        "title": loaded_chapter.title,
+        "paragraphs": list(loaded_chapter.paragraphs),
+        "images": [
+            {"url": str(i.url), "data": base64.b64encode(i.data).decode()}
+            for i in loaded_chapter.images
+        ],
+    }
+
+
+def chapter_from_json(data: dict[str, Any]) -> LoadedChapter:
+    return LoadedChapter(
+        id=data["id"],
+        name=data["name"],
+        url=URL(data["url"]),
+        title=data["title"],
+        paragraphs=data["paragraphs"],
+        images=[
+            LoadedImage(url=URL(i["url"]), data=base64.b64decode(i["data"]))
+            for i in data["images"]
+        ],
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class WorkerBudget:
+    """What the coordinator hands every remote worker on registration."""
+
+    owner: str
+    lease: float
+    limiter: LimiterSettings
+    chapter_deadline: float | None
+
+
+@dataclass(eq=False)
+class JobServer:
+    """HTTP front of a job queue for workers on other machines.
+
+    Every worker gets the full rate limit of the run, as each one is expected
+    to fetch from its own address. Workers that stop calling for longer than a
+    lease have their jobs released for the others. Every request must carry
+    ``token`` as a bearer token.
+    """
+
+    queue: JobQueue
+    limiter: LimiterSettings
+    token: str
+    chapter_deadline: float | None = None
+    lease: float = 60.0
+    _last_seen: dict[str, float] = field(default_factory=dict[str, float])
+    _registered: int = 0
+    _runner: web.AppRunner | None = None
+    _reaper: asyncio.Task[None] | None = None
+
+    def application(self) -> web.Application:
+        app = web.Application(client_max_size=64 * 2**20, middlewares=[self._authorize])
+        app.add_routes(
+            [
+                web.post("/workers", self._register),
+                web.post("/claim", self._claim),
+                web.post("/renew", self._renew),
+                web.post("/complete", self._complete),
+                web.post("/fail", self._fail),
+                web.get("/drained", self._drained),
+            ]
+        )
+        return app
+
+    async def start(self, host: str, port: int) -> URL:
+        self._runner = web.AppRunner(self.application(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self._reaper = asyncio.create_task(self._reap())
+        address = self._runner.addresses[0]
+        url = URL.build(scheme="http", host=address[0], port=address[1])
+        logger.info(f"serve jobs on {url}")
+        return url
+
+    @web.middleware
+    async def _authorize(
+        self,
+        request: web.Request,
+        handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+    ) -> web.StreamResponse:
+        expected = f"Bearer {self.token}".encode()
+        given = request.headers.get(hdrs.AUTHORIZATION, "").encode()
+        if not secrets.compare_digest(given, expected):
+            logger.warning(f"rejected unauthorized request from {request.remote}")
+            raise web.HTTPUnauthorized
+        return await handler(request)
+
+    async def stop(self) -> None:
+        if self._reaper is not None:
+            self._reaper.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reaper
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def _reap(self) -> None:
+        while True:
+            await asyncio.sleep(self.lease / 2)
+            deadline = time.monotonic() - self.lease
+            for owner, seen in list(self._last_seen.items()):
+                if seen >= deadline:
+                    continue
+                del self._last_seen[owner]
+                released = await self.queue.release(owner)
+                logger.warning(f"worker {owner} went silent, {released} jobs released")
+
+    async def _seen(self, request: web.Request) -> tuple[str, dict[str, Any]]:
+        data = await request.json()
+        owner = data["owner"]
+        self._last_seen[owner] = time.monotonic()
+        return owner, data
+
+    async def _register(self, request: web.Request) -> web.Response:
+        data = await request.json()
+        self._registered += 1
+        owner = f"{data.get('name') or request.remote}-{self._registered}"
+        self._last_seen[owner] = time.monotonic()
+        logger.info(f"worker {owner} joined")
+        return web.json_response(
+            {
+                "owner": owner,
+                "lease": self.lease,
+                "limiter": self.limiter.model_dump(),
+                "chapter_deadline": self.chapter_deadline,
+            }
+        )
+
+    async def _claim(self, request: web.Request) -> web.Response:
+        owner, _ = await self._seen(request)
+        job = await self.queue.claim(owner, self.lease)
+        if job is None:
+            return web.Response(status=204)
+        return web.json_response(job_to_json(job))
+
+    async def _renew(self, request: web.Request) -> web.Response:
+        owner, _ = await self._seen(request)
+        await self.queue.renew(owner, self.lease)
+        return web.Response(status=204)
+
+    async def _complete(self, request: web.Request) -> web.Response:
+        owner, data = await self._seen(request)
+        job = job_from_json(data["job"])
+        await self.queue.complete(job, owner, chapter_from_json(data["chapter"]))
+        return web.Response(status=204)
+
+    async def _fail(self, request: web.Request) -> web.Response:
+        owner, data = await self._seen(request)
+        await self.queue.fail(job_from_json(data["job"]), owner, data["error"])
+        return web.Response(status=204)
+
+    async def _drained(self, _: web.Request) -> web.Response:
+        return web.json_response({"drained": await self.queue.drained()})
+
+
+@dataclass(eq=False)
+class HttpJobSource(JobSource):
+    """Jobs claimed from a coordinator over HTTP."""
+
+    session: aiohttp.ClientSession
+    coordinator: URL
+    token: str
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {hdrs.AUTHORIZATION: f"Bearer {self.token}"}
+
+    async def register(self, name: str | None) -> WorkerBudget:
+        data = await self._post("workers", {"name": name})
+        assert data is not None
+        return WorkerBudget(
+            owner=data["owner"],
+            lease=data["lease"],
+            limiter=LimiterSettings(**data["limiter"]),
+            chapter_deadline=data["chapter_deadline"],
+        )
+
+    @override
+    async def claim(self, owner: str, lease: float) -> ChapterJob | None:
+        try:
+            data = await self._post("claim", {"owner": owner})
+        except aiohttp.ClientConnectionError:
+            # the coordinator stops serving once every book is saved
+            return None
+        return job_from_json(data) if data is not None else None
+
+    @override
+    async def renew(self, owner: str, lease: float) -> None:
+        with contextlib.suppress(aiohttp.ClientConnectionError):
+            await self._post("renew", {"owner": owner})
+
+    @override
+    async def complete(
+        self, job: ChapterJob, owner: str, loaded_chapter: LoadedChapter
+    ) -> None:
+        await self._post(
+            "complete",
+            {
+                "owner": owner,
+                "job": job_to_json(job),
+                "chapter": chapter_to_json(loaded_chapter),
+            },
+        )
+
+    @override
+    async def fail(self, job: ChapterJob, owner: str, error: str) -> None:
+        await self._post(
+            "fail", {"owner": owner, "job": job_to_json(job), "error": error}
+        )
+
+    @override
+    async def drained(self) -> bool:
+        try:
+            async with self.session.get(
+                self.coordinator / "drained", headers=self.headers
+            ) as r:
+                r.raise_for_status()
+                return (await r.json())["drained"]
+        except aiohttp.ClientConnectionError:
+            logger.info(f"coordinator {self.coordinator} is gone")
+            return True
+
+    async def _post(self, path: str, data: dict[str, Any]) -> Any:
+        async with self.session.post(
+            self.coordinator / path, json=data, headers=self.headers
+        ) as r:
+            r.raise_for_status()
+            if r.status == 204:
+                return None
+            return await r.json()
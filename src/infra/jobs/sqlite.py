@@ -0,0 +1,221 @@
+import asyncio
+import pickle
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import override
+
+from yarl import URL
+
+from domain import Chapter, LoadedChapter
+from logic.jobs import ChapterJob, JobQueue, JobResult
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    book TEXT NOT NULL,
+    chapter_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    url TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    owner TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result BLOB,
+    error TEXT,
+    UNIQUE (book, url)
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, book);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+ENQUEUE = """
+INSERT INTO jobs (book, chapter_id, name, url) VALUES (?, ?, ?, ?)
+ON CONFLICT (book, url) DO UPDATE SET
+    chapter_id = excluded.chapter_id,
+    name = excluded.name,
+    state = 'pending',
+    owner = NULL,
+    attempts = 0,
+    result = NULL,
+    error = NULL
+"""
+
+CLAIM = """
+UPDATE jobs
+SET state = 'leased', owner = :owner, lease_until = :until, attempts = attempts + 1
+WHERE id = (
+    SELECT id FROM jobs
+    WHERE state = 'pending' OR (state = 'leased' AND lease_until < :now)
+    ORDER BY id
+    LIMIT 1
+)
+RETURNING id, book, chapter_id, name, url
+"""
+
+
+@dataclass(eq=False)
+class SqliteJobQueue(JobQueue):
+    """Job table in a SQLite database in WAL mode, shared between processes.
+
+    Results are pickled ``LoadedChapter`` objects, the database is only ever
+    read by the processes of one run.
+    """
+
+    path: Path
+    max_attempts: int = 5
+    _connection: sqlite3.Connection | None = None
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(
+                self.path, timeout=30, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def disconnect(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    async def _run[T](self, function: Callable[[sqlite3.Connection], T]) -> T:
+        def transaction() -> T:
+            with self._lock:
+                connection = self.connect()
+                connection.execute("BEGIN IMMEDIATE")
+                try:
+                    result = function(connection)
+                except BaseException:
+                    connection.execute("ROLLBACK")
+                    raise
+                connection.execute("COMMIT")
+                return result
+
+        return await asyncio.to_thread(transaction)
+
+    @override
+    async def enqueue(self, book: URL, chapters: Sequence[Chapter]) -> None:
+        rows = [(str(book), i.id, i.name, str(i.url)) for i in chapters]
+        await self._run(lambda c: c.executemany(ENQUEUE, rows))
+
+    @override
+    async def claim(self, owner: str, lease: float) -> ChapterJob | None:
+        def claim(connection: sqlite3.Connection) -> ChapterJob | None:
+            now = time.time()
+            connection.execute(
+                "UPDATE jobs SET state = 'failed', error = 'lease expired too often'"
+                " WHERE state = 'leased' AND lease_until < ? AND attempts >= ?",
+                (now, self.max_attempts),
+            )
+            row = connection.execute(
+                CLAIM, {"owner": owner, "until": now + lease, "now": now}
+            ).fetchone()
+            if row is None:
+                return None
+            id_, book, chapter_id, name, url = row
+            return ChapterJob(id_, URL(book), Chapter(chapter_id, name, URL(url)))
+
+        return await self._run(claim)
+
+    @override
+    async def renew(self, owner: str, lease: float) -> None:
+        await self._run(
+            lambda c: c.execute(
+                "UPDATE jobs SET lease_until = ? WHERE owner = ? AND state = 'leased'",
+                (time.time() + lease, owner),
+            )
+        )
+
+    @override
+    async def complete(
+        self, job: ChapterJob, owner: str, loaded_chapter: LoadedChapter
+    ) -> None:
+        result = pickle.dumps(loaded_chapter)
+        await self._run(
+            lambda c: c.execute(
+                "UPDATE jobs SET state = 'done', result = ?"
+                " WHERE id = ? AND owner = ? AND state = 'leased'",
+                (result, job.id, owner),
+            )
+        )
+
+    @override
+    async def fail(self, job: ChapterJob, owner: str, error: str) -> None:
+        await self._run(
+            lambda c: c.execute(
+                "UPDATE jobs SET state = 'failed', error = ?"
+                " WHERE id = ? AND owner = ? AND state = 'leased'",
+                (error, job.id, owner),
+            )
+        )
+
+    @override
+    async def release(self, owner: str) -> int:
+        return await self._run(
+            lambda c: (
+                c.execute(
+                    "UPDATE jobs SET state = 'pending', owner = NULL"
+                    " WHERE owner = ? AND state = 'leased'",
+                    (owner,),
+                ).rowcount
+            )
+        )
+
+    @override
+    async def take_results(self, book: URL, limit: int) -> list[JobResult]:
+        def take(connection: sqlite3.Connection) -> list[JobResult]:
+            rows = connection.execute(
+                "SELECT id, chapter_id, name, url, result, error FROM jobs"
+                " WHERE book = ? AND state IN ('done', 'failed') ORDER BY id LIMIT ?",
+                (str(book), limit),
+            ).fetchall()
+            connection.executemany(
+                "UPDATE jobs SET state = 'collected', result = NULL WHERE id = ?",
+                [(i[0],) for i in rows],
+            )
+            results: list[JobResult] = []
+            for id_, chapter_id, name, url, result, error in rows:
+                job = ChapterJob(id_, book, Chapter(chapter_id, name, URL(url)))
+                loaded = pickle.loads(result) if result is not None else None
+                results.append(JobResult(job, loaded, error))
+            return results
+
+        return await self._run(take)
+
+    @override
+    async def outstanding(self, book: URL) -> int:
+        return await self._run(
+            lambda c: c.execute(
+                "SELECT count(*) FROM jobs WHERE book = ? AND state != 'collected'",
+                (str(book),),
+            ).fetchone()[0]
+        )
+
+    @override
+    async def close(self) -> None:
+        await self._run(
+            lambda c: c.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('closed', '1')"
+            )
+        )
+
+    @override
+    async def drained(self) -> bool:
+        def drained(connection: sqlite3.Connection) -> bool:
+            closed = connection.execute(
+                "SELECT 1 FROM meta WHERE key = 'closed'"
+            ).fetchone()
+            left = connection.execute(
+                "SELECT 1 FROM jobs WHERE state IN ('pending', 'leased') LIMIT 1"
+            ).fetchone()
+            return closed is not None and left is None
+
+        return await self._run(drained)
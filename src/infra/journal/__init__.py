@@ -0,0 +1,6 @@
+from .dead_urls import FileDeadUrls
+from .file import FileChapterJournal
+from .manifest import FileBookManifest
+from .watch import FileWatchState
+
+__all__ = ["FileChapterJournal", "FileBookManifest", "FileWatchState", "FileDeadUrls"]
@@ -0,0 +1,78 @@
+import asyncio
+import json
+import os
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, override
+
+import aiofiles
+from loguru import logger
+from yarl import URL
+
+from logic.dead_urls import DeadUrls
+
+
+@dataclass(eq=False)
+class FileDeadUrls(DeadUrls):
+    """JSON lines of dead urls and their expiry, shared by the runs of a state.
+
+    Records are appended as urls die; expired ones are dropped when the file is
+    read, which rewrites it without them.
+    """
+
+    path: Path
+    ttl: float
+    _until: dict[str, float] | None = None
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    @classmethod
+    def for_state(cls, root: Path, ttl: float) -> "FileDeadUrls":
+        return cls(root / "dead_images.jsonl", ttl)
+
+    @override
+    def is_dead(self, url: URL) -> bool:
+        until = self._get_until().get(str(url))
+        return until is not None and until > time.time()
+
+    @override
+    async def mark_dead(self, url: URL, reason: str) -> None:
+        until = time.time() + self.ttl
+        self._get_until()[str(url)] = until
+        record = {"url": str(url), "until": until, "reason": reason}
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        async with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            async with aiofiles.open(self.path, "a", encoding="utf-8") as f:
+                await f.write(line)
+
+    def _get_until(self) -> dict[str, float]:
+        if self._until is None:
+            self._until = self._load()
+        return self._until
+
+    def _load(self) -> dict[str, float]:
+        if not self.path.exists():
+            return {}
+        records: dict[str, dict[str, Any]] = {}
+        with self.path.open(encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"skip broken line {number} of {self.path}")
+                    continue
+                records[record["url"]] = record
+        now = time.time()
+        live = [i for i in records.values() if i["until"] > now]
+        if len(live) < len(records):
+            self._rewrite(live)
+        return {i["url"]: i["until"] for i in live}
+
+    def _rewrite(self, records: Iterable[dict[str, Any]]) -> None:
+        partial = self.path.with_name(f"{self.path.name}.part")
+        with partial.open("w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        os.replace(partial, self.path)
@@ -0,0 +1,193 @@
+import asyncio
+import hashlib
+import itertools
+import json
+import os
+from collections.abc import AsyncIterator, Iterator, Sequence, Set
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, override
+
+import aiofiles
+from loguru import logger
+from yarl import URL
+
+from domain import AnyLoadedImage, LoadedChapter, SpooledImage
+from logic.journal import ChapterJournal
+from utils.files import write_image
+
+# records parsed per thread hop while replaying
+REPLAY_BATCH = 64
+
+
+def book_key(url: URL) -> str:
+    return hashlib.sha1(str(url).encode()).hexdigest()[:16]
+
+
+def chapter_to_record(
+    loaded_chapter: LoadedChapter, image_files: Sequence[str]
+) -> dict[str, Any]:
+    return {
+        "id": loaded_chapter.id,
+        "name": loaded_chapter.name,
+        "url": str(loaded_chapter.url),
+        "title": loaded_chapter.title,
+        "paragraphs": list(loaded_chapter.paragraphs),
+        "images": [
+            {"url": str(image.url), "file": file}
+            for image, file in zip(loaded_chapter.images, image_files, strict=True)
+        ],
+    }
+
+
+def chapter_from_record(
+    record: dict[str, Any], images: Sequence[AnyLoadedImage]
+) -> LoadedChapter:
+    return LoadedChapter(
+        id=record["id"],
+        name=record["name"],
+        url=URL(record["url"]),
+        title=record["title"],
+        paragraphs=record["paragraphs"],
+        images=images,
+    )
+
+
+@dataclass(eq=False)
+class FileChapterJournal(ChapterJournal):
+    """JSON lines journal with chapter images stored beside it by content hash.
+
+    The file is read and rewritten in threads, off the event loop.
+    """
+
+    directory: Path
+    _repaired: bool = False
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    @classmethod
+    def for_book(cls, url: URL, root: Path) -> "FileChapterJournal":
+        return cls(root / "journals" / book_key(url))
+
+    @property
+    def path(self) -> Path:
+        return self.directory / "journal.jsonl"
+
+    @property
+    def images_directory(self) -> Path:
+        return self.directory / "images"
+
+    @override
+    async def replay(self) -> AsyncIterator[LoadedChapter]:
+        latest = await asyncio.to_thread(self._latest_records)
+        records = self._read_records()
+        try:
+            while (
+                batch := await asyncio.to_thread(self._replay_batch, records, latest)
+            ) is not None:
+                for loaded_chapter in batch:
+                    yield loaded_chapter
+        finally:
+            records.close()
+
+    @override
+    async def record(self, loaded_chapter: LoadedChapter) -> None:
+        image_files = [await self._store_image(i) for i in loaded_chapter.images]
+        record = chapter_to_record(loaded_chapter, image_files)
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        async with self._lock:
+            if not self._repaired:
+                line = await asyncio.to_thread(self._terminate_last_line) + line
+                self._repaired = True
+            async with aiofiles.open(self.path, "a", encoding="utf-8") as f:
+                await f.write(line)
+        logger.trace(f"journal {loaded_chapter.base_name}")
+
+    @override
+    async def prune(self, keep: Set[str]) -> None:
+        async with self._lock:
+            dropped = await asyncio.to_thread(self._rewrite, keep)
+        if dropped:
+            logger.debug(f"prune {dropped} records from {self.path}")
+
+    def _terminate_last_line(self) -> str:
+        """Return a newline if a killed run left the last record unterminated."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            return ""
+        with self.path.open("rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return "" if f.read(1) == b"\n" else "\n"
+
+    def _read_records(self) -> Iterator[tuple[int, dict[str, Any]]]:
+        if not self.path.exists():
+            return
+        with self.path.open(encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield number, json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"skip broken line {number} of {self.path}")
+
+    def _latest_records(self) -> dict[str, int]:
+        """Line number of the latest record of every chapter url."""
+        return {record["url"]: number for number, record in self._read_records()}
+
+    def _replay_batch(
+        self, records: Iterator[tuple[int, dict[str, Any]]], latest: dict[str, int]
+    ) -> list[LoadedChapter] | None:
+        """Chapters of the next records, ``None`` once they are exhausted."""
+        batch = list(itertools.islice(records, REPLAY_BATCH))
+        if not batch:
+            return None
+        return [
+            chapter_from_record(record, [self._load_image(i) for i in record["images"]])
+            for number, record in batch
+            if latest[record["url"]] == number
+        ]
+
+    def _rewrite(self, keep: Set[str]) -> int:
+        """Keep the latest records of ``keep`` and the images they use.
+
+        Returns the number of records dropped.
+        """
+        if not self.path.exists():
+            return 0
+        latest = self._latest_records()
+        kept: list[str] = []
+        files: set[str] = set()
+        total = 0
+        for number, record in self._read_records():
+            total += 1
+            if record["url"] in keep and latest[record["url"]] == number:
+                kept.append(json.dumps(record, ensure_ascii=False) + "\n")
+                files.update(i["file"] for i in record["images"])
+        # rewritten even when nothing is dropped, which drops broken lines too
+        partial = self.path.with_name(f"{self.path.name}.part")
+        partial.write_text("".join(kept), encoding="utf-8")
+        os.replace(partial, self.path)
+        if self.images_directory.exists():
+            for path in self.images_directory.iterdir():
+                if path.name not in files and not path.name.endswith(".part"):
+                    path.unlink(missing_ok=True)
+        return total - len(kept)
+
+    def _load_image(self, entry: dict[str, str]) -> SpooledImage:
+        """Journaled image, read from the journal only once it is saved."""
+        path = self.images_directory / entry["file"]
+        # files are named by the sha256 of the content, a 64 digit hex string
+        digest = entry["file"][:64]
+        size = path.stat().st_size
+        return SpooledImage(url=URL(entry["url"]), path=path, size=size, digest=digest)
+
+    async def _store_image(self, image: AnyLoadedImage) -> str:
+        file = image.digest + image.extension
+        path = self.images_directory / file
+        if path.exists():
+            return file
+        self.images_directory.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(f"{file}.{id(image)}.part")
+        await asyncio.to_thread(write_image, image, partial)
+        os.replace(partial, path)
+        return file
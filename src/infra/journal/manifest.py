@@ -0,0 +1,59 @@
+import json
+import os
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import override
+
+import aiofiles
+from yarl import URL
+
+from logic.manifest import BookManifest, ManifestEntry
+
+from .file import book_key
+
+
+@dataclass(eq=False)
+class FileBookManifest(BookManifest):
+    """Manifest kept as one JSON object beside the book journal."""
+
+    path: Path
+    _entries: dict[str, ManifestEntry] | None = None
+    _dirty: bool = False
+
+    @classmethod
+    def for_book(cls, url: URL, root: Path) -> "FileBookManifest":
+        return cls(root / "journals" / book_key(url) / "manifest.json")
+
+    @override
+    def entries(self) -> Mapping[str, ManifestEntry]:
+        return self._get_entries()
+
+    @override
+    def update(self, url: str, entry: ManifestEntry) -> None:
+        entries = self._get_entries()
+        if entries.get(url) != entry:
+            entries[url] = entry
+            self._dirty = True
+
+    @override
+    async def save(self) -> None:
+        if not self._dirty:
+            return
+        data = {url: asdict(entry) for url, entry in self._get_entries().items()}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        partial = self.path.with_suffix(".json.part")
+        async with aiofiles.open(partial, "w", encoding="utf-8") as f:
+            await f.write(json.dumps(data, ensure_ascii=False, indent=1))
+        os.replace(partial, self.path)
+        self._dirty = False
+
+    def _get_entries(self) -> dict[str, ManifestEntry]:
+        if self._entries is None:
+            self._entries = {}
+            if self.path.exists():
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                self._entries = {
+                    url: ManifestEntry(**entry) for url, entry in data.items()
+                }
+        return self._entries
@@ -0,0 +1,54 @@
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import override
+
+import aiofiles
+from yarl import URL
+
+from logic.watch import SeenIndex, Validators, WatchState
+
+from .file import book_key
+
+
+@dataclass(eq=False)
+class FileWatchState(WatchState):
+    """Seen index as packed 64-bit digests and validators as JSON beside the journal."""
+
+    directory: Path
+
+    @classmethod
+    def for_book(cls, url: URL, root: Path) -> "FileWatchState":
+        return cls(root / "journals" / book_key(url))
+
+    @property
+    def seen_path(self) -> Path:
+        return self.directory / "seen.bin"
+
+    @property
+    def validators_path(self) -> Path:
+        return self.directory / "validators.json"
+
+    @override
+    def load(self) -> tuple[SeenIndex, Validators]:
+        seen = SeenIndex()
+        if self.seen_path.exists():
+            seen = SeenIndex.from_bytes(self.seen_path.read_bytes())
+        validators = Validators()
+        if self.validators_path.exists():
+            data = json.loads(self.validators_path.read_text(encoding="utf-8"))
+            validators = Validators(**data)
+        return seen, validators
+
+    @override
+    async def save(self, seen: SeenIndex, validators: Validators) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        await self._write(self.seen_path, seen.to_bytes())
+        await self._write(self.validators_path, json.dumps(asdict(validators)).encode())
+
+    async def _write(self, path: Path, data: bytes) -> None:
+        partial = path.with_name(f"{path.name}.part")
+        async with aiofiles.open(partial, "wb") as f:
+            await f.write(data)
+        os.replace(partial, path)
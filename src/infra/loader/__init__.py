@@ -1,3 +1,5 @@
 from .basic_image import BasicImageLoader
+from .resilient import ResilientImageLoader
+from .transcoding import TranscodingImageLoader
 
-__all__ = ["BasicImageLoader"]
+__all__ = ["BasicImageLoader", "ResilientImageLoader", "TranscodingImageLoader"]
@@ -2,9 +2,15 @@ from typing import override
 
 import aiohttp
 from loguru import logger
+from yarl import URL
 
-from domain import Image, LoadedImage
+from domain import AnyLoadedImage, Image, LoadedImage, SpooledImage
+from infra.loader.exceptions import ImageLoadError, ImageStatusError, NotAnImageError
+from infra.loader.magic import image_format, read_head
+from infra.loader.spool import current_spool, spool_response
 from logic import ImageLoader
+from logic.exceptions.base import DeadlineExceededError
+from utils.bs4 import get_timeout
 
 
 class BasicImageLoader(ImageLoader):
@@ -37,20 +43,34 @@ class BasicImageLoader(ImageLoader):
             self.headers = headers
 
     @override
-    async def load_image(self, image: Image) -> LoadedImage | None:
+    async def load_image(self, image: Image) -> AnyLoadedImage | None:
         url = image.url
         timeout = 3
         try:
-            async with self.session.get(
-                url, headers=self.headers, timeout=aiohttp.ClientTimeout(total=timeout)
-            ) as r:
-                try:
-                    r.raise_for_status()
-                except aiohttp.ClientResponseError as e:
-                    logger.opt(exception=e).warning(
-                        f"Got {e.code} status code from {url}"
-                    )
-                data = await r.read()
-                return LoadedImage(url=url, data=data)
+            return await self.fetch(url, timeout)
+        except ImageLoadError as e:
+            logger.warning(e.message)
         except TimeoutError:
             logger.warning(f"got timeout from {url} with {timeout} sec.")
+        except DeadlineExceededError:
+            logger.warning(f"skip {url}: deadline exceeded")
+        return None
+
+    async def fetch(self, url: URL, timeout: float) -> AnyLoadedImage:
+        """Load an image, raising ``ImageLoadError`` for error answers and pages."""
+        async with self.session.get(
+            url, headers=self.headers, timeout=get_timeout(self.session, timeout)
+        ) as r:
+            if r.status >= 400:
+                raise ImageStatusError(url=url, status=r.status, reason=r.reason or "")
+            spool = current_spool()
+            if spool is not None:
+                loaded = await spool_response(url, r, spool)
+            else:
+                loaded = LoadedImage(url=url, data=await r.read())
+        head = read_head(loaded)
+        if image_format(head) is None:
+            if isinstance(loaded, SpooledImage):
+                loaded.path.unlink(missing_ok=True)
+            raise NotAnImageError(url=url, head=head[:16])
+        return loaded
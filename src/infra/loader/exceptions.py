@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from yarl import URL
+
+from infra.exceptions.base import BaseInfraError
+
+# answers worth asking again: timeout, too early, too many requests
+TRANSIENT_STATUSES = frozenset({408, 425, 429})
+
+
+@dataclass(eq=False, slots=True, kw_only=True)
+class ImageLoadError(BaseInfraError):
+    url: URL
+
+    @property
+    def message(self) -> str:
+        return f"Can't load image {self.url}."
+
+
+@dataclass(eq=False, slots=True, kw_only=True)
+class ImageStatusError(ImageLoadError):
+    status: int
+    reason: str = ""
+
+    @property
+    def transient(self) -> bool:
+        return self.status in TRANSIENT_STATUSES or self.status >= 500
+
+    @property
+    def message(self) -> str:
+        return f"Got {self.status} {self.reason} from image {self.url}."
+
+
+@dataclass(eq=False, slots=True, kw_only=True)
+class NotAnImageError(ImageLoadError):
+    head: bytes
+
+    @property
+    def message(self) -> str:
+        return f"Response of image {self.url} is not an image: {self.head!r}."
@@ -0,0 +1,39 @@
+"""Tell images from error pages by the first bytes of the body."""
+
+from domain import AnyLoadedImage, SpooledImage
+
+# enough to reach the <svg tag behind an XML prolog
+HEAD_SIZE = 256
+SIGNATURES = (
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+    (b"BM", "bmp"),
+    (b"II*\x00", "tiff"),
+    (b"MM\x00*", "tiff"),
+    (b"\x00\x00\x01\x00", "ico"),
+)
+ISO_BRANDS = frozenset({b"avif", b"avis", b"heic", b"heix", b"mif1", b"msf1"})
+
+
+def image_format(head: bytes) -> str | None:
+    """Format of an image starting with head, ``None`` for anything else."""
+    for signature, name in SIGNATURES:
+        if head.startswith(signature):
+            return name
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    if head[4:8] == b"ftyp" and head[8:12] in ISO_BRANDS:
+        return "avif" if head[8:11] == b"avi" else "heif"
+    text = head.lstrip().lower()
+    if text.startswith(b"<svg") or (text.startswith(b"<?xml") and b"<svg" in text):
+        return "svg"
+    return None
+
+
+def read_head(image: AnyLoadedImage) -> bytes:
+    if isinstance(image, SpooledImage):
+        with image.path.open("rb") as f:
+            return f.read(HEAD_SIZE)
+    return image.data[:HEAD_SIZE]
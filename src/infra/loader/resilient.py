@@ -0,0 +1,87 @@
+from typing import override
+
+import aiohttp
+from loguru import logger
+from tenacity import (
+    AsyncRetrying,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+
+from config.data import ImageSettings
+from domain import AnyLoadedImage, Image
+from infra.loader.basic_image import BasicImageLoader
+from infra.loader.exceptions import ImageStatusError, NotAnImageError
+from logic.dead_urls import DeadUrls
+from logic.exceptions.base import DeadlineExceededError
+from logic.rate_limit import HostConcurrency
+
+# backoff between attempts grows up to this many seconds
+MAX_BACKOFF = 30.0
+
+
+def is_transient(error: BaseException) -> bool:
+    if isinstance(error, ImageStatusError):
+        return error.transient
+    return isinstance(
+        error,
+        TimeoutError | aiohttp.ClientConnectionError | aiohttp.ClientPayloadError,
+    )
+
+
+class ResilientImageLoader(BasicImageLoader):
+    """Image loader retrying transient failures and skipping dead urls.
+
+    At most ``per_host`` images are requested from a host at once. Timeouts,
+    connection errors, 429 and 5xx answers are retried with exponential
+    backoff. Other error answers are recorded in ``dead_urls``, so the url is
+    not requested again until the record expires. Bodies that are not images
+    are dropped.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        settings: ImageSettings,
+        dead_urls: DeadUrls | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        super().__init__(session, headers)
+        self.settings = settings
+        self.dead_urls = dead_urls
+        self.hosts = HostConcurrency(settings.per_host)
+
+    @override
+    async def load_image(self, image: Image) -> AnyLoadedImage | None:
+        url = image.url
+        if self.dead_urls is not None and self.dead_urls.is_dead(url):
+            logger.debug(f"skip dead image {url}")
+            return None
+        attempts = self.settings.attempts
+        try:
+            async for attempt in AsyncRetrying(
+                stop=stop_after_attempt(attempts),
+                wait=wait_exponential_jitter(
+                    initial=self.settings.backoff, max=MAX_BACKOFF
+                ),
+                retry=retry_if_exception(is_transient),
+                reraise=True,
+            ):
+                with attempt:
+                    async with self.hosts.for_url(url):
+                        return await self.fetch(url, self.settings.timeout)
+        except ImageStatusError as e:
+            if e.transient:
+                logger.warning(f"{e.message} Gave up after {attempts} attempts.")
+                return None
+            logger.warning(e.message)
+            if self.dead_urls is not None:
+                await self.dead_urls.mark_dead(url, f"{e.status} {e.reason}".strip())
+        except NotAnImageError as e:
+            logger.warning(e.message)
+        except (TimeoutError, aiohttp.ClientError) as e:
+            logger.warning(f"give up image {url} after {attempts} attempts: {e!r}")
+        except DeadlineExceededError:
+            logger.warning(f"skip {url}: deadline exceeded")
+        return None
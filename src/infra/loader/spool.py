@@ -0,0 +1,82 @@
+"""Directory the image bodies of a book are streamed to.
+
+``BasicImageLoader`` writes images to the spool of the current context and
+hands out ``SpooledImage``; outside of a ``SpoolScope`` images stay in memory.
+"""
+
+import hashlib
+import shutil
+import tempfile
+import uuid
+from contextvars import ContextVar, Token
+from pathlib import Path
+from types import TracebackType
+
+import aiofiles
+import aiohttp
+from yarl import URL
+
+from domain import SpooledImage
+
+CHUNK_SIZE = 2**16
+
+_current_spool: ContextVar[Path | None] = ContextVar("current_spool", default=None)
+
+
+def current_spool() -> Path | None:
+    return _current_spool.get()
+
+
+class SpoolScope:
+    """Spool the images loaded inside the block to a new directory under parent.
+
+    The directory is removed on exit, so whatever reads the images, a saver
+    above all, must be done with them by then.
+    """
+
+    def __init__(self, parent: Path) -> None:
+        self.parent = parent
+        self.directory: Path | None = None
+        self._token: Token[Path | None] | None = None
+
+    def __enter__(self) -> Path:
+        self.parent.mkdir(parents=True, exist_ok=True)
+        self.directory = Path(tempfile.mkdtemp(dir=self.parent))
+        self._token = _current_spool.set(self.directory)
+        return self.directory
+
+    def __exit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception_value: BaseException | None,
+        exception_traceback: TracebackType | None,
+    ) -> None:
+        if self._token is not None:
+            _current_spool.reset(self._token)
+            self._token = None
+        if self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
+
+def spool_bytes(url: URL, data: bytes, directory: Path) -> SpooledImage:
+    """Write an image already in memory to the spool."""
+    path = directory / uuid.uuid4().hex
+    path.write_bytes(data)
+    digest = hashlib.sha256(data).hexdigest()
+    return SpooledImage(url=url, path=path, size=len(data), digest=digest)
+
+
+async def spool_response(
+    url: URL, response: aiohttp.ClientResponse, directory: Path
+) -> SpooledImage:
+    """Stream a response body to the spool, hashing it on the way."""
+    path = directory / uuid.uuid4().hex
+    digest = hashlib.sha256()
+    size = 0
+    async with aiofiles.open(path, "wb") as f:
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+            await f.write(chunk)
+    return SpooledImage(url=url, path=path, size=size, digest=digest.hexdigest())
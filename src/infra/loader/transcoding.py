@@ -0,0 +1,165 @@
+"""Recompress loaded images with Pillow in a process pool.
+
+Pillow is optional: ``transcode`` imports it in the pool process, and
+``require_pillow`` fails early in the main one when it is missing.
+"""
+
+import asyncio
+import io
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, override
+
+from loguru import logger
+
+from config.data import TranscodeSettings
+from domain import AnyLoadedImage, Image, LoadedImage, SpooledImage
+from infra.exceptions.base import ImageTranscodingUnavailableError
+from infra.loader.spool import current_spool, spool_bytes
+from logic import ImageLoader
+
+EXTENSIONS = {"JPEG": ".jpg", "PNG": ".png", "WEBP": ".webp", "GIF": ".gif"}
+UNBOUNDED = 2**31
+
+
+@dataclass(frozen=True, slots=True)
+class TranscodedImage:
+    data: bytes
+    extension: str
+    seconds: float
+
+
+@dataclass
+class TranscodeReport:
+    """Totals of the images a transcoding loader went through."""
+
+    images: int = 0
+    kept: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    seconds: float = 0.0
+
+    def add(self, size: int, transcoded: TranscodedImage | None) -> None:
+        self.images += 1
+        self.bytes_in += size
+        if transcoded is None:
+            self.kept += 1
+            self.bytes_out += size
+            return
+        self.bytes_out += len(transcoded.data)
+        self.seconds += transcoded.seconds
+
+    @property
+    def summary(self) -> str:
+        return (
+            f"transcoded {self.images - self.kept} of {self.images} images "
+            f"in {self.seconds:.1f} s: {self.bytes_in / 2**20:.1f} MiB -> "
+            f"{self.bytes_out / 2**20:.1f} MiB"
+        )
+
+
+def require_pillow() -> None:
+    try:
+        import PIL  # noqa: F401  # pyright: ignore[reportUnusedImport]
+    except ImportError as exc:
+        raise ImageTranscodingUnavailableError() from exc
+
+
+def transcode(
+    content: bytes | Path, settings: TranscodeSettings
+) -> TranscodedImage | None:
+    """Recompress an image, or ``None`` to keep it as it is.
+
+    ``content`` is the image or the spool file holding it, read in the pool
+    process. Images Pillow can't read, animations and results bigger than an
+    image of unchanged format and size are kept.
+    """
+    from PIL import Image as PilImage
+    from PIL import ImageOps
+
+    started = time.perf_counter()
+    data = content.read_bytes() if isinstance(content, Path) else content
+    try:
+        with PilImage.open(io.BytesIO(data)) as source:
+            if getattr(source, "is_animated", False):
+                return None
+            source_format = source.format or ""
+            target = settings.format or source_format
+            if target not in EXTENSIONS:
+                return None
+            # applies the EXIF orientation before the EXIF block is dropped
+            image = ImageOps.exif_transpose(source)
+            size = image.size
+            if settings.max_width is not None or settings.max_height is not None:
+                image.thumbnail(
+                    (settings.max_width or UNBOUNDED, settings.max_height or UNBOUNDED),
+                    PilImage.Resampling.LANCZOS,
+                )
+            if target == "JPEG" and image.mode not in ("RGB", "L"):
+                image = _flatten(image)
+            options: dict[str, Any] = {"optimize": True}
+            if target in ("JPEG", "WEBP"):
+                options["quality"] = settings.quality
+            if icc_profile := source.info.get("icc_profile"):
+                options["icc_profile"] = icc_profile
+            if not settings.strip_metadata and (exif := source.info.get("exif")):
+                options["exif"] = exif
+            output = io.BytesIO()
+            image.save(output, target, **options)
+    except (OSError, ValueError, PilImage.DecompressionBombError):
+        return None
+    result = output.getvalue()
+    if target == source_format and image.size == size and len(result) >= len(data):
+        return None
+    return TranscodedImage(result, EXTENSIONS[target], time.perf_counter() - started)
+
+
+def _flatten(image: Any) -> Any:
+    from PIL import Image as PilImage
+
+    rgba = image.convert("RGBA")
+    background = PilImage.new("RGB", rgba.size, "white")
+    background.paste(rgba, mask=rgba.getchannel("A"))
+    return background
+
+
+class TranscodingImageLoader(ImageLoader):
+    """Image loader recompressing the images of another one in a process pool."""
+
+    def __init__(
+        self, loader: ImageLoader, settings: TranscodeSettings, pool: Executor
+    ) -> None:
+        super().__init__(loader.session)
+        self.loader = loader
+        self.settings = settings
+        self.pool = pool
+        self.report = TranscodeReport()
+
+    @override
+    async def load_image(self, image: Image) -> AnyLoadedImage | None:
+        loaded = await self.loader.load_image(image)
+        if loaded is None:
+            return None
+        loop = asyncio.get_running_loop()
+        # a spooled image is read by the pool process, not the event loop
+        content = loaded.path if isinstance(loaded, SpooledImage) else loaded.data
+        transcoded = await loop.run_in_executor(
+            self.pool, transcode, content, self.settings
+        )
+        self.report.add(loaded.size, transcoded)
+        if transcoded is None:
+            return loaded
+        logger.trace(
+            f"transcode {loaded.url}: {loaded.size} -> {len(transcoded.data)} bytes"
+        )
+        url = loaded.url
+        if url.suffix.lower() != transcoded.extension:
+            # savers name and type images by the suffix of their url
+            url = url.with_suffix(transcoded.extension)
+        if isinstance(loaded, SpooledImage):
+            loaded.path.unlink(missing_ok=True)
+        if (spool := current_spool()) is not None:
+            return await asyncio.to_thread(spool_bytes, url, transcoded.data, spool)
+        return LoadedImage(url=url, data=transcoded.data)
@@ -0,0 +1,391 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Mapping, Sequence
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from functools import cache
+from typing import Any, Literal, override
+
+import aiohttp
+import lxml.html
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.element import Tag
+from lxml import etree
+from yarl import URL
+
+from logic.deadline import check_deadline
+from utils.bs4 import get_html
+
+ParserName = Literal["lxml", "bs4"]
+ClassFilter = str | Sequence[str] | None
+
+# text inside these tags is not page text, as in BeautifulSoup
+HIDDEN_TEXT_TAGS = frozenset({"script", "style", "template"})
+
+
+@dataclass(frozen=True, slots=True)
+class Region:
+    """Element a parser reads, kept with its whole subtree by a filtered parse."""
+
+    name: str
+    class_: str | None = None
+    id: str | None = None
+
+    def matches(self, name: str, attrs: Mapping[str, str]) -> bool:
+        if name != self.name:
+            return False
+        if self.id is not None and attrs.get("id") != self.id:
+            return False
+        return self.class_ is None or self.class_ in attrs.get("class", "").split()
+
+
+Regions = Sequence[Region]
+
+
+class Node(ABC):
+    """Element of a parsed page, whatever parser built it.
+
+    The lookups follow BeautifulSoup: ``class_`` matches one of the classes of
+    an element (any of them when a list is given) and ``find_next`` searches
+    the descendants and then everything after the element in document order.
+    """
+
+    @property
+    @abstractmethod
+    def name(self) -> str: ...
+
+    @abstractmethod
+    def find(
+        self,
+        name: str | None = None,
+        *,
+        class_: ClassFilter = None,
+        id: str | None = None,
+        attrs: Mapping[str, str] | None = None,
+    ) -> Node | None: ...
+
+    @abstractmethod
+    def find_all(
+        self,
+        name: str | None = None,
+        *,
+        class_: ClassFilter = None,
+        id: str | None = None,
+        attrs: Mapping[str, str] | None = None,
+    ) -> list[Node]: ...
+
+    @abstractmethod
+    def find_next(self, name: str) -> Node | None: ...
+
+    @abstractmethod
+    def get(self, attr: str) -> str | None: ...
+
+    @abstractmethod
+    def get_text(self, separator: str = "", strip: bool = False) -> str: ...
+
+    @property
+    def text(self) -> str:
+        return self.get_text()
+
+
+@dataclass(frozen=True, slots=True)
+class SoupNode(Node):
+    tag: Tag | BeautifulSoup
+
+    @property
+    @override
+    def name(self) -> str:
+        return self.tag.name
+
+    @override
+    def find(
+        self,
+        name: str | None = None,
+        *,
+        class_: ClassFilter = None,
+        id: str | None = None,
+        attrs: Mapping[str, str] | None = None,
+    ) -> Node | None:
+        tag = self.tag.find(name, **_soup_filters(class_, id, attrs))
+        return SoupNode(tag) if isinstance(tag, Tag) else None
+
+    @override
+    def find_all(
+        self,
+        name: str | None = None,
+        *,
+        class_: ClassFilter = None,
+        id: str | None = None,
+        attrs: Mapping[str, str] | None = None,
+    ) -> list[Node]:
+        tags = self.tag.find_all(name, **_soup_filters(class_, id, attrs))
+        return [SoupNode(i) for i in tags if isinstance(i, Tag)]
+
+    @override
+    def find_next(self, name: str) -> Node | None:
+        tag = self.tag.find_next(name)
+        return SoupNode(tag) if isinstance(tag, Tag) else None
+
+    @override
+    def get(self, attr: str) -> str | None:
+        value = self.tag.get(attr)
+        if isinstance(value, list):
+            return " ".join(value)
+        return value
+
+    @override
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        return self.tag.get_text(separator, strip=strip)
+
+
+def _soup_filters(
+    class_: ClassFilter, id: str | None, attrs: Mapping[str, str] | None
+) -> dict[str, Any]:
+    filters: dict[str, Any] = {"attrs": dict(attrs or {})}
+    if class_ is not None:
+        filters["class_"] = class_ if isinstance(class_, str) else list(class_)
+    if id is not None:
+        filters["id"] = id
+    return filters
+
+
+@dataclass(frozen=True, slots=True)
+class LxmlNode(Node):
+    element: etree._Element
+
+    @property
+    @override
+    def name(self) -> str:
+        return str(self.element.tag)
+
+    @override
+    def find(
+        self,
+        name: str | None = None,
+        *,
+        class_: ClassFilter = None,
+        id: str | None = None,
+        attrs: Mapping[str, str] | None = None,
+    ) -> Node | None:
+        query = _query("first", name, *_query_filters(class_, id, attrs))
+        found = query(self.element)
+        return LxmlNode(found[0]) if found else None
+
+    @override
+    def find_all(
+        self,
+        name: str | None = None,
+        *,
+        class_: ClassFilter = None,
+        id: str | None = None,
+        attrs: Mapping[str, str] | None = None,
+    ) -> list[Node]:
+        query = _query("all", name, *_query_filters(class_, id, attrs))
+        return [LxmlNode(i) for i in query(self.element)]
+
+    @override
+    def find_next(self, name: str) -> Node | None:
+        found = _query("next", name, (), None, ())(self.element)
+        return LxmlNode(found[0]) if found else None
+
+    @override
+    def get(self, attr: str) -> str | None:
+        return self.element.get(attr)
+
+    @override
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        if self.element.tag in HIDDEN_TEXT_TAGS:
+            strings: list[str] = list(self.element.itertext())
+        else:
+            strings = _VISIBLE_TEXT(self.element)
+        if strip:
+            strings = [i for i in (i.strip() for i in strings) if i]
+        return separator.join(strings)
+
+
+_VISIBLE_TEXT = etree.XPath(
+    "descendant::text()"
+    "[not(ancestor::script or ancestor::style or ancestor::template)]",
+    smart_strings=False,
+)
+
+
+def _query_filters(
+    class_: ClassFilter, id: str | None, attrs: Mapping[str, str] | None
+) -> tuple[tuple[str, ...], str | None, tuple[tuple[str, str], ...]]:
+    classes = (class_,) if isinstance(class_, str) else tuple(class_ or ())
+    return classes, id, tuple(sorted((attrs or {}).items()))
+
+
+@cache
+def _query(
+    axis: Literal["first", "all", "next"],
+    name: str | None,
+    classes: tuple[str, ...],
+    id: str | None,
+    attrs: tuple[tuple[str, str], ...],
+) -> etree.XPath:
+    """Compile a BeautifulSoup style lookup to XPath, once per distinct lookup."""
+    step = _step(name, classes, id, attrs)
+    match axis:
+        case "first":
+            path = f"(descendant::{step})[1]"
+        case "all":
+            path = f"descendant::{step}"
+        case "next":
+            path = f"(descendant::{step} | following::{step})[1]"
+    return etree.XPath(path)
+
+
+@cache
+def _regions_query(regions: tuple[Region, ...]) -> etree.XPath:
+    steps = (_step(i.name, (i.class_,) if i.class_ else (), i.id, ()) for i in regions)
+    return etree.XPath(" | ".join(f"descendant::{i}" for i in steps))
+
+
+def _step(
+    name: str | None,
+    classes: tuple[str, ...],
+    id: str | None,
+    attrs: tuple[tuple[str, str], ...],
+) -> str:
+    step = name or "*"
+    if classes:
+        step += f"[{' or '.join(_class_test(i) for i in classes)}]"
+    if id is not None:
+        step += f"[@id={_literal(id)}]"
+    for attr, value in attrs:
+        step += f"[@{attr}={_literal(value)}]"
+    return step
+
+
+def _class_test(class_: str) -> str:
+    if " " in class_:
+        # BeautifulSoup compares a class with spaces to the whole attribute
+        return f"normalize-space(@class)={_literal(class_)}"
+    padded = _literal(f" {class_} ")
+    return f"contains(concat(' ', normalize-space(@class), ' '), {padded})"
+
+
+def _literal(value: str) -> str:
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    quote = ', "\'", '
+    return f"concat({quote.join(f"'{i}'" for i in value.split("'"))})"
+
+
+class ParserBackend(ABC):
+    """Turns the html of a page into the ``Node`` of its document.
+
+    Given ``regions``, the document holds only the outermost elements matching
+    them, in page order, so headers, sidebars and comments a parser never
+    reads are not kept.
+    """
+
+    @abstractmethod
+    def parse(self, html: str, regions: Regions = ()) -> Node: ...
+
+
+class RegionStrainer(SoupStrainer):
+    """Let BeautifulSoup create only the tags inside the regions."""
+
+    def __init__(self, regions: Regions) -> None:
+        super().__init__()
+        self.regions = regions
+
+    @override
+    def allow_tag_creation(
+        self, nsprefix: str | None, name: str, attrs: Mapping[str, str] | None
+    ) -> bool:
+        return any(i.matches(name, attrs or {}) for i in self.regions)
+
+    @override
+    def allow_string_creation(self, string: str) -> bool:
+        return False
+
+
+class SoupBackend(ParserBackend):
+    @override
+    def parse(self, html: str, regions: Regions = ()) -> Node:
+        parse_only = RegionStrainer(regions) if regions else None
+        return SoupNode(BeautifulSoup(html, "lxml", parse_only=parse_only))
+
+
+class LxmlBackend(ParserBackend):
+    """Direct lxml tree, several times faster than building a soup.
+
+    Pages lxml refuses as a whole, such as empty documents or ones declaring
+    their encoding, are handed to BeautifulSoup.
+    """
+
+    @override
+    def parse(self, html: str, regions: Regions = ()) -> Node:
+        try:
+            root = lxml.html.document_fromstring(html)
+        except (ValueError, etree.ParserError):
+            return SoupBackend().parse(html, regions)
+        if regions:
+            root = _keep_regions(root, tuple(regions))
+        return LxmlNode(root)
+
+
+def _keep_regions(root: etree._Element, regions: tuple[Region, ...]) -> etree._Element:
+    """Move the outermost region elements into a document of their own.
+
+    libxml2 builds the whole tree faster than a Python parser target could
+    skip it, so the tree is built and everything outside the regions is
+    dropped with it.
+    """
+    kept: list[etree._Element] = []
+    taken: set[etree._Element] = set()
+    for element in _regions_query(regions)(root):
+        if not taken.intersection(element.iterancestors()):
+            kept.append(element)
+        taken.add(element)
+    document = lxml.html.Element("html")
+    for element in kept:
+        element.tail = None
+        document.append(element)
+    return document
+
+
+PARSER_BACKENDS: dict[ParserName, ParserBackend] = {
+    "lxml": LxmlBackend(),
+    "bs4": SoupBackend(),
+}
+
+_current_backend: ContextVar[ParserBackend] = ContextVar(
+    "current_parser_backend", default=PARSER_BACKENDS["lxml"]
+)
+
+
+@dataclass
+class ParserBackendScope:
+    """Parse the pages loaded inside the block with the named backend."""
+
+    name: ParserName
+    _token: Token[ParserBackend] | None = None
+
+    def __enter__(self) -> ParserBackend:
+        backend = PARSER_BACKENDS[self.name]
+        self._token = _current_backend.set(backend)
+        return backend
+
+    def __exit__(self, *_: object) -> None:
+        assert self._token is not None
+        _current_backend.reset(self._token)
+
+
+def parse_html(html: str, regions: Regions = ()) -> Node:
+    return _current_backend.get().parse(html, regions)
+
+
+async def get_document(
+    session: aiohttp.ClientSession, url: URL, regions: Regions = ()
+) -> Node:
+    html = await get_html(session, url)
+    check_deadline("parsing a page")
+    return parse_html(html, regions)
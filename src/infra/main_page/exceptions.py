@@ -7,7 +7,7 @@ from yarl import URL
 from infra.exceptions.base import BaseInfraError
 
 
-@dataclass(frozen=True, slots=True, kw_only=True)
+@dataclass(eq=False, slots=True, kw_only=True)
 class MainPageParsingError(BaseInfraError):
     """Raised when a main page or chapter could not be parsed."""
 
@@ -22,7 +22,7 @@ class MainPageParsingError(BaseInfraError):
         return message
 
 
-@dataclass(frozen=True, slots=True, kw_only=True)
+@dataclass(eq=False, slots=True, kw_only=True)
 class CaptchaDetectedError(MainPageParsingError):
     site_name: str | None = None
 
@@ -37,7 +37,7 @@ class CaptchaDetectedError(MainPageParsingError):
         return message
 
 
-@dataclass(frozen=True, slots=True, kw_only=True)
+@dataclass(eq=False, slots=True, kw_only=True)
 class ChapterAccessRestrictedError(MainPageParsingError):
     reason: str | None = None
 
@@ -52,7 +52,7 @@ class ChapterAccessRestrictedError(MainPageParsingError):
         return message
 
 
-@dataclass(frozen=True, slots=True, kw_only=True)
+@dataclass(eq=False, slots=True, kw_only=True)
 class EmptyChapterContentError(MainPageParsingError):
     @property
     def message(self) -> str:
@@ -62,7 +62,7 @@ class EmptyChapterContentError(MainPageParsingError):
         return message
 
 
-@dataclass(frozen=True, slots=True, kw_only=True)
+@dataclass(eq=False, slots=True, kw_only=True)
 class JsonParsingError(BaseInfraError):
     page_url: URL | None = None
 
@@ -74,7 +74,7 @@ class JsonParsingError(BaseInfraError):
         return message
 
 
-@dataclass(frozen=True, slots=True, kw_only=True)
+@dataclass(eq=False, slots=True, kw_only=True)
 class JsonValidationError(BaseInfraError):
     detail: str
     page_url: URL | None = None
@@ -87,7 +87,7 @@ class JsonValidationError(BaseInfraError):
         return message
 
 
-@dataclass(frozen=True, slots=True, kw_only=True)
+@dataclass(eq=False, slots=True, kw_only=True)
 class MissingJsonFieldError(BaseInfraError):
     field_path: str
     page_url: URL | None = None
@@ -100,7 +100,7 @@ class MissingJsonFieldError(BaseInfraError):
         return message
 
 
-@dataclass(frozen=True, slots=True, kw_only=True)
+@dataclass(eq=False, slots=True, kw_only=True)
 class InvalidJsonFieldError(BaseInfraError):
     field_path: str
     expected: str | None = None
@@ -116,7 +116,7 @@ class InvalidJsonFieldError(BaseInfraError):
         return message
 
 
-@dataclass(frozen=True, slots=True, kw_only=True)
+@dataclass(eq=False, slots=True, kw_only=True)
 class PaginationParsingError(MainPageParsingError):
     @property
     def message(self) -> str:
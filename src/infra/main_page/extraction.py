@@ -0,0 +1,169 @@
+"""Declarative extraction plans for site parsers.
+
+A plan is a tree of rules built once at import time. Evaluating it against a
+document resolves every selector once per scope element, so fields sharing a
+container reuse it instead of searching the page again. On the lxml backend
+each distinct selector is compiled to XPath once per process.
+
+A ``Select`` with a ``detail`` is required: a missing element raises
+``MainPageParsingError`` with that detail, as do required texts and
+attributes. Rules of a record are evaluated in order, so the first failing
+field decides the error.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any, override
+
+from yarl import URL
+
+from infra.main_page.document import Node
+from infra.main_page.exceptions import MainPageParsingError
+
+
+@dataclass(frozen=True, slots=True)
+class Select:
+    """First element below the current one, or after it with ``following``.
+
+    ``following`` searches like ``find_next`` and only filters by name.
+    """
+
+    name: str | None = None
+    class_: str | tuple[str, ...] | None = None
+    id: str | None = None
+    following: bool = False
+    detail: str | None = None
+
+    def find(self, node: Node) -> Node | None:
+        if self.following:
+            assert self.name is not None
+            return node.find_next(self.name)
+        return node.find(self.name, class_=self.class_, id=self.id)
+
+    def find_all(self, node: Node) -> list[Node]:
+        return node.find_all(self.name, class_=self.class_, id=self.id)
+
+
+type Path = Select | tuple[Select, ...]
+
+
+def resolve(path: Path | None, node: Node, page_url: URL | None) -> Node | None:
+    if path is None:
+        return node
+    for select in (path,) if isinstance(path, Select) else path:
+        found = select.find(node)
+        if found is None:
+            if select.detail is not None:
+                raise MainPageParsingError(detail=select.detail, page_url=page_url)
+            return None
+        node = found
+    return node
+
+
+class Rule(ABC):
+    @abstractmethod
+    def evaluate(self, node: Node, page_url: URL | None = None) -> Any: ...
+
+
+@dataclass(frozen=True, slots=True)
+class Text(Rule):
+    """Text of the element at ``path``, of the current one without a path.
+
+    ``strip`` strips every string of the element and drops the empty ones, as
+    BeautifulSoup's ``get_text(strip=True)``. With a ``detail`` the text is
+    required to be non-empty.
+    """
+
+    path: Path | None = None
+    detail: str | None = None
+    strip: bool = True
+    separator: str = ""
+
+    @override
+    def evaluate(self, node: Node, page_url: URL | None = None) -> str | None:
+        target = resolve(self.path, node, page_url)
+        if target is None:
+            return None
+        text = target.get_text(self.separator, strip=self.strip)
+        if not text and self.detail is not None:
+            raise MainPageParsingError(detail=self.detail, page_url=page_url)
+        return text
+
+
+@dataclass(frozen=True, slots=True)
+class Attr(Rule):
+    attr: str
+    path: Path | None = None
+    detail: str | None = None
+
+    @override
+    def evaluate(self, node: Node, page_url: URL | None = None) -> str | None:
+        target = resolve(self.path, node, page_url)
+        if target is None:
+            return None
+        value = target.get(self.attr)
+        if not value and self.detail is not None:
+            raise MainPageParsingError(detail=self.detail, page_url=page_url)
+        return value
+
+
+@dataclass(frozen=True, slots=True)
+class Exists(Rule):
+    """Whether the element at ``path`` is on the page (missing when not ``present``)."""
+
+    path: Path
+    present: bool = True
+
+    @override
+    def evaluate(self, node: Node, page_url: URL | None = None) -> bool:
+        return (resolve(self.path, node, page_url) is not None) == self.present
+
+
+@dataclass(frozen=True, slots=True)
+class Element(Rule):
+    """The element itself, for the rare follow-up a rule cannot express."""
+
+    path: Path | None = None
+
+    @override
+    def evaluate(self, node: Node, page_url: URL | None = None) -> Node | None:
+        return resolve(self.path, node, page_url)
+
+
+@dataclass(frozen=True, slots=True)
+class Record(Rule):
+    """Named fields evaluated against the element at ``path``."""
+
+    fields: Mapping[str, Rule]
+    path: Path | None = None
+
+    @override
+    def evaluate(
+        self, node: Node, page_url: URL | None = None
+    ) -> dict[str, Any] | None:
+        target = resolve(self.path, node, page_url)
+        if target is None:
+            return None
+        return {
+            name: rule.evaluate(target, page_url) for name, rule in self.fields.items()
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class Each(Rule):
+    """``item`` of every element matching ``select`` that passes ``where``."""
+
+    select: Select
+    item: Rule
+    where: Sequence[Exists] = ()
+
+    @override
+    def evaluate(self, node: Node, page_url: URL | None = None) -> list[Any]:
+        return [
+            self.item.evaluate(i, page_url)
+            for i in self.select.find_all(node)
+            if all(rule.evaluate(i, page_url) for rule in self.where)
+        ]
@@ -1,24 +1,22 @@
 import re
 from collections.abc import Sequence
 from dataclasses import dataclass
-from typing import override
+from typing import ClassVar, override
 
-from bs4 import BeautifulSoup
 from loguru import logger
 from yarl import URL
 
 from domain import Chapter, LoadedChapter, MainPageInfo
-from domain.images import Image
+from infra.main_page.document import Node, Region, Regions, get_document
 from infra.main_page.exceptions import (
     CaptchaDetectedError,
     ChapterAccessRestrictedError,
     EmptyChapterContentError,
     MainPageParsingError,
 )
-from infra.main_page.parsing import find_required_tag, require_attr, require_text
+from infra.main_page.extraction import Attr, Each, Exists, Record, Select, Text
 from logic import ChapterLoader, MainPageLoader
 from logic.exceptions.base import RetryableError
-from utils.bs4 import get_soup
 
 
 @dataclass(slots=True)
@@ -27,54 +25,59 @@ class IfreedomChapterContent:
     paragraphs: Sequence[str]
 
 
+CAPTCHA_PLAN = Exists(Select("form", class_=("wpcf7-form", "init")))
+
+CHAPTER_PLAN = Record(
+    {
+        "title": Text(
+            (
+                Select(
+                    "div", class_="block", detail="chapter title container not found"
+                ),
+                Select("h1", detail="chapter title not found"),
+            ),
+            detail="chapter title is empty",
+        ),
+        "content": Record(
+            path=Select(
+                "div",
+                class_="chapter-content",
+                detail="chapter content container not found",
+            ),
+            fields={
+                "notice": Exists(Select("div", class_="single-notice")),
+                "paragraphs": Each(Select("p"), Text(strip=False)),
+            },
+        ),
+    }
+)
+
+
 @dataclass(slots=True)
 class IfreedomChapterParser:
-    soup: BeautifulSoup
+    document: Node
     page_url: URL
 
-    def parse(self) -> IfreedomChapterContent:
-        self._ensure_no_captcha()
-        title = self._parse_title()
-        paragraphs = self._parse_paragraphs()
-        return IfreedomChapterContent(title=title, paragraphs=paragraphs)
+    regions: ClassVar[Regions] = (
+        Region("form", class_="wpcf7-form"),
+        Region("form", class_="init"),
+        Region("div", class_="block"),
+        Region("div", class_="chapter-content"),
+    )
 
-    def _ensure_no_captcha(self) -> None:
-        if self.soup.find("form", class_=["wpcf7-form", "init"]):
+    def parse(self) -> IfreedomChapterContent:
+        # a captcha page has none of the chapter fields, so it is told apart first
+        if CAPTCHA_PLAN.evaluate(self.document, self.page_url):
             logger.error("got captcha")
             raise RetryableError(
                 exception=CaptchaDetectedError(
                     site_name="ifreedom", page_url=self.page_url, detail="captcha"
                 )
             )
-
-    def _parse_title(self) -> str:
-        block_container = find_required_tag(
-            self.soup,
-            "div",
-            class_="block",
-            detail="chapter title container not found",
-            page_url=self.page_url,
-        )
-        title_tag = find_required_tag(
-            block_container,
-            "h1",
-            detail="chapter title not found",
-            page_url=self.page_url,
-        )
-        return require_text(
-            title_tag, detail="chapter title is empty", page_url=self.page_url
-        )
-
-    def _parse_paragraphs(self) -> Sequence[str]:
-        container = find_required_tag(
-            self.soup,
-            "div",
-            class_="chapter-content",
-            detail="chapter content container not found",
-            page_url=self.page_url,
-        )
-
-        if container.find("div", class_="single-notice"):  # pyright: ignore
+        data = CHAPTER_PLAN.evaluate(self.document, self.page_url)
+        assert data is not None
+        content = data["content"]
+        if content["notice"]:
             logger.error("got stoper")
             raise RetryableError(
                 exception=ChapterAccessRestrictedError(
@@ -84,13 +87,13 @@ class IfreedomChapterParser:
                 )
             )
 
-        paragraphs = [p.text for p in container.find_all("p") if p.text.strip()]
+        paragraphs = [i for i in content["paragraphs"] if i.strip()]
         if not paragraphs:
             raise EmptyChapterContentError(
                 detail="ifreedom returned no paragraphs",
                 page_url=self.page_url,
             )
-        return paragraphs
+        return IfreedomChapterContent(title=data["title"], paragraphs=paragraphs)
 
 
 @dataclass(slots=True)
@@ -108,99 +111,90 @@ class IfreedomMainPageData:
     skipped_vip: int
 
 
+MAIN_PAGE_PLAN = Record(
+    {
+        "title": Text(
+            (
+                Select(
+                    "div", class_="book-info", detail="book info container not found"
+                ),
+                Select("h1", detail="book title not found"),
+            ),
+            detail="book title is empty",
+        ),
+        "cover_src": Attr(
+            "src",
+            (
+                Select(
+                    "div",
+                    class_=("book-img", "block-book-slide-img"),
+                    detail="cover container not found",
+                ),
+                Select("img", detail="cover image not found"),
+            ),
+            detail="cover image src missing",
+        ),
+        "lines": Record(
+            path=Select(
+                "div",
+                class_="tab-content",
+                detail="tab-content with chapters not found",
+            ),
+            fields={
+                "chapters": Each(
+                    Select("div", class_="chapterinfo"),
+                    Record(
+                        path=Select("a", detail="chapter line without anchor"),
+                        fields={
+                            "href": Attr("href", detail="chapter anchor missing href"),
+                            "name": Text(strip=False),
+                        },
+                    ),
+                )
+            },
+        ),
+    }
+)
+
+
 @dataclass(slots=True)
 class IfreedomMainPageParser:
-    soup: BeautifulSoup
+    document: Node
     page_url: URL
 
     def parse(self) -> IfreedomMainPageData:
-        title = self._parse_title()
-        cover_url = self._parse_cover_url()
-        chapters, skipped_pay, skipped_vip = self._parse_chapters()
+        data = MAIN_PAGE_PLAN.evaluate(self.document, self.page_url)
+        assert data is not None
+        chapters, skipped_pay, skipped_vip = self._filter_chapters(
+            data["lines"]["chapters"]
+        )
         return IfreedomMainPageData(
-            title=title,
-            cover_url=cover_url,
+            title=data["title"],
+            cover_url=URL(data["cover_src"]),
             chapters=chapters,
             skipped_pay=skipped_pay,
             skipped_vip=skipped_vip,
         )
 
-    def _parse_title(self) -> str:
-        book_info = find_required_tag(
-            self.soup,
-            "div",
-            class_="book-info",
-            detail="book info container not found",
-            page_url=self.page_url,
-        )
-        title_tag = find_required_tag(
-            book_info,
-            "h1",
-            detail="book title not found",
-            page_url=self.page_url,
-        )
-        return require_text(
-            title_tag, detail="book title is empty", page_url=self.page_url
-        )
-
-    def _parse_cover_url(self) -> URL:
-        image_container = find_required_tag(
-            self.soup,
-            "div",
-            class_=["book-img", "block-book-slide-img"],
-            detail="cover container not found",
-            page_url=self.page_url,
-        )
-        image_tag = find_required_tag(
-            image_container,
-            "img",
-            detail="cover image not found",
-            page_url=self.page_url,
-        )
-        image_src = require_attr(
-            image_tag,
-            "src",
-            detail="cover image src missing",
-            page_url=self.page_url,
-        )
-        return URL(image_src)
-
-    def _parse_chapters(self) -> tuple[Sequence[IfreedomChapterInfo], int, int]:
+    def _filter_chapters(
+        self, lines: Sequence[dict[str, str]]
+    ) -> tuple[Sequence[IfreedomChapterInfo], int, int]:
         chapters: list[IfreedomChapterInfo] = []
         skipped_vip = 0
         skipped_pay = 0
-        tab_content = find_required_tag(
-            self.soup,
-            "div",
-            class_="tab-content",
-            detail="tab-content with chapters not found",
-            page_url=self.page_url,
-        )
-        chapters_line = tab_content.find_all("div", class_="chapterinfo")
-        if not chapters_line:
+        if not lines:
             raise MainPageParsingError(
                 detail="chapter list is empty", page_url=self.page_url
             )
-        for line in reversed(chapters_line):
-            tag_a = find_required_tag(
-                line,
-                "a",
-                detail="chapter line without anchor",
-                page_url=self.page_url,
-            )
-            href = require_attr(
-                tag_a,
-                "href",
-                detail="chapter anchor missing href",
-                page_url=self.page_url,
-            )
+        for line in reversed(lines):
+            href = line["href"]
             if href == "https://ifreedom.su/podpiska/":
                 skipped_vip += 1
                 continue
             if re.match("https://ifreedom.su/koshelek.*", href):
                 skipped_pay += 1
                 continue
-            name = tag_a.text.strip()
+            name = line["name"].strip()
             if not name:
                 raise MainPageParsingError(
                     detail="chapter anchor without name", page_url=self.page_url
@@ -213,8 +207,10 @@ class IfreedomMainPageParser:
 class IfreedomChapterLoader(ChapterLoader):
     @override
     async def load_chapter(self, chapter: Chapter) -> LoadedChapter:
-        soup = await get_soup(self.session, chapter.url)
-        parsed = IfreedomChapterParser(soup, chapter.url).parse()
+        document = await get_document(
+            self.session, chapter.url, IfreedomChapterParser.regions
+        )
+        parsed = IfreedomChapterParser(document, chapter.url).parse()
         return LoadedChapter(
             id=chapter.id,
             name=chapter.name,
@@ -232,15 +228,15 @@ class IfreefomLoader(MainPageLoader):
 
     @override
     async def load(self) -> MainPageInfo:
-        soup = await get_soup(self.session, self.url)
-        parsed = IfreedomMainPageParser(soup, self.url).parse()
+        await self.throttle(self.url)
+        document = await get_document(self.session, self.url)
+        parsed = IfreedomMainPageParser(document, self.url).parse()
 
         cover_url = parsed.cover_url
         if not cover_url.absolute:
             cover_url = self.url.with_path(str(cover_url))
 
-        cover = Image(cover_url)
-        loaded_cover = await self.image_loader.load_image(cover)
+        covers = await self.load_covers([cover_url])
 
         if parsed.skipped_pay:
             logger.warning(f"{parsed.skipped_pay} skipped because of paywall.")
@@ -254,5 +250,5 @@ class IfreefomLoader(MainPageLoader):
                 for index, info in enumerate(parsed.chapters, 1)
             ],
             title=parsed.title,
-            covers=[loaded_cover] if loaded_cover else [],
+            covers=covers,
         )
@@ -1,27 +1,20 @@
+import asyncio
 import re
 from collections.abc import Sequence
 from dataclasses import dataclass
-from typing import override
+from typing import ClassVar, override
 
-from bs4 import BeautifulSoup
-from bs4.element import Tag
 from loguru import logger
 from yarl import URL
 
 from domain import Chapter, LoadedChapter, MainPageInfo
-from domain.images import Image
+from infra.main_page.document import Node, Region, Regions, get_document
 from infra.main_page.exceptions import (
     EmptyChapterContentError,
     PaginationParsingError,
 )
-from infra.main_page.parsing import (
-    find_required_tag,
-    require_attr,
-    require_tag,
-    require_text,
-)
+from infra.main_page.extraction import Attr, Each, Element, Record, Select, Text
 from logic import ChapterLoader, MainPageLoader
-from utils.bs4 import get_soup
 
 
 @dataclass(slots=True)
@@ -30,31 +23,33 @@ class RanobesChapterContent:
     paragraphs: Sequence[str]
 
 
+CHAPTER_PLAN = Record(
+    path=Select("div", id="dle-content", detail="chapter content container missing"),
+    fields={
+        "title": Text(
+            Select("h1", detail="chapter title not found"),
+            detail="chapter title is empty",
+        ),
+        "paragraphs": Each(Select("p"), Text(strip=False)),
+        # older chapters are plain text with line breaks instead of paragraphs
+        "article": Element(Select("div", id="arrticle", class_="text")),
+    },
+)
+
+
 @dataclass(slots=True)
 class RanobesChapterParser:
-    soup: BeautifulSoup
+    document: Node
     page_url: URL
 
+    regions: ClassVar[Regions] = (Region("div", id="dle-content"),)
+
     def parse(self) -> RanobesChapterContent:
-        container = find_required_tag(
-            self.soup,
-            "div",
-            id="dle-content",
-            detail="chapter content container missing",
-            page_url=self.page_url,
-        )
-        title_tag = find_required_tag(
-            container,
-            "h1",
-            detail="chapter title not found",
-            page_url=self.page_url,
-        )
-        title = require_text(
-            title_tag, detail="chapter title is empty", page_url=self.page_url
-        )
-        paragraphs = [i.text for i in container.find_all("p") if i.text]
+        data = CHAPTER_PLAN.evaluate(self.document, self.page_url)
+        assert data is not None
+        paragraphs = [i for i in data["paragraphs"] if i]
         if not paragraphs:
-            article = container.find("div", id="arrticle", class_="text")
+            article = data["article"]
             if not article:
                 raise EmptyChapterContentError(
                     detail="ranobes returned empty chapter",
@@ -63,7 +58,7 @@ class RanobesChapterParser:
             text = article.get_text("\n")
             text = re.sub(r"\n{2,}", "\n", text)
             paragraphs = text.split("\n")
-        return RanobesChapterContent(title=title, paragraphs=paragraphs)
+        return RanobesChapterContent(title=data["title"], paragraphs=paragraphs)
 
 
 @dataclass(slots=True)
@@ -73,104 +68,85 @@ class RanobesMainPageData:
     cover_url: URL
 
 
+MAIN_PAGE_PLAN = Record(
+    {
+        "title": Text(
+            Select("h1", class_="title", detail="title tag missing"),
+            detail="empty title",
+        ),
+        # the first link of the block leads to the book, the next one to chapters
+        "chapter_page_href": Attr(
+            "href",
+            (
+                Select(
+                    "div",
+                    class_="r-fullstory-chapters-foot",
+                    detail="chapter block not found",
+                ),
+                Select("a", detail="chapter page link not found"),
+                Select("a", following=True, detail="chapter page next link missing"),
+            ),
+            detail="chapter page href missing",
+        ),
+        "cover_src": Attr(
+            "src",
+            (
+                Select(
+                    "div", class_="r-fullstory-poster", detail="cover container missing"
+                ),
+                Select("img", detail="cover image missing"),
+            ),
+            detail="cover image src missing",
+        ),
+    }
+)
+
+
 @dataclass(slots=True)
 class RanobesMainPageParser:
-    soup: BeautifulSoup
+    document: Node
     page_url: URL
 
     def parse(self) -> RanobesMainPageData:
-        return RanobesMainPageData(
-            title=self._parse_title(),
-            chapter_page_url=self._parse_chapter_page_url(),
-            cover_url=self._parse_cover_url(),
-        )
-
-    def _parse_title(self) -> str:
-        title_tag = find_required_tag(
-            self.soup,
-            "h1",
-            class_="title",
-            detail="title tag missing",
-            page_url=self.page_url,
-        )
-        return require_text(title_tag, detail="empty title", page_url=self.page_url)
-
-    def _parse_chapter_page_url(self) -> URL:
-        chapter_tag = find_required_tag(
-            self.soup,
-            "div",
-            class_="r-fullstory-chapters-foot",
-            detail="chapter block not found",
-            page_url=self.page_url,
-        )
-        first_link = find_required_tag(
-            chapter_tag,
-            "a",
-            detail="chapter page link not found",
-            page_url=self.page_url,
-        )
-        next_link = require_tag(
-            first_link.find_next("a"),
-            detail="chapter page next link missing",
-            page_url=self.page_url,
-        )
-        href = require_attr(
-            next_link,
-            "href",
-            detail="chapter page href missing",
-            page_url=self.page_url,
-        )
-        chapter_page_url = URL(href)
+        data = MAIN_PAGE_PLAN.evaluate(self.document, self.page_url)
+        assert data is not None
+        chapter_page_url = URL(data["chapter_page_href"])
         if not chapter_page_url.is_absolute():
             chapter_page_url = self.page_url.with_path(str(chapter_page_url))
-        return chapter_page_url
-
-    def _parse_cover_url(self) -> URL:
-        image_container = find_required_tag(
-            self.soup,
-            "div",
-            class_="r-fullstory-poster",
-            detail="cover container missing",
-            page_url=self.page_url,
-        )
-        image_tag = find_required_tag(
-            image_container,
-            "img",
-            detail="cover image missing",
-            page_url=self.page_url,
+        return RanobesMainPageData(
+            title=data["title"],
+            chapter_page_url=chapter_page_url,
+            cover_url=URL(data["cover_src"]),
         )
-        image_src = require_attr(
-            image_tag,
-            "src",
-            detail="cover image src missing",
-            page_url=self.page_url,
+
+
+PAGINATION_PLAN = Record(
+    path=Select("div", class_="pages", detail="pages container missing"),
+    fields={
+        "links": Each(
+            Select("a"),
+            Record(
+                {
+                    "number": Text(strip=False),
+                    "href": Attr("href", detail="pagination link without href"),
+                }
+            ),
         )
-        return URL(image_src)
+    },
+)
 
 
 @dataclass(slots=True)
 class RanobesPaginationParser:
-    soup: BeautifulSoup
+    document: Node
     page_url: URL
 
     def parse(self) -> list[URL]:
-        pages = find_required_tag(
-            self.soup,
-            "div",
-            class_="pages",
-            detail="pages container missing",
-            page_url=self.page_url,
-        )
-        pages_with_num: dict[int, str] = {}
-        for i in pages.find_all("a"):
-            num = self._parse_page_number(i)
-            href = require_attr(
-                i,
-                "href",
-                detail="pagination link without href",
-                page_url=self.page_url,
-            )
-            pages_with_num[num] = str(href)
+        data = PAGINATION_PLAN.evaluate(self.document, self.page_url)
+        assert data is not None
+        pages_with_num: dict[int, str] = {
+            self._parse_page_number(i["number"]): i["href"] for i in data["links"]
+        }
 
         if not pages_with_num:
             raise PaginationParsingError(
@@ -186,9 +162,9 @@ class RanobesPaginationParser:
             urls.append(URL(link))
         return urls
 
-    def _parse_page_number(self, anchor: Tag) -> int:
+    def _parse_page_number(self, number: str) -> int:
         try:
-            return int(anchor.get_text())
+            return int(number)
         except ValueError as exc:  # pragma: no cover - defensive
             raise PaginationParsingError(
                 detail="cannot convert pagination number to int",
@@ -202,42 +178,37 @@ class RanobesChapterEntry:
     url: URL
 
 
+CHAPTER_LIST_PLAN = Record(
+    path=Select("div", id="dle-content", detail="chapter list container missing"),
+    fields={
+        "entries": Each(
+            Select("div", class_="cat_line"),
+            Record(
+                path=Select("a", detail="chapter line missing anchor"),
+                fields={
+                    "href": Attr("href", detail="chapter link missing href"),
+                    "title": Attr("title", detail="chapter link missing title"),
+                },
+            ),
+        )
+    },
+)
+
+
 @dataclass(slots=True)
 class RanobesChapterListParser:
-    soup: BeautifulSoup
+    document: Node
     page_url: URL
 
+    regions: ClassVar[Regions] = (Region("div", id="dle-content"),)
+
     def parse(self) -> Sequence[RanobesChapterEntry]:
-        container = find_required_tag(
-            self.soup,
-            "div",
-            id="dle-content",
-            detail="chapter list container missing",
-            page_url=self.page_url,
-        )
-        lines = container.find_all("div", class_="cat_line")
-        entries: list[RanobesChapterEntry] = []
-        for line in lines:
-            link = find_required_tag(
-                line,
-                "a",
-                detail="chapter line missing anchor",
-                page_url=self.page_url,
-            )
-            href = require_attr(
-                link,
-                "href",
-                detail="chapter link missing href",
-                page_url=self.page_url,
-            )
-            name = require_attr(
-                link,
-                "title",
-                detail="chapter link missing title",
-                page_url=self.page_url,
-            )
-            entries.append(RanobesChapterEntry(title=name, url=URL(str(href))))
-        return entries
+        data = CHAPTER_LIST_PLAN.evaluate(self.document, self.page_url)
+        assert data is not None
+        return [
+            RanobesChapterEntry(title=i["title"], url=URL(str(i["href"])))
+            for i in data["entries"]
+        ]
 
 
 @dataclass(eq=False)
@@ -245,8 +216,10 @@ class RanobesChapterLoader(ChapterLoader):
     @override
     async def load_chapter(self, chapter: Chapter) -> LoadedChapter:
         logger.debug(f"loading chapter {chapter.url}")
-        soup = await get_soup(self.session, chapter.url)
-        parsed = RanobesChapterParser(soup, chapter.url).parse()
+        document = await get_document(
+            self.session, chapter.url, RanobesChapterParser.regions
+        )
+        parsed = RanobesChapterParser(document, chapter.url).parse()
         return LoadedChapter(
             id=chapter.id,
             name=chapter.name,
@@ -264,35 +237,44 @@ class RanobesLoader(MainPageLoader):
 
     @override
     async def load(self) -> MainPageInfo:
-        main_page_soup = await get_soup(self.session, self.url)
-        parsed_main = RanobesMainPageParser(main_page_soup, self.url).parse()
+        await self.throttle(self.url)
+        main_page_document = await get_document(self.session, self.url)
+        parsed_main = RanobesMainPageParser(main_page_document, self.url).parse()
 
         image_path = parsed_main.cover_url
         if not image_path.is_absolute():
             image_path = self.url.with_path(str(image_path))
 
-        image = Image(url=image_path)
-        loaded_image = await self.image_loader.load_image(image)
-
-        chapter_page = await get_soup(self.session, parsed_main.chapter_page_url)
-
-        pages = RanobesPaginationParser(chapter_page, self.url).parse()
+        async with asyncio.TaskGroup() as tg:
+            covers = tg.create_task(self.load_covers([image_path]))
+            chapters = tg.create_task(
+                self._collect_chapters(parsed_main.chapter_page_url)
+            )
         return MainPageInfo(
-            chapters=await self._collect_chapters(pages),
+            chapters=chapters.result(),
             title=parsed_main.title,
-            covers=[loaded_image] if loaded_image else [],
+            covers=covers.result(),
         )
 
-    async def _collect_chapters(self, pages: list[URL]) -> Sequence[Chapter]:
-        logger.debug("collect chapters")
-        chapters: list[Chapter] = []
-
-        id_counter = 1
-        for page in reversed(pages):
-            soup = await get_soup(self.session, page)
-            entries = RanobesChapterListParser(soup, page).parse()
-            for entry in reversed(entries):
-                chapters.append(Chapter(id=id_counter, name=entry.title, url=entry.url))
-                id_counter += 1
+    async def _collect_chapters(self, chapter_page_url: URL) -> Sequence[Chapter]:
+        await self.throttle(chapter_page_url)
+        chapter_page = await get_document(self.session, chapter_page_url)
+        pages = RanobesPaginationParser(chapter_page, self.url).parse()
 
-        return chapters
+        logger.debug("collect chapters")
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(self._load_chapter_list(i)) for i in pages]
+
+        # pages and their entries list the newest chapters first
+        entries = [j for i in reversed(tasks) for j in reversed(i.result())]
+        return [
+            Chapter(id=index, name=entry.title, url=entry.url)
+            for index, entry in enumerate(entries, 1)
+        ]
+
+    async def _load_chapter_list(self, page: URL) -> Sequence[RanobesChapterEntry]:
+        await self.throttle(page)
+        document = await get_document(
+            self.session, page, RanobesChapterListParser.regions
+        )
+        return RanobesChapterListParser(document, page).parse()
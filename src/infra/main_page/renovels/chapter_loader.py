@@ -1,37 +1,25 @@
-import json
 from dataclasses import dataclass
-from json import JSONDecodeError
 from typing import override
 
-from bs4 import BeautifulSoup
 from loguru import logger
 
 from domain import Chapter, LoadedChapter
-from infra.main_page.exceptions import (
-    JsonParsingError,
-)
-from infra.main_page.renovels.models import (
-    RenovelsChapterResponse,
-)
+from infra.main_page.document import parse_html
+from infra.main_page.renovels.models import RenovelsChapter
 from logic import ChapterLoader
-from utils.bs4 import get_text_response
+from utils.bs4 import get_bytes_response
 
-from .models import validate_payload
+from .models import validate_json
 
 
 @dataclass(eq=False)
 class RenovelsChapterLoader(ChapterLoader):
     @override
     async def load_chapter(self, chapter: Chapter) -> LoadedChapter:
-        raw_response = await get_text_response(self.session, chapter.url)
-        try:
-            res = json.loads(raw_response)
-        except JSONDecodeError as exc:
-            raise JsonParsingError(page_url=chapter.url) from exc
+        raw_response = await get_bytes_response(self.session, chapter.url)
         logger.debug(f"get {chapter.base_name}")
-        response = validate_payload(RenovelsChapterResponse, res, chapter.url)
-        html = BeautifulSoup(response.content, "lxml").find_all("p")
-        paragraphs = [i.text for i in html]
+        response = validate_json(RenovelsChapter, raw_response, chapter.url)
+        paragraphs = [i.text for i in parse_html(response.content).find_all("p")]
 
         return LoadedChapter(
             id=chapter.id,
@@ -1,26 +1,28 @@
 import asyncio
-import json
 import re
 from collections.abc import Sequence
-from json import JSONDecodeError
 from typing import override
 
+from loguru import logger
 from yarl import URL
 
-from domain import Chapter, Image, MainPageInfo
-from infra.main_page.exceptions import (
-    JsonParsingError,
-    MainPageParsingError,
-)
+from domain import Chapter, MainPageInfo
+from infra.main_page.document import get_document
+from infra.main_page.exceptions import MainPageParsingError
 from infra.main_page.renovels.chapter_loader import RenovelsChapterLoader
 from infra.main_page.renovels.models import (
+    RenovelsChapterShort,
     RenovelsChaptersPageResponse,
     RenovelsScriptData,
 )
 from logic import ChapterLoader, MainPageLoader
-from utils.bs4 import get_soup, get_text_response
+from utils.bs4 import get_bytes_response
+
+from .models import validate_json
 
-from .models import validate_payload
+CHAPTERS_API = URL("https://api.renovels.org/api/v2/titles/chapters/")
+# the most chapters the API returns per page, larger counts are cut to it
+CHAPTERS_PAGE_SIZE = 100
 
 
 class RenovelsLoader(MainPageLoader):
@@ -30,8 +32,9 @@ class RenovelsLoader(MainPageLoader):
 
     @override
     async def load(self) -> MainPageInfo:
-        main_page_soup = await get_soup(self.session, self.url)
-        scripts = main_page_soup.find_all("script")
+        await self.throttle(self.url)
+        main_page_document = await get_document(self.session, self.url)
+        scripts = main_page_document.find_all("script")
         script = None
         for s in scripts:
             if "__RQ_R" in s.text:
@@ -39,61 +42,51 @@ class RenovelsLoader(MainPageLoader):
                 break
         if script is None:
             raise MainPageParsingError(detail="script not found", page_url=self.url)
-        try:
-            script_text = script.get_text()
-            data = re.search(r"\.push\((\{.*?\})\)", script_text, re.S)
-            if data is None:
-                raise MainPageParsingError(
-                    detail="can't grep dict in script", page_url=self.url
-                )
-            data_str = data.group(1)
-            data = json.loads(data_str)
-        except JSONDecodeError as exc:
-            raise JsonParsingError(page_url=self.url) from exc
+        script_text = script.get_text()
+        data = re.search(r"\.push\((\{.*?\})\)", script_text, re.S)
+        if data is None:
+            raise MainPageParsingError(
+                detail="can't grep dict in script", page_url=self.url
+            )
 
-        content = validate_payload(RenovelsScriptData, data, self.url)
+        content = validate_json(RenovelsScriptData, data.group(1), self.url)
         content_data = content.queries[0].state.data.json_
         branch_info = content_data.branches[0]
 
-        image = Image(self.domain.with_path(content_data.cover.high))
-        cover = await self.image_loader.load_image(image)
-
-        covers = [cover] if cover is not None else []
+        cover_url = self.domain.with_path(content_data.cover.high)
+        async with asyncio.TaskGroup() as tg:
+            covers = tg.create_task(self.load_covers([cover_url]))
+            chapters = tg.create_task(self.collect_chapters(branch_info.id))
 
         return MainPageInfo(
-            chapters=await self.collect_chapters(
-                branch_info.id, content_data.count_chapters
-            ),
+            chapters=chapters.result(),
             title=content_data.main_name,
-            covers=covers,
+            covers=covers.result(),
         )
 
-    async def collect_chapters(
-        self, branch: int, count_chapters: int
-    ) -> Sequence[Chapter]:
-        count = 20
-        base_url = URL("https://api.renovels.org/api/v2/titles/chapters/").with_query(
-            branch_id=branch, ordering="index"
+    async def collect_chapters(self, branch: int) -> Sequence[Chapter]:
+        """Follow the ``next`` cursor of the chapter list, a page at a time.
+
+        Each page is validated as soon as it arrives, the next one is only known
+        from it.
+        """
+        base_url = CHAPTERS_API.with_query(
+            branch_id=branch, ordering="index", count=CHAPTERS_PAGE_SIZE
         )
-        tasks: list[asyncio.Task[str]] = []
-        async with asyncio.TaskGroup() as tg:
-            for page in range(count_chapters // count + 1):
-                tasks.append(
-                    tg.create_task(
-                        get_text_response(
-                            self.session,
-                            base_url.update_query(count=count, page=page + 1),
-                        )
-                    )
-                )
-        ids: list[int] = []
-        for idx, task in enumerate(tasks, start=1):
-            page_url = base_url.update_query(count=count, page=idx)
-            try:
-                payload = json.loads(task.result())
-            except JSONDecodeError as exc:
-                raise JsonParsingError(page_url=page_url) from exc
-            response = validate_payload(RenovelsChaptersPageResponse, payload, page_url)
-            ids.extend(chapter.id for chapter in response.results)
-        api = URL("https://api.renovels.org/api/v2/titles/chapters/")
-        return [Chapter(i, str(i), api / str(j)) for i, j in enumerate(ids, 1)]
+        entries: list[RenovelsChapterShort] = []
+        page: int | None = 1
+        while page is not None:
+            page_url = base_url.update_query(page=page)
+            await self.throttle(page_url)
+            raw_response = await get_bytes_response(self.session, page_url)
+            response = validate_json(
+                RenovelsChaptersPageResponse, raw_response, page_url
+            )
+            entries.extend(response.results)
+            # an empty page ends the list even if the cursor claims more
+            page = response.next if response.results else None
+        logger.debug(f"collected {len(entries)} chapters of branch {branch}")
+        return [
+            Chapter(i, str(i), CHAPTERS_API / str(j.id), volume=j.tome)
+            for i, j in enumerate(entries, 1)
+        ]
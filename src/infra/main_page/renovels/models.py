@@ -1,10 +1,16 @@
-from datetime import datetime
+import json
+from json import JSONDecodeError
 from typing import Any, TypeVar
 
 from pydantic import BaseModel, ConfigDict, Field, ValidationError
 from yarl import URL
 
-from infra.main_page.exceptions import JsonValidationError
+from infra.main_page.exceptions import JsonParsingError, JsonValidationError
+
+try:
+    import orjson
+except ImportError:  # optional, the json module decodes the same payloads
+    orjson = None
 
 TModel = TypeVar("TModel", bound=BaseModel)
 
@@ -16,6 +22,21 @@ def validate_payload(model_type: type[TModel], payload: Any, page_url: URL) -> T
         raise JsonValidationError(detail=str(exc), page_url=page_url) from exc
 
 
+def validate_json[Model: BaseModel](
+    model_type: type[Model], data: str | bytes, page_url: URL
+) -> Model:
+    """Decode a JSON body, with orjson when it is installed, and validate it.
+
+    Not ``model_validate_json``: its parser builds long non-ASCII strings, such
+    as the Cyrillic chapter texts, slower than the json module decodes them.
+    """
+    try:
+        payload = orjson.loads(data) if orjson is not None else json.loads(data)
+    except JSONDecodeError as exc:
+        raise JsonParsingError(page_url=page_url) from exc
+    return validate_payload(model_type, payload, page_url)
+
+
 # =========================
 # BASE
 # =========================
@@ -72,28 +93,11 @@ class RenovelsScriptData(RenovelsBaseModel):
 # =========================
 
 
-class RenovelsPublisherCover(RenovelsBaseModel):
-    mid: str = Field(min_length=1)
-    high: str = Field(min_length=1)
-
-
-class RenovelsPublisherShort(RenovelsBaseModel):
-    id: int
-    name: str = Field(min_length=1)
-    dir: str = Field(min_length=1)
-    cover: RenovelsPublisherCover
-
-
 class RenovelsChapterShort(RenovelsBaseModel):
+    """Entry of the chapter list, only the id and volume of the chapter are read."""
+
     id: int
-    index: int
-    tome: int
-    chapter: str = Field(min_length=1)
-    name: str  # can be empty string, so no min_length
-    score: int
-    is_published: bool
-    is_paid: bool
-    publishers: list[RenovelsPublisherShort]
+    tome: int | None = None
 
 
 class RenovelsChaptersPageResponse(RenovelsBaseModel):
@@ -102,63 +106,13 @@ class RenovelsChaptersPageResponse(RenovelsBaseModel):
     results: list[RenovelsChapterShort]
 
 
-class CoverImage(RenovelsBaseModel):
-    model_config = ConfigDict(extra="ignore")
-
-    mid: str
-    high: str
-
-
-class Publisher(RenovelsBaseModel):
-    model_config = ConfigDict(extra="ignore")
-
-    id: int
-    name: str
-    dir: str
-    show_donate: bool
-    donate_page_text: str | None = None
-    cover: CoverImage
-    tagline: str | None = None
-    img: CoverImage
-
-
-class Server(RenovelsBaseModel):
-    id: int
-    name: str
-    link: str
-    fallback_link: str
-
-
-class ChapterNavigation(RenovelsBaseModel):
-    id: int
-    tome: int
-    chapter: str
-    index: int
-    is_paid: bool
+class RenovelsChapter(RenovelsBaseModel):
+    """Fields of a chapter the loader reads.
 
+    The API also sends publishers, servers, navigation and dates; leaving them
+    out of the model skips their validation, which cost most of the time.
+    """
 
-class RenovelsChapterResponse(RenovelsBaseModel):
     id: int
-    tome: int
-    chapter: str
     name: str
-    score: int
-    upload_date: datetime
     content: str
-    is_paid: bool
-    purchase_type: int
-    title_id: int
-    volume_id: int | None = None
-    branch_id: int
-    price: int | None = None
-    pub_date: datetime | None = None
-    index: int
-    delay_pub_date: datetime | None = None
-    is_published: bool
-    server: Server | None = None
-    publishers: list[Publisher]
-    rated: bool
-    is_bought: bool
-    previous: ChapterNavigation | None = None
-    next: ChapterNavigation | None = None
-    content_type: str
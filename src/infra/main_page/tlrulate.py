@@ -1,24 +1,24 @@
 import asyncio
-import operator
-from collections.abc import Iterable, Sequence
+from collections.abc import Sequence
 from dataclasses import dataclass
-from typing import override
+from typing import ClassVar, override
 
-from bs4 import BeautifulSoup
-from bs4.element import Tag
 from loguru import logger
 from yarl import URL
 
-from domain import Chapter, Image, LoadedChapter, LoadedImage, MainPageInfo
+from domain import AnyLoadedImage, Chapter, Image, LoadedChapter, MainPageInfo
 from infra.exceptions.base import CatchImageWithoutSrcError
-from infra.main_page.parsing import (
-    find_required_tag,
-    require_attr,
-    require_tag,
-    require_text,
+from infra.main_page.document import Node, Region, Regions, get_document
+from infra.main_page.extraction import (
+    Attr,
+    Each,
+    Element,
+    Exists,
+    Record,
+    Select,
+    Text,
 )
 from logic import ChapterLoader, ImageLoader, MainPageLoader
-from utils.bs4 import get_soup
 
 
 @dataclass(eq=False)
@@ -27,9 +27,11 @@ class TlRulateChapterLoader(ChapterLoader):
 
     @override
     async def load_chapter(self, chapter: Chapter) -> LoadedChapter:
-        soup = await get_soup(self.session, chapter.url)
+        document = await get_document(
+            self.session, chapter.url, TextContainerParser.regions
+        )
 
-        text_container = TextContainerParser(soup).parse()
+        text_container = TextContainerParser(document).parse()
         image_urls = set(text_container.image_urls)
         relative_urls = set([i for i in image_urls if not i.is_absolute()])
         absolute_urls = list(image_urls - relative_urls)
@@ -50,8 +52,10 @@ class TlRulateChapterLoader(ChapterLoader):
             return url
         return domain.with_path(url.path)
 
-    async def load_images_by_urls(self, urls: Sequence[URL]) -> Sequence[LoadedImage]:
-        tasks: list[asyncio.Task[LoadedImage | None]] = []
+    async def load_images_by_urls(
+        self, urls: Sequence[URL]
+    ) -> Sequence[AnyLoadedImage]:
+        tasks: list[asyncio.Task[AnyLoadedImage | None]] = []
         async with asyncio.TaskGroup() as tg:
             for url in urls:
                 image = Image(url)
@@ -60,17 +64,6 @@ class TlRulateChapterLoader(ChapterLoader):
         return list(filter(None, results))
 
 
-@dataclass
-class PreParsedChapter:
-    row: Tag
-
-    @property
-    def can_read(self) -> bool:
-        span = self.row.find("span", class_="disabled")
-        btn = self.row.find("a", class_="btn")
-        return span is None and btn is not None
-
-
 @dataclass
 class TextContainer:
     title: str
@@ -78,58 +71,53 @@ class TextContainer:
     image_urls: Sequence[URL]
 
 
+TEXT_CONTAINER_PLAN = Record(
+    path=Select(
+        "div",
+        id="text-container",
+        class_="text-container",
+        detail="text-container not found",
+    ),
+    fields={
+        "title": Text(
+            Select("h1", detail="title tag missing inside text-container"),
+            detail="chapter title is empty",
+        ),
+        "content": Record(
+            path=Select(
+                "div", class_="content-text", detail="content-text container missing"
+            ),
+            fields={
+                "paragraphs": Each(Select("p"), Text(strip=False)),
+                "images": Each(Select("img"), Element()),
+            },
+        ),
+    },
+)
+
+
 @dataclass
 class TextContainerParser:
-    soup: BeautifulSoup
+    document: Node
+
+    regions: ClassVar[Regions] = (Region("div", id="text-container"),)
 
     def parse(self) -> TextContainer:
+        data = TEXT_CONTAINER_PLAN.evaluate(self.document)
+        assert data is not None
+        content = data["content"]
         return TextContainer(
-            title=self.title,
-            paragraphs=self.paragraphs,
-            image_urls=list(self.images_urls),
-        )
-
-    @property
-    def text_container(self) -> Tag:
-        class_ = id_name = "text-container"
-        return find_required_tag(
-            self.soup,
-            "div",
-            id=id_name,
-            class_=class_,
-            detail="text-container not found",
+            title=data["title"],
+            paragraphs=content["paragraphs"],
+            image_urls=[self._image_url(i) for i in content["images"]],
         )
 
-    @property
-    def title(self) -> str:
-        title = find_required_tag(
-            self.text_container,
-            "h1",
-            detail="title tag missing inside text-container",
-        )
-        return require_text(title, detail="chapter title is empty")
-
-    @property
-    def context_text(self) -> Tag:
-        class_ = "content-text"
-        return find_required_tag(
-            self.text_container,
-            "div",
-            class_=class_,
-            detail="content-text container missing",
-        )
-
-    @property
-    def paragraphs(self) -> Sequence[str]:
-        return list(map(operator.attrgetter("text"), self.context_text.find_all("p")))
-
-    @property
-    def images_urls(self) -> Iterable[URL]:
-        for i in self.context_text.find_all("img"):
-            src = i.get("src")
-            if src is None:
-                raise CatchImageWithoutSrcError(tag_name=i.name)
-            yield URL(str(src))
+    @staticmethod
+    def _image_url(image: Node) -> URL:
+        src = image.get("src")
+        if src is None:
+            raise CatchImageWithoutSrcError(tag_name=image.name)
+        return URL(str(src))
 
 
 class TlRulateLoader(MainPageLoader):
@@ -139,10 +127,15 @@ class TlRulateLoader(MainPageLoader):
 
     @override
     async def load(self) -> MainPageInfo:
-        main_page_soup = await get_soup(self.session, self.url)
-        parsed = TlRulateMainPageParser(main_page_soup, self.url, self.domain).parse()
+        await self.throttle(self.url)
+        main_page_document = await get_document(self.session, self.url)
+        parsed = TlRulateMainPageParser(
+            main_page_document, self.url, self.domain
+        ).parse()
 
-        covers = await self._load_covers(parsed.cover_urls)
+        logger.debug("loading covers")
+        covers = await self.load_covers(parsed.cover_urls)
+        logger.debug(f"load {len(covers)} covers")
         chapters = [
             Chapter(id=index, name=info.name, url=info.url)
             for index, info in enumerate(parsed.chapters, 1)
@@ -154,15 +147,6 @@ class TlRulateLoader(MainPageLoader):
             covers=covers,
         )
 
-    async def _load_covers(self, urls: Sequence[URL]) -> Sequence[LoadedImage]:
-        logger.debug("loading covers")
-        images: list[LoadedImage | None] = []
-        for url in urls:
-            image = Image(url=url)
-            images.append(await self.image_loader.load_image(image))
-        logger.debug(f"load {len(images)} covers")
-        return [i for i in images if i]
-
 
 @dataclass(slots=True)
 class TlRulateChapterInfo:
@@ -177,75 +161,70 @@ class TlRulateMainPageData:
     chapters: Sequence[TlRulateChapterInfo]
 
 
+MAIN_PAGE_PLAN = Record(
+    {
+        "title": Text(
+            (
+                Select(
+                    "ul", class_="book-header", detail="book-header container missing"
+                ),
+                Select("h1", following=True, detail="book title tag missing"),
+            ),
+            detail="book title is empty",
+        ),
+        "covers": Record(
+            path=Select(class_="images"),
+            fields={
+                "srcs": Each(
+                    Select("img"), Attr("src", detail="cover image src missing")
+                )
+            },
+        ),
+        # rows of chapters that are not bought or not free yet are skipped
+        "chapters": Each(
+            Select(class_="chapter_row"),
+            Record(
+                path=Select("a", following=True, detail="chapter row anchor missing"),
+                fields={
+                    "href": Attr("href", detail="chapter link href missing"),
+                    "name": Text(detail="chapter link title empty"),
+                },
+            ),
+            where=(
+                Exists(Select("span", class_="disabled"), present=False),
+                Exists(Select("a", class_="btn")),
+            ),
+        ),
+    }
+)
+
+
 @dataclass(slots=True)
 class TlRulateMainPageParser:
-    soup: BeautifulSoup
+    document: Node
     page_url: URL
     domain: URL
 
     def parse(self) -> TlRulateMainPageData:
-        return TlRulateMainPageData(
-            title=self._parse_title(),
-            cover_urls=list(self._parse_cover_urls()),
-            chapters=list(self._parse_chapters()),
-        )
-
-    def _parse_title(self) -> str:
-        book_header = find_required_tag(
-            self.soup,
-            name="ul",
-            class_="book-header",
-            detail="book-header container missing",
-            page_url=self.page_url,
-        )
-        header_title = require_tag(
-            book_header.find_next("h1"),
-            detail="book title tag missing",
-            page_url=self.page_url,
-        )
-        title = require_text(
-            header_title, detail="book title is empty", page_url=self.page_url
-        )
-        logger.debug(f"get title={title}")
-        return title
-
-    def _parse_cover_urls(self) -> Iterable[URL]:
-        container = self.soup.find(class_="images")
-        if not isinstance(container, Tag):
+        data = MAIN_PAGE_PLAN.evaluate(self.document, self.page_url)
+        assert data is not None
+        logger.debug(f"get title={data['title']}")
+        covers = data["covers"]
+        if covers is None:
             logger.error("can't get cover images")
-            return list[URL]()
-        for img in container.find_all("img"):
-            src = require_attr(
-                img,
-                "src",
-                detail="cover image src missing",
-                page_url=self.page_url,
-            )
-            yield self._normalize_url(URL(str(src)))
-
-    def _parse_chapters(self) -> Iterable[TlRulateChapterInfo]:
-        rows = self.soup.find_all(class_="chapter_row")
-        if not rows:
+        cover_srcs = covers["srcs"] if covers is not None else []
+        if not data["chapters"]:
             logger.warning("chapter list is empty")
-        for row in rows:
-            if not PreParsedChapter(row).can_read:
-                continue
-            link_tag = require_tag(
-                row.find_next("a"),
-                detail="chapter row anchor missing",
-                page_url=self.page_url,
-            )
-            href = require_attr(
-                link_tag,
-                "href",
-                detail="chapter link href missing",
-                page_url=self.page_url,
-            )
-            name = require_text(
-                link_tag, detail="chapter link title empty", page_url=self.page_url
-            )
-            url = self._normalize_url(URL(str(href)))
-            yield TlRulateChapterInfo(name=name, url=url)
+        return TlRulateMainPageData(
+            title=data["title"],
+            cover_urls=[self._normalize_url(URL(str(i))) for i in cover_srcs],
+            chapters=[
+                TlRulateChapterInfo(
+                    name=i["name"], url=self._normalize_url(URL(str(i["href"])))
+                )
+                for i in data["chapters"]
+            ],
+        )
 
     def _normalize_url(self, url: URL) -> URL:
         if url.is_absolute():
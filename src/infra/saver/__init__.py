@@ -1,4 +1,5 @@
 from .ebook import EbookSaver
 from .files import FilesSaver
+from .streaming import StreamingEbookSaver
 
-__all__ = ["FilesSaver", "EbookSaver"]
+__all__ = ["FilesSaver", "EbookSaver", "StreamingEbookSaver"]
@@ -5,18 +5,29 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from random import choice
 from types import TracebackType
+from typing import ClassVar, override
 
 # pyright: reportMissingTypeStubs=false
 from ebooklib import epub
 from loguru import logger
 
-from domain import LoadedChapter, LoadedImage
+from domain import AnyLoadedImage, Chapter, LoadedChapter, SpooledImage
 from infra.exceptions.base import SaverUsingWithoutWithError
 from logic import Saver
 
+from .epub_writer import SpooledEpubImage, write_book
+from .volumes import Volumes
+
 
 @dataclass
 class EbookSaver(Saver):
+    """EPUB saver writing the whole book on exit.
+
+    With ``context.volumes`` the book is cut into volumes instead, each an
+    EbookSaver of its own written in the background once its chapters are in.
+    """
+
+    splits_volumes: ClassVar[bool] = True
     _is_entered: bool = False
     _book: epub.EpubBook = field(default_factory=epub.EpubBook)
     _items: list[tuple[int, epub.EpubItem]] = field(
@@ -25,13 +36,21 @@ class EbookSaver(Saver):
     _chapters: list[tuple[int, epub.EpubHtml]] = field(
         default_factory=list[tuple[int, epub.EpubHtml]]
     )
+    # path in the book of every distinct image by content hash
+    _images: dict[str, Path] = field(default_factory=dict[str, Path])
+    _volumes: Volumes | None = None
+    _held: int = 0
 
     def __post_init__(self) -> None:
         logger.debug(f"init {type(self).__name__} saver")
+        if self.context.volumes is not None and self.splits_volumes:
+            self._volumes = Volumes(self.context, self.context.volumes, type(self))
 
     def __enter__(self):
         logger.debug(f"enter {type(self).__name__} saver")
         self._is_entered = True
+        if self._volumes is not None:
+            return super().__enter__()
 
         self._book.set_title(self.context.title)  # type: ignore
         self._book.set_language(self.context.language)  # type: ignore
@@ -62,9 +81,28 @@ class EbookSaver(Saver):
             msg = "this saver require 'with'"
             logger.error(msg)
             raise SaverUsingWithoutWithError(saver_name=type(self).__name__)
+        if self._volumes is not None:
+            self._volumes.add(loaded_chapter)
+        else:
+            self.add_chapter(loaded_chapter)
+
+    def add_chapter(self, loaded_chapter: LoadedChapter) -> None:
+        obj = (loaded_chapter.id, self.chapter_html(loaded_chapter))
+        self._items.append(obj)
+        self._chapters.append(obj)
+        self._held += loaded_chapter.nbytes
+
+    @override
+    def held_nbytes(self) -> int:
+        if self._volumes is not None:
+            return self._volumes.held_nbytes()
+        return self._held
+
+    def chapter_html(self, loaded_chapter: LoadedChapter) -> epub.EpubHtml:
+        """Page of the chapter, adding its images to the book."""
         html = epub.EpubHtml(
             title=loaded_chapter.base_name,
-            file_name=f"chapters/{loaded_chapter.base_name}.xhtml",
+            file_name=self.get_chapter_file_name(loaded_chapter),
             lang=self.context.language,
         )
         paths = self.add_images_to_book(
@@ -74,10 +112,29 @@ class EbookSaver(Saver):
         html.set_content(  # type: ignore
             f"<html><body><p>{loaded_chapter.title}</p><br/>{self.get_paragraph_html(loaded_chapter)}{self.get_images_html(paths)}</html>"
         )
-
-        obj = (loaded_chapter.id, html)
-        self._items.append(obj)
-        self._chapters.append(obj)
+        return html
+
+    def get_chapter_file_name(self, chapter: Chapter) -> str:
+        return f"chapters/{chapter.base_name}.xhtml"
+
+    def get_book_path(self) -> Path:
+        return self.context.directory / f"{self.get_file_name()}.epub"
+
+    @override
+    def output_location(self, chapter: Chapter) -> str:
+        if self._volumes is not None:
+            # the volume of a chapter is only known once the ones before are in
+            saver = self._volumes.saver_of(chapter)
+            if saver is None:
+                return str(self.context.directory)
+            return saver.output_location(chapter)
+        return f"{self.get_book_path()}#{self.get_chapter_file_name(chapter)}"
+
+    @override
+    def artifact(self) -> Path:
+        if self._volumes is not None:
+            return self.context.directory
+        return self.get_book_path()
 
     def get_paragraph_html(self, loaded_chapter: LoadedChapter):
         return "".join(f"<p>{i.strip()}</p>" for i in loaded_chapter.paragraphs)
@@ -97,25 +154,30 @@ class EbookSaver(Saver):
         return prefix + html if len(html) > 0 else ""
 
     def add_images_to_book(
-        self, chapter_id: int, images: Iterable[LoadedImage]
+        self, chapter_id: int, images: Iterable[AnyLoadedImage]
     ) -> Iterable[Path]:
+        """Add the images not in the book yet, yielding the path of every one."""
         for num, image in enumerate(images):
+            digest = image.digest
+            if (stored := self._images.get(digest)) is not None:
+                yield stored
+                continue
             path = Path(f"images/{chapter_id}. {num} {image.name}")
+            self._images[digest] = path
             file_name = str(path)
-            ei = epub.EpubImage()
+            if isinstance(image, SpooledImage):
+                ei = SpooledEpubImage(image)
+            else:
+                ei = epub.EpubImage()
+                ei.content = image.data
             ei.file_name = file_name
             media_type, _ = mt.guess_type(str(image.url))
             ei.media_type = media_type or "application/octet-stream"
-            ei.content = image.data
             self._book.add_item(ei)  # type: ignore
             yield path
 
     def get_file_name(self):
-        return "".join(
-            x
-            for x in self.context.title.replace(" ", "_").replace("/", ":")
-            if x.isalnum() or x in ["_", "-", ":"]
-        )
+        return self.context.file_stem
 
     def add_cover_collection(self):
         covers = self.context.covers
@@ -132,6 +194,24 @@ class EbookSaver(Saver):
 
         return page
 
+    def add_navigation(self, pages: list[epub.EpubHtml]) -> None:
+        """Add the style, table of contents and spine over the ordered pages."""
+        style = "body { font-family: Roboto, Times, Times New Roman, serif; }"
+        nav_css = epub.EpubItem(
+            uid="style_nav",
+            file_name="style/nav.css",
+            media_type="text/css",
+            content=style,  # pyright: ignore
+        )
+        self._book.add_item(nav_css)  # type: ignore
+
+        self._book.toc = epub.Section("Chapters"), *pages  # type: ignore
+
+        self._book.spine = ["nav", *pages]
+
+        self._book.add_item(epub.EpubNcx())  # type: ignore
+        self._book.add_item(epub.EpubNav())  # type: ignore
+
     def __exit__(
         self,
         exception_type: type[BaseException] | None,
@@ -143,28 +223,19 @@ class EbookSaver(Saver):
                 "Unhandled error in context"
             )
             logger.trace(exception_traceback)
+            if self._volumes is not None:
+                self._volumes.finish(failed=True)
             return False
+        if self._volumes is not None:
+            self._volumes.finish(failed=False)
+            logger.debug(f"exit {type(self).__name__} saver")
+            return True
         self._items.sort(key=operator.itemgetter(0))
         for i in self._items:
             self._book.add_item(i[1])  # type: ignore
-        style = "body { font-family: Roboto, Times, Times New Roman, serif; }"
-        nav_css = epub.EpubItem(
-            uid="style_nav",
-            file_name="style/nav.css",
-            media_type="text/css",
-            content=style,  # pyright: ignore
-        )
-        self._book.add_item(nav_css)  # type: ignore
-
-        self._book.toc = epub.Section("Chapters"), *[i[1] for i in self._items]  # type: ignore
-
-        self._book.spine = ["nav", *[i[1] for i in self._items]]
-
-        self._book.add_item(epub.EpubNcx())  # type: ignore
-        self._book.add_item(epub.EpubNav())  # type: ignore
+        self.add_navigation([i[1] for i in self._items])
 
-        file_name = self.get_file_name()
-        epub.write_epub(f"{file_name}.epub", self._book)  # type: ignore
+        write_book(self.get_book_path(), self._book, self.context.compress_level)
         logger.debug(f"exit {type(self).__name__} saver")
 
         return True
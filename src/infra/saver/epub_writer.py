@@ -0,0 +1,119 @@
+import os
+import zipfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import override
+
+# pyright: reportMissingTypeStubs=false
+from ebooklib import epub
+
+from domain import SpooledImage
+
+from .zip_writer import ZipWriter, deflate
+
+# entries deflated ahead of the one being written
+WINDOW = 32
+# formats compressing their data already, deflating them again gains nothing
+STORED_MEDIA = frozenset(
+    {"image/jpeg", "image/png", "image/gif", "image/webp", "image/avif"}
+)
+
+
+class SpooledEpubImage(epub.EpubImage):
+    """Image item reading its content from the spool when the book is written."""
+
+    def __init__(self, image: SpooledImage) -> None:
+        super().__init__()
+        self.image = image
+
+    @override
+    def get_content(self, default: bytes | None = None) -> bytes:
+        return self.image.data
+
+
+# entry name, item, content and its deflated stream unless stored
+type Entry = tuple[str, epub.EpubItem, bytes, Future[bytes] | None]
+
+
+class EpubWriter(epub.EpubWriter):
+    """ebooklib writer storing compressed media as is and deflating in threads.
+
+    Images in ``STORED_MEDIA`` are stored uncompressed and spooled images are
+    copied from their file. The other entries are deflated with ``level`` in a
+    thread pool, as zlib releases the GIL, and written in book order. Level 0
+    stores every entry.
+    """
+
+    def __init__(self, path: Path, book: epub.EpubBook, level: int = 6) -> None:
+        super().__init__(str(path), book, {"compresslevel": level})
+        self.path = path
+        self.level = level
+
+    def open(self) -> ZipWriter:
+        """Start the zip with the entries preceding the package document."""
+        self.out = ZipWriter(self.path, self.level)
+        self.out.writestr(
+            "mimetype", "application/epub+zip", compress_type=zipfile.ZIP_STORED
+        )
+        self._write_container()
+        return self.out
+
+    def entry_name(self, item: epub.EpubItem) -> str:
+        if item.manifest:
+            return f"{self.book.FOLDER_NAME}/{item.file_name}"
+        return str(item.file_name)
+
+    def is_stored(self, item: epub.EpubItem) -> bool:
+        return self.level == 0 or item.media_type in STORED_MEDIA
+
+    def item_content(self, item: epub.EpubItem) -> bytes:
+        if isinstance(item, epub.EpubNcx):
+            content = self._get_ncx()
+        elif isinstance(item, epub.EpubNav):
+            content = self._get_nav(item)
+        else:
+            content = item.get_content()
+        return content.encode() if isinstance(content, str) else content
+
+    def write_entry(self, entry: Entry) -> None:
+        name, item, content, deflating = entry
+        if deflating is not None:
+            self.out.write_deflated(name, content, deflating.result())
+        elif isinstance(item, SpooledEpubImage):
+            self.out.write_file(name, item.image.path, item.image.size)
+        else:
+            self.out.writestr(name, content, compress_type=zipfile.ZIP_STORED)
+
+    @override
+    def _write_items(self) -> None:
+        workers = min(4, os.cpu_count() or 1)
+        window: deque[Entry] = deque()
+        with ThreadPoolExecutor(workers, "epub-deflate") as pool:
+            for item in self.book.get_items():
+                name = self.entry_name(item)
+                if isinstance(item, SpooledEpubImage) and self.is_stored(item):
+                    window.append((name, item, b"", None))
+                else:
+                    content = self.item_content(item)
+                    deflating = None
+                    if not self.is_stored(item):
+                        deflating = pool.submit(deflate, content, self.level)
+                    window.append((name, item, content, deflating))
+                if len(window) > WINDOW:
+                    self.write_entry(window.popleft())
+            while window:
+                self.write_entry(window.popleft())
+
+    @override
+    def write(self) -> None:
+        self.open()
+        self._write_opf()
+        self._write_items()
+        self.out.close()
+
+
+def write_book(path: Path, book: epub.EpubBook, level: int = 6) -> None:
+    writer = EpubWriter(path, book, level)
+    writer.process()
+    writer.write()
@@ -1,24 +1,42 @@
 import asyncio
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import override
 
 import aiofiles
 from loguru import logger
 
-from domain import LoadedChapter, LoadedImage
+from domain import AnyLoadedImage, Chapter, LoadedChapter, SpooledImage
+from infra.saver.image_store import ImageStore
 from logic import Saver
+from utils.files import link_file
 
 
 @dataclass
 class FilesSaver(Saver):
+    """Chapters as text files next to their images.
+
+    Every distinct image is written once, its other occurrences are hardlinks.
+    With ``context.image_store`` the images are kept in that shared store and
+    books only link to it.
+    """
+
+    _image_store: ImageStore | None = None
+    _images: dict[str, asyncio.Task[Path]] = field(
+        default_factory=dict[str, asyncio.Task[Path]]
+    )
+
     def __post_init__(self) -> None:
         logger.debug(f"init {type(self).__name__} saver")
+        if self.context.image_store is not None:
+            self._image_store = ImageStore(self.context.image_store)
 
     def __exit__(
         self,
         *_,
     ) -> bool:
         logger.trace("exit from file saver.")
-        return True
+        return False
 
     async def save_chapter(self, loaded_chapter: LoadedChapter) -> None:
         async with asyncio.TaskGroup() as tg:
@@ -28,9 +46,16 @@ class FilesSaver(Saver):
                     self.save_image(image, f"{loaded_chapter.base_name}_{index}")
                 )
 
-    async def save_text(self, chapter: LoadedChapter) -> None:
+    def get_text_path(self, chapter: Chapter) -> Path:
         file_name = chapter.base_name.encode()[0:200].decode()
-        file_name_with_ext = f"{file_name}.txt"
+        return self.context.directory / f"{file_name}.txt"
+
+    @override
+    def output_location(self, chapter: Chapter) -> str:
+        return str(self.get_text_path(chapter))
+
+    async def save_text(self, chapter: LoadedChapter) -> None:
+        file_name_with_ext = self.get_text_path(chapter)
         async with aiofiles.open(file_name_with_ext, "w") as f:
             logger.debug(f"write text {file_name_with_ext}")
             await f.write(chapter.title)
@@ -39,8 +64,31 @@ class FilesSaver(Saver):
                 await f.write(i)
                 await f.write("\n")
 
-    async def save_image(self, image: LoadedImage, prefix: str) -> None:
-        image_file_name = f"{prefix}{image.extension}"
-        async with aiofiles.open(image_file_name, "wb") as f:
-            logger.debug(f"write image {image_file_name}")
+    async def save_image(self, image: AnyLoadedImage, prefix: str) -> None:
+        image_file_name = self.context.directory / f"{prefix}{image.extension}"
+        digest = image.digest
+        stored = self._images.get(digest)
+        if stored is None:
+            stored = asyncio.create_task(
+                self.store_image(image, digest, image_file_name)
+            )
+            self._images[digest] = stored
+        source = await stored
+        if source != image_file_name:
+            logger.debug(f"link image {image_file_name} to {source}")
+            await asyncio.to_thread(link_file, source, image_file_name)
+
+    async def store_image(self, image: AnyLoadedImage, digest: str, path: Path) -> Path:
+        """Write the first occurrence of an image, returning the file to link."""
+        if self._image_store is not None:
+            return await asyncio.to_thread(self._image_store.put, image, digest)
+        if isinstance(image, SpooledImage):
+            logger.debug(f"link spooled image {path}")
+            await asyncio.to_thread(link_file, image.path, path)
+            return path
+        # may still be a link to an image of an earlier run
+        path.unlink(missing_ok=True)
+        async with aiofiles.open(path, "wb") as f:
+            logger.debug(f"write image {path}")
             await f.write(image.data)
+        return path
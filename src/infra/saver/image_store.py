@@ -0,0 +1,33 @@
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+from loguru import logger
+
+from domain import AnyLoadedImage
+from utils.files import write_image
+
+
+@dataclass
+class ImageStore:
+    """Image files by content hash, each distinct image written once.
+
+    Savers link their image files to the stored ones, so a banner repeated in
+    every chapter of every book takes the disk space of a single file.
+    """
+
+    directory: Path
+
+    def path(self, image: AnyLoadedImage, digest: str) -> Path:
+        return self.directory / digest[:2] / f"{digest}{image.extension}"
+
+    def put(self, image: AnyLoadedImage, digest: str) -> Path:
+        path = self.path(image, digest)
+        if not path.exists():
+            logger.debug(f"store image {path}")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # another process may store the same image, neither sees a partial file
+            temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            write_image(image, temporary)
+            temporary.replace(path)
+        return path
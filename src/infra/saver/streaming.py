@@ -0,0 +1,156 @@
+import heapq
+import operator
+import zipfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import TracebackType
+from typing import ClassVar, override
+
+# pyright: reportMissingTypeStubs=false
+from ebooklib import epub
+from loguru import logger
+
+from domain import LoadedChapter
+from infra.exceptions.base import SaverUsingWithoutWithError
+
+from .ebook import EbookSaver
+from .epub_writer import EpubWriter, SpooledEpubImage
+
+
+class ZipEpubWriter(EpubWriter):
+    """Writer over a zip kept open while the book is filled.
+
+    Items are written as soon as they are in the book and their content is
+    dropped; the package document, NCX and nav are written by ``close``.
+    """
+
+    def __init__(self, path: Path, book: epub.EpubBook, level: int = 6) -> None:
+        super().__init__(path, book, level)
+        # the page list is read from the content of the pages, which is gone
+        # by then; the chapters have no page breaks anyway
+        self.options["epub3_pages"] = False
+        self.open()
+        self._written = 0
+
+    def write_new_items(self) -> None:
+        """Write the items added to the book since the last call."""
+        items: list[epub.EpubItem] = self.book.items  # type: ignore
+        for item in items[self._written :]:
+            self.write_item(item)
+        self._written = len(items)
+
+    def write_item(self, item: epub.EpubItem) -> None:
+        name = self.entry_name(item)
+        if isinstance(item, SpooledEpubImage) and self.is_stored(item):
+            self.out.write_file(name, item.image.path, item.image.size)
+            return
+        compression = zipfile.ZIP_STORED if self.is_stored(item) else None
+        self.out.writestr(name, self.item_content(item), compress_type=compression)
+        if not isinstance(item, SpooledEpubImage):
+            # the manifest only needs the id, name and media type from now on
+            item.content = b""
+
+    def close(self) -> None:
+        self.write_new_items()
+        self._write_opf()
+        self.out.close()
+
+
+@dataclass
+class StreamingEbookSaver(EbookSaver):
+    """EPUB saver writing chapters and images into the zip as they come.
+
+    Chapters wait in a reorder buffer of ``reorder_window`` pages and leave it
+    lowest id first, so the entries of a book loaded out of order are mostly
+    in order. The table of contents and spine are sorted by id at the end
+    either way. The book is written to ``<name>.epub.part`` and renamed when
+    the saver exits cleanly; after an error the part file is closed as a
+    readable book of the chapters saved so far. It is not cut into volumes.
+    """
+
+    splits_volumes: ClassVar[bool] = False
+    reorder_window: ClassVar[int] = 64
+    _writer: ZipEpubWriter | None = None
+    # id, arrival and text bytes of the chapters in the reorder buffer
+    _pending: list[tuple[int, int, int, epub.EpubHtml]] = field(
+        default_factory=list[tuple[int, int, int, epub.EpubHtml]]
+    )
+    _pending_nbytes: int = 0
+    _pages: list[tuple[int, epub.EpubHtml]] = field(
+        default_factory=list[tuple[int, epub.EpubHtml]]
+    )
+    _arrivals: int = 0
+
+    def get_part_path(self) -> Path:
+        path = self.get_book_path()
+        return path.with_name(f"{path.name}.part")
+
+    @override
+    def __enter__(self):
+        super().__enter__()
+        self._writer = ZipEpubWriter(
+            self.get_part_path(), self._book, self.context.compress_level
+        )
+        for id, page in self._items:
+            self.add_page(id, page)
+        self._items.clear()
+        self._writer.write_new_items()
+        return self
+
+    @override
+    async def save_chapter(self, loaded_chapter: LoadedChapter) -> None:
+        if self._writer is None:
+            msg = "this saver require 'with'"
+            logger.error(msg)
+            raise SaverUsingWithoutWithError(saver_name=type(self).__name__)
+        html = self.chapter_html(loaded_chapter)
+        self._writer.write_new_items()
+        # arrival order breaks ties between equal ids, pages do not compare
+        self._arrivals += 1
+        # its images went into the zip with the items written above
+        nbytes = loaded_chapter.text_nbytes
+        heapq.heappush(self._pending, (loaded_chapter.id, self._arrivals, nbytes, html))
+        self._pending_nbytes += nbytes
+        while len(self._pending) > self.reorder_window:
+            self.add_next_pending()
+
+    def add_next_pending(self) -> None:
+        id, _, nbytes, page = heapq.heappop(self._pending)
+        self._pending_nbytes -= nbytes
+        self.add_page(id, page)
+
+    @override
+    def held_nbytes(self) -> int:
+        return self._pending_nbytes
+
+    def add_page(self, id: int, page: epub.EpubHtml) -> None:
+        assert self._writer is not None
+        self._book.add_item(page)  # type: ignore
+        self._pages.append((id, page))
+        self._writer.write_new_items()
+
+    @override
+    def __exit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception_value: BaseException | None,
+        exception_traceback: TracebackType | None,
+    ) -> bool:
+        if self._writer is None:
+            return False
+        while self._pending:
+            self.add_next_pending()
+        self._pages.sort(key=operator.itemgetter(0))
+        self.add_navigation([i[1] for i in self._pages])
+        self._writer.close()
+        self._writer = None
+        if exception_type:
+            logger.opt(exception=exception_value).exception(
+                "Unhandled error in context"
+            )
+            logger.trace(exception_traceback)
+            logger.warning(f"keep partial book in {self.get_part_path()}")
+            return False
+        self.get_part_path().replace(self.get_book_path())
+        logger.debug(f"exit {type(self).__name__} saver")
+        return True
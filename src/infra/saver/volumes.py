@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING
+
+from loguru import logger
+
+from domain import Chapter, LoadedChapter, SaverContext, VolumeSplit
+
+if TYPE_CHECKING:
+    from .ebook import EbookSaver
+
+
+def volume_size(chapter: LoadedChapter) -> int:
+    """Bytes of text and images a chapter adds to its volume."""
+    return chapter.text_nbytes + sum(i.size for i in chapter.images)
+
+
+@dataclass
+class Volumes:
+    """Cuts a book into volumes, each saved by a saver of its own.
+
+    Chapters join the volumes in id order, as soon as every chapter of the
+    catalog before them is in; the others wait. A volume is written in a
+    background thread as soon as it is complete, while the next ones fill.
+    Chapters that never come, such as deferred ones, hold their successors
+    back until ``finish``. The chapters of a volume stay in memory until it
+    is written.
+    """
+
+    context: SaverContext
+    split: VolumeSplit
+    new_saver: Callable[[SaverContext], EbookSaver]
+    _plan: list[Chapter] = field(default_factory=list[Chapter])
+    _next: int = 0
+    _waiting: dict[int, LoadedChapter] = field(default_factory=dict[int, LoadedChapter])
+    _waiting_nbytes: int = 0
+    _current: EbookSaver | None = None
+    _number: int = 0
+    _chapters: int = 0
+    _nbytes: int = 0
+    _savers: dict[int, EbookSaver] = field(default_factory=dict)
+    _executor: ThreadPoolExecutor | None = None
+    # every volume submitted for writing with the bytes its chapters hold
+    _writes: list[tuple[Future[bool], int]] = field(
+        default_factory=list[tuple[Future[bool], int]]
+    )
+
+    def __post_init__(self) -> None:
+        self._plan = sorted(self.context.chapters, key=lambda i: i.id)
+
+    def add(self, chapter: LoadedChapter) -> None:
+        if (replaced := self._waiting.get(chapter.id)) is not None:
+            self._waiting_nbytes -= replaced.nbytes
+        self._waiting[chapter.id] = chapter
+        self._waiting_nbytes += chapter.nbytes
+        while self._next < len(self._plan):
+            planned = self._plan[self._next]
+            loaded = self._waiting.pop(planned.id, None)
+            if loaded is None:
+                return
+            self._waiting_nbytes -= loaded.nbytes
+            self._next += 1
+            following = self._plan[self._next] if self._next < len(self._plan) else None
+            self._append(loaded, planned, following)
+
+    def saver_of(self, chapter: Chapter) -> EbookSaver | None:
+        return self._savers.get(chapter.id)
+
+    def held_nbytes(self) -> int:
+        """Bytes of the chapters waiting, in the open volume or being written."""
+        current = self._current.held_nbytes() if self._current is not None else 0
+        writing = sum(n for write, n in self._writes if not write.done())
+        return self._waiting_nbytes + current + writing
+
+    def finish(self, failed: bool) -> None:
+        """Save the chapters left and wait for every volume to be written.
+
+        After a failure the volume being filled is dropped, the complete ones
+        are still written.
+        """
+        if not failed:
+            planned = {i.id: i for i in self._plan}
+            left = [
+                planned.get(i.id, i)
+                for i in sorted(self._waiting.values(), key=lambda i: i.id)
+            ]
+            for index, chapter in enumerate(left):
+                following = left[index + 1] if index + 1 < len(left) else None
+                self._append(self._waiting[chapter.id], chapter, following)
+            self._close()
+        self._waiting.clear()
+        self._waiting_nbytes = 0
+        try:
+            for write, _ in self._writes:
+                write.result()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+
+    def _append(
+        self, loaded: LoadedChapter, planned: Chapter, following: Chapter | None
+    ) -> None:
+        if self._current is None:
+            self._number += 1
+            title = f"{self.context.title}, vol. {self._number:02}"
+            context = replace(self.context, title=title, chapters=(), volumes=None)
+            self._current = self.new_saver(context)
+            self._current.__enter__()
+        self._current.add_chapter(loaded)
+        self._savers[loaded.id] = self._current
+        self._chapters += 1
+        self._nbytes += volume_size(loaded)
+        split = self.split
+        if (
+            following is None
+            or (split.chapters is not None and self._chapters >= split.chapters)
+            or (split.nbytes is not None and self._nbytes >= split.nbytes)
+            or (split.source and following.volume != planned.volume)
+        ):
+            self._close()
+
+    def _close(self) -> None:
+        saver = self._current
+        if saver is None:
+            return
+        if self._executor is None:
+            workers = min(4, os.cpu_count() or 1)
+            self._executor = ThreadPoolExecutor(workers, "epub-volume")
+        logger.debug(f"write {saver.get_book_path()} with {self._chapters} chapters")
+        write = self._executor.submit(saver.__exit__, None, None, None)
+        self._writes.append((write, saver.held_nbytes()))
+        self._current = None
+        self._chapters = self._nbytes = 0
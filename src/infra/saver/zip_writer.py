@@ -0,0 +1,221 @@
+"""Zip archive written entry by entry from data compressed beforehand.
+
+``zipfile`` has no way to write a stream deflated elsewhere, so the EPUB is
+written with this writer following the ZIP application note (APPNOTE.TXT):
+stored and deflated entries, with ZIP64 records once sizes, offsets or the
+number of entries need them.
+"""
+
+import shutil
+import struct
+import time
+import zipfile
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+# sizes and offsets from which zipfile writes ZIP64 records, and the same here
+ZIP64_LIMIT = (1 << 31) - 1
+ZIP_FILECOUNT_LIMIT = (1 << 16) - 1
+
+LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+CENTRAL_HEADER = struct.Struct("<4s4B4HL2L5H2L")
+END_RECORD = struct.Struct("<4s4H2LH")
+END_RECORD64 = struct.Struct("<4sQ2H2L4Q")
+END_LOCATOR64 = struct.Struct("<4sLQL")
+
+VERSION = 20
+VERSION64 = 45
+UNIX = 3
+UTF8_NAME = 0x800
+FILE_ATTRIBUTES = 0o644 << 16
+
+
+def deflate(data: bytes, level: int) -> bytes:
+    """Raw DEFLATE stream of data, as zipfile writes it."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def zip64_extra(*values: int) -> bytes:
+    return struct.pack(f"<2H{len(values)}Q", 1, 8 * len(values), *values)
+
+
+@dataclass
+class ZipEntry:
+    name: bytes
+    flags: int
+    compress_type: int
+    date_time: tuple[int, int]
+    crc: int
+    compress_size: int
+    file_size: int
+    offset: int
+
+
+class ZipWriter:
+    """Zip archive open for writing, closed by writing its central directory.
+
+    ``writestr`` deflates with ``level`` unless told otherwise, as
+    ``zipfile.ZipFile.writestr`` does, so the ebooklib writer can use it.
+    """
+
+    def __init__(self, path: Path, level: int = 6) -> None:
+        self.level = level
+        self.file: BinaryIO = path.open("wb")
+        self.entries: list[ZipEntry] = []
+
+    def writestr(
+        self, name: str, data: str | bytes, compress_type: int | None = None
+    ) -> None:
+        content = data.encode() if isinstance(data, str) else data
+        if compress_type is None:
+            compress_type = zipfile.ZIP_DEFLATED if self.level else zipfile.ZIP_STORED
+        if compress_type == zipfile.ZIP_DEFLATED:
+            self.write_deflated(name, content, deflate(content, self.level))
+        else:
+            entry = self._start(name, zipfile.ZIP_STORED, len(content), len(content))
+            entry.crc = zlib.crc32(content)
+            self._write_header(entry)
+            self.file.write(content)
+
+    def write_deflated(self, name: str, content: bytes, deflated: bytes) -> None:
+        """Write ``deflated``, the raw DEFLATE stream of ``content``."""
+        entry = self._start(name, zipfile.ZIP_DEFLATED, len(deflated), len(content))
+        entry.crc = zlib.crc32(content)
+        self._write_header(entry)
+        self.file.write(deflated)
+
+    def write_file(self, name: str, path: Path, size: int) -> None:
+        """Store the file of ``size`` bytes, computing its CRC while copying."""
+        entry = self._start(name, zipfile.ZIP_STORED, size, size)
+        self._write_header(entry)
+        crc = copied = 0
+        with path.open("rb") as src:
+            while chunk := src.read(shutil.COPY_BUFSIZE):
+                crc = zlib.crc32(chunk, crc)
+                copied += len(chunk)
+                self.file.write(chunk)
+        if copied != size:
+            msg = f"{path} has {copied} bytes, expected {size}"
+            raise ValueError(msg)
+        entry.crc = crc
+        end = self.file.tell()
+        # the CRC field of the local header
+        self.file.seek(entry.offset + 14)
+        self.file.write(struct.pack("<L", crc))
+        self.file.seek(end)
+
+    def close(self) -> None:
+        start = self.file.tell()
+        for entry in self.entries:
+            self._write_central_header(entry)
+        end = self.file.tell()
+        count, size = len(self.entries), end - start
+        if count > ZIP_FILECOUNT_LIMIT or start > ZIP64_LIMIT or size > ZIP64_LIMIT:
+            self.file.write(
+                END_RECORD64.pack(
+                    b"PK\x06\x06",
+                    END_RECORD64.size - 12,
+                    VERSION64,
+                    VERSION64,
+                    0,
+                    0,
+                    count,
+                    count,
+                    size,
+                    start,
+                )
+            )
+            self.file.write(END_LOCATOR64.pack(b"PK\x06\x07", 0, end, 1))
+            count = min(count, 0xFFFF)
+            size = min(size, 0xFFFFFFFF)
+            start = min(start, 0xFFFFFFFF)
+        self.file.write(
+            END_RECORD.pack(b"PK\x05\x06", 0, 0, count, count, size, start, 0)
+        )
+        self.file.close()
+
+    def _start(
+        self, name: str, compress_type: int, compress_size: int, file_size: int
+    ) -> ZipEntry:
+        encoded = name.encode()
+        year, month, day, hour, minute, second = time.localtime()[:6]
+        entry = ZipEntry(
+            name=encoded,
+            flags=UTF8_NAME if not name.isascii() else 0,
+            compress_type=compress_type,
+            date_time=(
+                (year - 1980) << 9 | month << 5 | day,
+                hour << 11 | minute << 5 | second // 2,
+            ),
+            crc=0,
+            compress_size=compress_size,
+            file_size=file_size,
+            offset=self.file.tell(),
+        )
+        self.entries.append(entry)
+        return entry
+
+    def _write_header(self, entry: ZipEntry) -> None:
+        extra = b""
+        compress_size, file_size = entry.compress_size, entry.file_size
+        if max(compress_size, file_size) > ZIP64_LIMIT:
+            extra = zip64_extra(file_size, compress_size)
+            compress_size = file_size = 0xFFFFFFFF
+        date, time_ = entry.date_time
+        self.file.write(
+            LOCAL_HEADER.pack(
+                b"PK\x03\x04",
+                VERSION64 if extra else VERSION,
+                0,
+                entry.flags,
+                entry.compress_type,
+                time_,
+                date,
+                entry.crc,
+                compress_size,
+                file_size,
+                len(entry.name),
+                len(extra),
+            )
+        )
+        self.file.write(entry.name)
+        self.file.write(extra)
+
+    def _write_central_header(self, entry: ZipEntry) -> None:
+        # only the fields that don't fit go to the ZIP64 extra, in this order
+        fields = [entry.file_size, entry.compress_size, entry.offset]
+        wide = [i for i in fields if i > ZIP64_LIMIT]
+        file_size, compress_size, offset = (
+            0xFFFFFFFF if i > ZIP64_LIMIT else i for i in fields
+        )
+        extra = zip64_extra(*wide) if wide else b""
+        version = VERSION64 if extra else VERSION
+        date, time_ = entry.date_time
+        self.file.write(
+            CENTRAL_HEADER.pack(
+                b"PK\x01\x02",
+                version,
+                UNIX,
+                version,
+                0,
+                entry.flags,
+                entry.compress_type,
+                time_,
+                date,
+                entry.crc,
+                compress_size,
+                file_size,
+                len(entry.name),
+                len(extra),
+                0,
+                0,
+                0,
+                FILE_ATTRIBUTES,
+                offset,
+            )
+        )
+        self.file.write(entry.name)
+        self.file.write(extra)
@@ -0,0 +1,200 @@
+from collections.abc import AsyncIterator, Awaitable
+from dataclasses import dataclass, field
+from itertools import batched
+from types import TracebackType
+from typing import Any, override
+
+from dependency_injector import providers
+from loguru import logger
+from yarl import URL
+
+from config import Settings, TrimSettings
+from config.data import LimiterSettings
+from containers import Container
+from domain import LoadedChapter, SaverContext
+from downloader import BookDownloader, BookStatus
+from infra.main_page.document import ParserBackendScope
+from infra.saver import EbookSaver
+from logic import Saver, SaverLoaderConnector
+from logic.exceptions.base import ClientClosedError
+from utils import trim
+
+
+def default_settings(**overrides: Any) -> Settings:
+    """Settings with the defaults of the command line, updated by ``overrides``."""
+    values: dict[str, Any] = {
+        "trim_args": TrimSettings(from_=0, to=10**10, interactive=False),
+        "saver": EbookSaver,
+        "limiter": LimiterSettings(max_rate=20, time_period=10),
+    }
+    return Settings(**(values | overrides))
+
+
+@dataclass
+class ChapterBuffer(Saver):
+    """Saver keeping loaded chapters in memory until they are taken."""
+
+    chapters: list[LoadedChapter] = field(default_factory=list[LoadedChapter])
+
+    def __enter__(self) -> "ChapterBuffer":
+        return self
+
+    def __exit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception_value: BaseException | None,
+        exception_traceback: TracebackType | None,
+    ) -> bool:
+        return False
+
+    @override
+    async def save_chapter(self, loaded_chapter: LoadedChapter) -> None:
+        self.chapters.append(loaded_chapter)
+
+    @override
+    def held_nbytes(self) -> int:
+        return sum(i.nbytes for i in self.chapters)
+
+    def take(self) -> list[LoadedChapter]:
+        chapters = sorted(self.chapters, key=lambda i: i.id)
+        self.chapters.clear()
+        return chapters
+
+
+@dataclass(eq=False)
+class RequestsU:
+    """Download books from async code in the calling process.
+
+    The client owns the HTTP session, the per-host rate limiter and the memory
+    budget for as long as its ``async with`` block runs, so any number of books
+    can share them::
+
+        async with RequestsU(default_settings(working_directory=books)) as client:
+            status = await client.download("https://ranobes.com/...")
+            async for chapter in client.stream("https://renovels.org/...", to=10):
+                ...
+
+    Books are written under ``settings.working_directory`` without changing the
+    working directory of the process. ``workers``, ``watch`` and ``daemon``
+    settings are left to the command line.
+    """
+
+    settings: Settings = field(default_factory=default_settings)
+    _container: Container | None = None
+    _downloader: BookDownloader | None = None
+
+    async def __aenter__(self) -> "RequestsU":
+        root = self.settings.working_directory.resolve()
+        root.mkdir(parents=True, exist_ok=True)
+        settings = self.settings.model_copy(
+            update={
+                "working_directory": root,
+                "state_directory": root / self.settings.state_directory,
+            }
+        )
+        container = Container()
+        container.settings.override(providers.Object(settings))
+        c = container.init_resources()
+        if isinstance(c, Awaitable):
+            await c
+        loader_service = container.loader_service()
+        if isinstance(loader_service, Awaitable):
+            loader_service = await loader_service
+        self._container = container
+        self._downloader = BookDownloader(
+            settings,
+            loader_service,
+            container.limiter(),
+            container.memory_budget(),
+            container.journal_factory,
+            container.manifest_factory,
+            root=root,
+        )
+        return self
+
+    async def __aexit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception_value: BaseException | None,
+        exception_traceback: TracebackType | None,
+    ) -> None:
+        container, self._container, self._downloader = self._container, None, None
+        if container is not None:
+            shutdown = container.shutdown_resources()
+            if isinstance(shutdown, Awaitable):
+                await shutdown
+
+    @property
+    def downloader(self) -> BookDownloader:
+        if self._downloader is None:
+            raise ClientClosedError()
+        return self._downloader
+
+    async def download(
+        self,
+        url: URL | str,
+        *,
+        from_: int = 0,
+        to: int | None = None,
+        saver: type[Saver] | None = None,
+        update: bool | None = None,
+        book_directory: bool = True,
+    ) -> BookStatus:
+        """Download and save a book, returning where it ended up.
+
+        Unlike the command line, errors are raised to the caller.
+        """
+        options: dict[str, Any] = {"trim_args": _trim_settings(from_, to)}
+        if saver is not None:
+            options["saver"] = saver
+        if update is not None:
+            options["update"] = update
+        downloader = self.downloader.with_args(**options)
+        status = BookStatus()
+        with ParserBackendScope(self.settings.parser):
+            await downloader.download_book(URL(url), book_directory, status)
+        return status
+
+    async def stream(
+        self, url: URL | str, *, from_: int = 0, to: int | None = None
+    ) -> AsyncIterator[LoadedChapter]:
+        """Yield the loaded chapters of a book in catalog order without saving them.
+
+        Chapters are loaded ``chunk_size`` at a time, the next chunk starts once
+        the consumer took the previous one. Chapters that run out of their
+        deadline are skipped and logged.
+        """
+        downloader = self.downloader
+        loader = downloader.loader_service.get(URL(url))
+        with ParserBackendScope(self.settings.parser):
+            main_page = await loader.load()
+        chapters = trim(_trim_settings(from_, to), main_page.chapters)
+        buffer = ChapterBuffer(
+            SaverContext(title=main_page.title, language="ru", covers=[])
+        )
+        connector = SaverLoaderConnector(
+            buffer,
+            loader.get_loader_for_chapter(),
+            chapter_deadline=downloader.args.deadline.chapter,
+            memory_budget=downloader.memory_budget,
+        )
+        for chunk in batched(chapters, n=downloader.args.chunk_size):
+            # the scopes must not span a yield, the consumer runs in between
+            with (
+                ParserBackendScope(self.settings.parser),
+                downloader.memory_budget.holding(buffer),
+            ):
+                await downloader.load_chapters(connector, chunk)
+            # handed over to the consumer, no longer held by the pipeline
+            loaded_chapters = buffer.take()
+            for loaded_chapter in loaded_chapters:
+                yield loaded_chapter
+        if connector.deferred:
+            deferred = ", ".join(i.base_name for i in connector.deferred)
+            logger.warning(f"{main_page.title}: skipped deferred chapters {deferred}")
+
+
+def _trim_settings(from_: int, to: int | None) -> TrimSettings:
+    return TrimSettings(
+        from_=from_, to=to if to is not None else 10**10, interactive=False
+    )
@@ -1,3 +1,4 @@
+from .journal import ChapterJournal
 from .loader import ChapterLoader, ImageLoader, MainPageLoader
 from .saver import Saver
 from .saver_chapter_connector import SaverLoaderConnector
@@ -8,4 +9,5 @@ __all__ = [
     "MainPageLoader",
     "ChapterLoader",
     "SaverLoaderConnector",
+    "ChapterJournal",
 ]
@@ -0,0 +1,13 @@
+from abc import ABC, abstractmethod
+
+from yarl import URL
+
+
+class DeadUrls(ABC):
+    """Urls answered as gone for good, not requested again until they expire."""
+
+    @abstractmethod
+    def is_dead(self, url: URL) -> bool: ...
+
+    @abstractmethod
+    async def mark_dead(self, url: URL, reason: str) -> None: ...
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+
+from logic.exceptions.base import DeadlineExceededError
+
+
+@dataclass(frozen=True, slots=True)
+class Deadline:
+    """Moment in event loop time after which work should be abandoned."""
+
+    when: float
+
+    @classmethod
+    def after(cls, seconds: float) -> Deadline:
+        return cls(asyncio.get_running_loop().time() + seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self.when - asyncio.get_running_loop().time())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+_current_deadline: ContextVar[Deadline | None] = ContextVar(
+    "current_deadline", default=None
+)
+
+
+def current_deadline() -> Deadline | None:
+    return _current_deadline.get()
+
+
+@dataclass
+class DeadlineScope:
+    """Narrow the deadline seen by fetch, parse and save inside the block.
+
+    A nested scope can only shorten the enclosing deadline, so a chapter
+    deadline never outlives the deadline of the whole run.
+    """
+
+    seconds: float | None
+    _token: Token[Deadline | None] | None = None
+
+    def __enter__(self) -> Deadline | None:
+        deadline = current_deadline()
+        if self.seconds is not None:
+            candidate = Deadline.after(self.seconds)
+            if deadline is None or candidate.when < deadline.when:
+                deadline = candidate
+        self._token = _current_deadline.set(deadline)
+        return deadline
+
+    def __exit__(self, *_: object) -> None:
+        assert self._token is not None
+        _current_deadline.reset(self._token)
+
+
+def check_deadline(scope: str | None = None) -> None:
+    deadline = current_deadline()
+    if deadline is not None and deadline.expired:
+        raise DeadlineExceededError(scope=scope)
+
+
+def clamp_timeout(timeout: float | None) -> float | None:
+    """Shorten a per-request timeout to the time left before the deadline."""
+    deadline = current_deadline()
+    if deadline is None:
+        return timeout
+    check_deadline("waiting for a response")
+    remaining = deadline.remaining()
+    if timeout is None:
+        return remaining
+    return min(timeout, remaining)
@@ -1,7 +1,11 @@
 from dataclasses import dataclass
 
+# The errors of every layer are mutable dataclasses: contextlib, asyncio and
+# tenacity set ``__traceback__`` on the exceptions they re-raise, which the
+# ``__setattr__`` of a frozen dataclass refuses.
 
-@dataclass(frozen=True, slots=True, kw_only=True)
+
+@dataclass(eq=False, slots=True, kw_only=True)
 class BaseAppError(Exception):
     """Base error for the application layer."""
 
@@ -15,7 +19,7 @@ class BaseAppError(Exception):
         return self.message
 
 
-@dataclass(frozen=True, slots=True, kw_only=True)
+@dataclass(eq=False, slots=True, kw_only=True)
 class RetryableError(BaseAppError):
     """Base error for the application layer."""
 
@@ -29,3 +33,73 @@ class RetryableError(BaseAppError):
 
     def __str__(self) -> str:  # pragma: no cover - trivial
         return self.message
+
+
+@dataclass(eq=False, slots=True, kw_only=True)
+class DeadlineExceededError(BaseAppError):
+    """Raised when work is attempted after its deadline has passed."""
+
+    scope: str | None = None
+
+    @property
+    def message(self) -> str:
+        if self.scope:
+            return f"Deadline exceeded while {self.scope}."
+        return "Deadline exceeded."
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return self.message
+
+
+@dataclass(eq=False, slots=True, kw_only=True)
+class WorkersExitedError(BaseAppError):
+    """Raised when every worker process died and jobs are still outstanding."""
+
+    outstanding: int
+
+    @property
+    def message(self) -> str:
+        return f"All workers exited with {self.outstanding} jobs outstanding."
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return self.message
+
+
+@dataclass(eq=False, slots=True, kw_only=True)
+class ClientClosedError(BaseAppError):
+    """Raised when a library client is used outside of its ``async with`` block."""
+
+    @property
+    def message(self) -> str:
+        return "The client is not open, use it as `async with RequestsU(...)`."
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return self.message
+
+
+@dataclass(eq=False, slots=True, kw_only=True)
+class PageNotModifiedError(BaseAppError):
+    """Raised when a conditional request for a page is answered with ``304``."""
+
+    page_url: str
+
+    @property
+    def message(self) -> str:
+        return f"{self.page_url} is not modified."
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return self.message
+
+
+@dataclass(eq=False, slots=True, kw_only=True)
+class BookAlreadyQueuedError(BaseAppError):
+    """Raised when a book is submitted while a job for it is not finished."""
+
+    book_url: str
+
+    @property
+    def message(self) -> str:
+        return f"{self.book_url} is already being downloaded."
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return self.message
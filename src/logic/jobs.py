@@ -0,0 +1,178 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import override
+
+from loguru import logger
+from yarl import URL
+
+from domain import Chapter, LoadedChapter, SaverContext
+from logic.loader import ChapterLoader
+from logic.rate_limit import HostLimiter
+from logic.saver import Saver
+from logic.saver_chapter_connector import SaverLoaderConnector
+
+
+@dataclass(frozen=True, slots=True)
+class ChapterJob:
+    id: int
+    book: URL
+    chapter: Chapter
+
+
+@dataclass(frozen=True, slots=True)
+class JobResult:
+    job: ChapterJob
+    loaded_chapter: LoadedChapter | None
+    error: str | None = None
+
+
+class JobSource(ABC):
+    """Worker side of the chapter jobs.
+
+    A worker owns a claimed job until its lease runs out. Leases of crashed
+    workers expire and the job is handed to the next worker that claims.
+    """
+
+    @abstractmethod
+    async def claim(self, owner: str, lease: float) -> ChapterJob | None: ...
+
+    @abstractmethod
+    async def renew(self, owner: str, lease: float) -> None: ...
+
+    @abstractmethod
+    async def complete(
+        self, job: ChapterJob, owner: str, loaded_chapter: LoadedChapter
+    ) -> None:
+        """Store the result unless the lease was already handed to another worker."""
+
+    @abstractmethod
+    async def fail(self, job: ChapterJob, owner: str, error: str) -> None: ...
+
+    @abstractmethod
+    async def drained(self) -> bool:
+        """Whether the queue is closed and no job is left to claim."""
+
+
+class JobQueue(JobSource):
+    """Chapter jobs shared by a coordinator and its workers."""
+
+    @abstractmethod
+    async def enqueue(self, book: URL, chapters: Sequence[Chapter]) -> None: ...
+
+    @abstractmethod
+    async def release(self, owner: str) -> int:
+        """Return the leased jobs of a dead worker to the queue."""
+
+    @abstractmethod
+    async def take_results(self, book: URL, limit: int) -> list[JobResult]: ...
+
+    @abstractmethod
+    async def outstanding(self, book: URL) -> int:
+        """Number of jobs of the book whose result was not taken yet."""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Tell workers that no more jobs will be enqueued."""
+
+
+@dataclass
+class JobResultSaver(Saver):
+    """Saver of a worker, hands loaded chapters back to the job queue."""
+
+    queue: JobSource | None = None
+    owner: str = ""
+    jobs: dict[URL, ChapterJob] = field(default_factory=dict[URL, ChapterJob])
+
+    def __exit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception_value: BaseException | None,
+        exception_traceback: TracebackType | None,
+    ) -> bool:
+        return False
+
+    @override
+    async def save_chapter(self, loaded_chapter: LoadedChapter) -> None:
+        assert self.queue is not None
+        job = self.jobs[loaded_chapter.url]
+        await self.queue.complete(job, self.owner, loaded_chapter)
+
+
+@dataclass
+class JobWorker:
+    """Claim chapter jobs and run them through a connector per book."""
+
+    queue: JobSource
+    owner: str
+    loader_for_book: Callable[[URL], ChapterLoader]
+    limiter: HostLimiter
+    chapter_deadline: float | None = None
+    concurrency: int = 8
+    lease: float = 60.0
+    poll_interval: float = 0.5
+    _connectors: dict[URL, SaverLoaderConnector] = field(
+        default_factory=dict[URL, SaverLoaderConnector]
+    )
+
+    async def run(self) -> None:
+        logger.info(f"worker {self.owner} started")
+        heartbeat = asyncio.create_task(self._heartbeat())
+        try:
+            async with asyncio.TaskGroup() as tg:
+                for _ in range(self.concurrency):
+                    tg.create_task(self._serve())
+        finally:
+            heartbeat.cancel()
+        logger.info(f"worker {self.owner} finished")
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            await self.queue.renew(self.owner, self.lease)
+
+    async def _serve(self) -> None:
+        while True:
+            job = await self.queue.claim(self.owner, self.lease)
+            if job is None:
+                if await self.queue.drained():
+                    return
+                await asyncio.sleep(self.poll_interval)
+                continue
+            await self._handle(job)
+
+    async def _handle(self, job: ChapterJob) -> None:
+        connector = self._get_connector(job.book)
+        saver = connector.saver
+        assert isinstance(saver, JobResultSaver)
+        saver.jobs[job.chapter.url] = job
+        try:
+            await self.limiter.for_url(job.chapter.url).acquire()
+            await connector.handle(job.chapter)
+        except Exception as e:
+            logger.opt(exception=e).error(f"job {job.chapter.base_name} failed")
+            await self.queue.fail(job, self.owner, repr(e))
+        else:
+            if job.chapter in connector.deferred:
+                connector.deferred.remove(job.chapter)
+                await self.queue.fail(job, self.owner, "deadline exceeded")
+        finally:
+            del saver.jobs[job.chapter.url]
+
+    def _get_connector(self, book: URL) -> SaverLoaderConnector:
+        connector = self._connectors.get(book)
+        if connector is None:
+            saver = JobResultSaver(
+                SaverContext(title=str(book), language="ru", covers=[]),
+                queue=self.queue,
+                owner=self.owner,
+            )
+            connector = SaverLoaderConnector(
+                saver,
+                self.loader_for_book(book),
+                chapter_deadline=self.chapter_deadline,
+            )
+            self._connectors[book] = connector
+        return connector
@@ -0,0 +1,55 @@
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Sequence, Set
+from dataclasses import replace
+
+from loguru import logger
+
+from domain import Chapter, LoadedChapter
+from logic.manifest import BookManifest, record_saved
+from logic.saver import Saver
+
+
+class ChapterJournal(ABC):
+    """Durable record of chapters that were already loaded for one book."""
+
+    @abstractmethod
+    def replay(self) -> AsyncIterator[LoadedChapter]:
+        """Yield the latest record of every chapter in recording order."""
+
+    @abstractmethod
+    async def record(self, loaded_chapter: LoadedChapter) -> None: ...
+
+    @abstractmethod
+    async def prune(self, keep: Set[str]) -> None:
+        """Drop all but the latest record of the chapter urls in ``keep``.
+
+        Called once a book is saved; the records left let a later update
+        rebuild the book without refetching its unchanged chapters.
+        """
+
+
+async def restore_from_journal(
+    journal: ChapterJournal,
+    saver: Saver,
+    chapters: Sequence[Chapter],
+    manifest: BookManifest | None = None,
+) -> set[Chapter]:
+    """Hand journaled chapters to the saver and return the ones left to load.
+
+    Ids and names come from the fresh catalog, so a chapter keeps its place
+    even when the site inserted chapters before it since the last run.
+    """
+    wanted = {str(i.url): i for i in chapters}
+    restored = 0
+    async for loaded in journal.replay():
+        chapter = wanted.pop(str(loaded.url), None)
+        if chapter is None:
+            continue
+        loaded = replace(loaded, id=chapter.id, name=chapter.name)
+        await saver.save_chapter(loaded)
+        if manifest is not None:
+            record_saved(manifest, saver, loaded)
+        restored += 1
+    if restored:
+        logger.info(f"restore {restored} chapters from journal")
+    return set(wanted.values())
@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 
 import aiohttp
 
-from domain import Image, LoadedImage
+from domain import AnyLoadedImage, Image
 
 
 class ImageLoader(ABC):
@@ -11,5 +11,5 @@ class ImageLoader(ABC):
         super().__init__()
 
     @abstractmethod
-    async def load_image(self, image: Image) -> LoadedImage | None:
+    async def load_image(self, image: Image) -> AnyLoadedImage | None:
         raise NotImplementedError
@@ -1,9 +1,12 @@
+import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 
 import aiohttp
 from yarl import URL
 
-from domain import MainPageInfo
+from domain import AnyLoadedImage, Image, MainPageInfo
+from logic.rate_limit import HostLimiter
 
 from .chapter import ChapterLoader
 from .image import ImageLoader
@@ -15,11 +18,13 @@ class MainPageLoader(ABC):
         url: URL,
         image_loader: ImageLoader,
         session: aiohttp.ClientSession,
+        limiter: HostLimiter | None = None,
     ) -> None:
         self.url = url
         self.domain = url.with_path("")
         self.image_loader = image_loader
         self.session = session
+        self.limiter = limiter
 
     @abstractmethod
     async def load(self) -> MainPageInfo:
@@ -28,3 +33,22 @@ class MainPageLoader(ABC):
     @abstractmethod
     def get_loader_for_chapter(self) -> ChapterLoader:
         raise NotImplementedError
+
+    async def throttle(self, url: URL) -> None:
+        """Wait for the rate limit of the host of ``url``, when there is one.
+
+        Catalog requests run concurrently, so they take turns with the chapters
+        of every other book under the same per-host limit.
+        """
+        if self.limiter is not None:
+            await self.limiter.for_url(url).acquire()
+
+    async def load_covers(self, urls: Sequence[URL]) -> list[AnyLoadedImage]:
+        """Load covers concurrently, in the given order, without the failed ones."""
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(self._load_cover(i)) for i in urls]
+        return [i for i in (task.result() for task in tasks) if i is not None]
+
+    async def _load_cover(self, url: URL) -> AnyLoadedImage | None:
+        await self.throttle(url)
+        return await self.image_loader.load_image(Image(url=url))
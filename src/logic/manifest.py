@@ -0,0 +1,92 @@
+import hashlib
+from abc import ABC, abstractmethod
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+
+from domain import Chapter, LoadedChapter
+from logic.saver import Saver
+
+
+@dataclass(frozen=True, slots=True)
+class ManifestEntry:
+    name: str
+    content_hash: str
+    output: str
+
+
+@dataclass(frozen=True, slots=True)
+class CatalogDiff:
+    new: Sequence[Chapter]
+    changed: Sequence[Chapter]
+    unchanged: Sequence[Chapter]
+
+    @property
+    def stale(self) -> list[Chapter]:
+        return [*self.new, *self.changed]
+
+
+class BookManifest(ABC):
+    """What was saved for one book, keyed by chapter url."""
+
+    @abstractmethod
+    def entries(self) -> Mapping[str, ManifestEntry]: ...
+
+    @abstractmethod
+    def update(self, url: str, entry: ManifestEntry) -> None: ...
+
+    @abstractmethod
+    async def save(self) -> None: ...
+
+
+def content_hash(loaded_chapter: LoadedChapter) -> str:
+    digest = hashlib.sha256(loaded_chapter.title.encode())
+    for paragraph in loaded_chapter.paragraphs:
+        digest.update(b"\0")
+        digest.update(paragraph.encode())
+    for image in loaded_chapter.images:
+        digest.update(b"\0")
+        # known without reading a spooled image back from its file
+        digest.update(bytes.fromhex(image.digest))
+    return digest.hexdigest()
+
+
+def diff_catalog(
+    entries: Mapping[str, ManifestEntry], chapters: Sequence[Chapter]
+) -> CatalogDiff:
+    """Split a fresh catalog into new, renamed and known chapters.
+
+    A catalog only has the url and name of each chapter, so a chapter counts
+    as changed when it was renamed; an edit under the same name is not seen
+    without fetching the chapter again. The content hash comes in once a
+    chapter is fetched, ``record_saved`` compares it with the recorded one.
+    """
+    new: list[Chapter] = []
+    changed: list[Chapter] = []
+    unchanged: list[Chapter] = []
+    for chapter in chapters:
+        entry = entries.get(str(chapter.url))
+        if entry is None:
+            new.append(chapter)
+        elif entry.name != chapter.name:
+            changed.append(chapter)
+        else:
+            unchanged.append(chapter)
+    return CatalogDiff(new=new, changed=changed, unchanged=unchanged)
+
+
+def record_saved(
+    manifest: BookManifest, saver: Saver, loaded_chapter: LoadedChapter
+) -> bool:
+    """Update the manifest entry of a saved chapter.
+
+    Returns whether the content differs from the previously recorded one.
+    """
+    url = str(loaded_chapter.url)
+    previous = manifest.entries().get(url)
+    entry = ManifestEntry(
+        name=loaded_chapter.name,
+        content_hash=content_hash(loaded_chapter),
+        output=saver.output_location(loaded_chapter),
+    )
+    manifest.update(url, entry)
+    return previous is None or previous.content_hash != entry.content_hash
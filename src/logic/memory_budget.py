@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+
+from logic.saver import Saver
+
+
+@dataclass
+class MemoryBudget:
+    """Account bytes buffered by the pipeline and hold back fetching above a limit.
+
+    ``used`` counts the bytes charged for chapters between their load and the
+    hand-off to the saver. The savers open under ``holding`` add what they
+    still keep in memory, such as the pages of a book written on exit. While
+    the budget is exceeded new fetches wait, but one fetch is always allowed
+    so data retained by a saver cannot stall the run.
+    """
+
+    limit: int | None = None
+    used: int = 0
+    high_water: int = 0
+    _active: int = 0
+    _room: asyncio.Event = field(default_factory=asyncio.Event)
+    _savers: list[Saver] = field(default_factory=list[Saver])
+
+    @property
+    def held(self) -> int:
+        return sum(i.held_nbytes() for i in self._savers)
+
+    @property
+    def total(self) -> int:
+        return self.used + self.held
+
+    @property
+    def exceeded(self) -> bool:
+        return self.limit is not None and self.total >= self.limit
+
+    def holding(self, saver: Saver) -> SaverHold:
+        return SaverHold(self, saver)
+
+    def slot(self) -> BudgetSlot:
+        return BudgetSlot(self)
+
+    async def enter_slot(self) -> None:
+        while self.exceeded and self._active > 0:
+            self._room.clear()
+            await self._room.wait()
+        self._active += 1
+
+    def leave_slot(self) -> None:
+        self._active -= 1
+        self._room.set()
+
+    def charge(self, nbytes: int) -> None:
+        self.used += nbytes
+        self.high_water = max(self.high_water, self.total)
+
+    def release(self, nbytes: int) -> None:
+        self.used = max(0, self.used - nbytes)
+        # the saver may hold the released bytes by now
+        self.high_water = max(self.high_water, self.total)
+        if not self.exceeded:
+            self._room.set()
+
+    def add_saver(self, saver: Saver) -> None:
+        self._savers.append(saver)
+
+    def remove_saver(self, saver: Saver) -> None:
+        self._savers.remove(saver)
+        if not self.exceeded:
+            self._room.set()
+
+
+@dataclass
+class BudgetSlot:
+    """Hold one fetch of the budget for the duration of the block."""
+
+    budget: MemoryBudget
+
+    async def __aenter__(self) -> None:
+        await self.budget.enter_slot()
+
+    async def __aexit__(self, *_: object) -> None:
+        self.budget.leave_slot()
+
+
+@dataclass
+class SaverHold:
+    """Count the bytes the saver keeps in memory against the budget in the block."""
+
+    budget: MemoryBudget
+    saver: Saver
+
+    def __enter__(self) -> None:
+        self.budget.add_saver(self.saver)
+
+    def __exit__(self, *_: object) -> None:
+        self.budget.remove_saver(self.saver)
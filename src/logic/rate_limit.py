@@ -0,0 +1,47 @@
+import asyncio
+from dataclasses import dataclass, field
+
+from aiolimiter import AsyncLimiter
+from yarl import URL
+
+
+@dataclass
+class HostLimiter:
+    """Rate limit requests per host, shared by every book of the process.
+
+    Waiters of ``AsyncLimiter`` are served in arrival order, so books that
+    download from the same host take turns instead of one starving another.
+    """
+
+    max_rate: float
+    time_period: float
+    _limiters: dict[str, AsyncLimiter] = field(default_factory=dict[str, AsyncLimiter])
+
+    def for_host(self, host: str | None) -> AsyncLimiter:
+        key = host or ""
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limiter = AsyncLimiter(self.max_rate, self.time_period)
+            self._limiters[key] = limiter
+        return limiter
+
+    def for_url(self, url: URL) -> AsyncLimiter:
+        return self.for_host(url.host)
+
+
+@dataclass
+class HostConcurrency:
+    """Cap the requests in flight per host, shared by every book of the process."""
+
+    limit: int
+    _semaphores: dict[str, asyncio.Semaphore] = field(
+        default_factory=dict[str, asyncio.Semaphore]
+    )
+
+    def for_url(self, url: URL) -> asyncio.Semaphore:
+        key = url.host or ""
+        semaphore = self._semaphores.get(key)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.limit)
+            self._semaphores[key] = semaphore
+        return semaphore
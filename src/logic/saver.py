@@ -1,8 +1,9 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from pathlib import Path
 from types import TracebackType
 
-from domain import LoadedChapter, SaverContext
+from domain import Chapter, LoadedChapter, SaverContext
 
 
 @dataclass()
@@ -10,6 +11,7 @@ class Saver(ABC):
     context: SaverContext
 
     def __enter__(self) -> "Saver":
+        self.context.directory.mkdir(parents=True, exist_ok=True)
         return self
 
     @abstractmethod
@@ -22,3 +24,15 @@ class Saver(ABC):
 
     @abstractmethod
     async def save_chapter(self, loaded_chapter: LoadedChapter) -> None: ...
+
+    def held_nbytes(self) -> int:
+        """Bytes of saved chapters the saver still keeps in memory."""
+        return 0
+
+    def output_location(self, chapter: Chapter) -> str:
+        """Where the saved chapter ends up, recorded in the book manifest."""
+        return str(self.context.directory)
+
+    def artifact(self) -> Path:
+        """File or directory holding the whole saved book."""
+        return self.context.directory
@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+import asyncio
+from dataclasses import dataclass, field
 from datetime import timedelta
 
 import tenacity
@@ -10,9 +11,13 @@ from tenacity import (
     wait_fixed,
 )
 
-from domain import Chapter
-from logic.exceptions.base import RetryableError
+from domain import Chapter, LoadedChapter
+from logic.deadline import DeadlineScope, check_deadline
+from logic.exceptions.base import DeadlineExceededError, RetryableError
+from logic.journal import ChapterJournal
 from logic.loader import ChapterLoader
+from logic.manifest import BookManifest, record_saved
+from logic.memory_budget import MemoryBudget
 from logic.saver import Saver
 
 
@@ -20,9 +25,34 @@ from logic.saver import Saver
 class SaverLoaderConnector:
     saver: Saver
     chapter_loader: ChapterLoader
+    chapter_deadline: float | None = None
+    memory_budget: MemoryBudget = field(default_factory=MemoryBudget)
+    journal: ChapterJournal | None = None
+    manifest: BookManifest | None = None
+    deferred: list[Chapter] = field(default_factory=list[Chapter])
 
     async def handle(self, chapter: Chapter):
         logger.debug(f"working with {chapter.base_name}")
+        with DeadlineScope(self.chapter_deadline) as deadline:
+            if deadline is not None and deadline.expired:
+                self._defer(chapter)
+                return
+            when = deadline.when if deadline is not None else None
+            try:
+                async with asyncio.timeout_at(when) as timeout:
+                    await self._load_and_save(chapter)
+            except TimeoutError:
+                if not timeout.expired():
+                    raise
+                self._defer(chapter)
+            except DeadlineExceededError:
+                self._defer(chapter)
+
+    def _defer(self, chapter: Chapter) -> None:
+        logger.warning(f"deadline exceeded, defer {chapter.base_name}")
+        self.deferred.append(chapter)
+
+    async def _load_and_save(self, chapter: Chapter) -> None:
         async for attempt in AsyncRetrying(
             stop=stop_after_attempt(10),
             wait=wait_chain(
@@ -39,11 +69,32 @@ class SaverLoaderConnector:
                 attempt_number = attempt.retry_state.attempt_number
                 logger.info(f"[Try {attempt_number}] loading {chapter.base_name}")
                 try:
-                    loaded_chapter = await self.chapter_loader.load_chapter(chapter)
-                    await self.saver.save_chapter(loaded_chapter)
+                    async with self.memory_budget.slot():
+                        await self._load_and_save_once(chapter)
                 except Exception as e:
                     logger.warning(
                         f"⚠️ Ошибка при обработке {chapter.base_name}: {e!r} "
                         f"(попытка {attempt.retry_state.attempt_number})"
                     )
                     raise
+
+    async def _load_and_save_once(self, chapter: Chapter) -> None:
+        loaded_chapter = await self.chapter_loader.load_chapter(chapter)
+        await self.store(loaded_chapter)
+
+    async def store(self, loaded_chapter: LoadedChapter) -> None:
+        """Save a loaded chapter and record it in the journal and manifest."""
+        nbytes = loaded_chapter.nbytes
+        self.memory_budget.charge(nbytes)
+        try:
+            check_deadline(f"saving {loaded_chapter.base_name}")
+            await self.saver.save_chapter(loaded_chapter)
+        finally:
+            # from here on the saver accounts for what it keeps
+            self.memory_budget.release(nbytes)
+        if self.journal is not None:
+            await self.journal.record(loaded_chapter)
+        if self.manifest is not None and not record_saved(
+            self.manifest, self.saver, loaded_chapter
+        ):
+            logger.info(f"content of {loaded_chapter.base_name} did not change")
@@ -0,0 +1,123 @@
+import hashlib
+import random
+from abc import ABC, abstractmethod
+from array import array
+from collections.abc import Iterable, Sequence
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+
+from yarl import URL
+
+from domain import Chapter
+
+
+def url_digest(url: URL) -> int:
+    digest = hashlib.blake2b(str(url).encode(), digest_size=8).digest()
+    return int.from_bytes(digest)
+
+
+@dataclass(eq=False)
+class SeenIndex:
+    """Set of 64-bit digests of the chapter urls already handed to the downloader."""
+
+    digests: set[int] = field(default_factory=set[int])
+
+    def __contains__(self, url: URL) -> bool:
+        return url_digest(url) in self.digests
+
+    def __len__(self) -> int:
+        return len(self.digests)
+
+    def add(self, urls: Iterable[URL]) -> None:
+        self.digests.update(url_digest(i) for i in urls)
+
+    def unseen(self, chapters: Sequence[Chapter]) -> list[Chapter]:
+        """Return the chapters appended to the catalog since the last poll.
+
+        Catalogs grow at the end, so the walk stops at the first known chapter
+        and costs O(new) instead of O(catalog).
+        """
+        new: list[Chapter] = []
+        for chapter in reversed(chapters):
+            if chapter.url in self:
+                break
+            new.append(chapter)
+        new.reverse()
+        return new
+
+    def to_bytes(self) -> bytes:
+        return array("Q", sorted(self.digests)).tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "SeenIndex":
+        digests = array("Q")
+        digests.frombytes(data[: len(data) - len(data) % digests.itemsize])
+        return cls(set(digests))
+
+
+@dataclass(frozen=True, slots=True)
+class Validators:
+    """Cache validators of a main page, sent back as a conditional request."""
+
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+_current_revalidation: ContextVar["RevalidationScope | None"] = ContextVar(
+    "current_revalidation", default=None
+)
+
+
+def current_revalidation(url: URL) -> "RevalidationScope | None":
+    """Scope revalidating ``url``, when a request for it is made inside one."""
+    scope = _current_revalidation.get()
+    if scope is not None and scope.url == url:
+        return scope
+    return None
+
+
+@dataclass
+class RevalidationScope:
+    """Make the request for ``url`` inside the block conditional on ``validators``.
+
+    The page is loaded by that request: a ``304`` answer raises
+    ``PageNotModifiedError``, any other keeps its validators in ``received``.
+    Without validators the request is a plain one.
+    """
+
+    url: URL
+    validators: Validators
+    received: Validators = field(default_factory=Validators)
+    _token: Token["RevalidationScope | None"] | None = None
+
+    def __enter__(self) -> "RevalidationScope":
+        self._token = _current_revalidation.set(self)
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        assert self._token is not None
+        _current_revalidation.reset(self._token)
+
+
+class WatchState(ABC):
+    """Seen index and main page validators of one watched book."""
+
+    @abstractmethod
+    def load(self) -> tuple[SeenIndex, Validators]: ...
+
+    @abstractmethod
+    async def save(self, seen: SeenIndex, validators: Validators) -> None: ...
+
+
+def jittered(interval: float, jitter: float, rng: random.Random | None = None) -> float:
+    """Spread polls of books sharing an interval over ``interval * (1 ± jitter)``."""
+    uniform = rng.uniform if rng is not None else random.uniform
+    return interval * uniform(1 - jitter, 1 + jitter)
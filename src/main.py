@@ -1,70 +1,151 @@
 import asyncio
 import contextlib
-from collections.abc import Awaitable
-from itertools import batched
+import os
+import sys
+from collections.abc import Awaitable, Callable
 
-from aiolimiter import AsyncLimiter
+from dependency_injector import providers
 from dependency_injector.wiring import Provide, inject
 from loguru import logger
-from tqdm import tqdm
+from yarl import URL
 
 from config import Settings
-from containers import Container, LoaderService
-from domain import SaverContext
-from logic import ChapterLoader, MainPageLoader, SaverLoaderConnector
+from containers import Container, LoaderService, init_settings
+from daemon import DownloadDaemon, JobRequest
+from downloader import BookDownloader, BookWatcher
+from infra.jobs import JobServer, SqliteJobQueue
+from infra.main_page.document import ParserBackendScope
+from logic import ChapterJournal
+from logic.manifest import BookManifest
+from logic.memory_budget import MemoryBudget
+from logic.rate_limit import HostLimiter
+from logic.watch import WatchState
+from replay import replay_archives
 from utils import (
     change_working_directory,
-    trim,
+    get_loop_factory,
 )
-
-
-@logger.catch
-async def run(
-    args: Settings,
-    main_page_loader: MainPageLoader,
-    chapter_loader: ChapterLoader,
-    limiter: AsyncLimiter,
-):
-    main_page = await main_page_loader.load()
-    trimmed_chapters = trim(args.trim_args, main_page.chapters)
-    saver_context = SaverContext(
-        title=main_page.title, language="ru", covers=main_page.covers
-    )
-    progress = tqdm(total=len(trimmed_chapters))
-
-    with args.saver(saver_context) as saver:
-        connector = SaverLoaderConnector(saver, chapter_loader)
-        for chunked in batched(trimmed_chapters, n=args.chunk_size):
-            async with asyncio.TaskGroup() as tg:
-                for chapter in chunked:
-                    async with limiter:
-                        tg.create_task(connector.handle(chapter))
-            progress.update(len(chunked))
+from worker import WorkerPool
 
 
 @inject
 async def main(
     args: Settings = Provide[Container.settings],
-    limiter: AsyncLimiter = Provide[Container.limiter],
+    limiter: HostLimiter = Provide[Container.limiter],
     loader_service: LoaderService = Provide[Container.loader_service],
+    memory_budget: MemoryBudget = Provide[Container.memory_budget],
+    journal_factory: Callable[[URL], ChapterJournal] = Provide[
+        Container.journal_factory.provider
+    ],
+    manifest_factory: Callable[[URL], BookManifest] = Provide[
+        Container.manifest_factory.provider
+    ],
+    watch_state_factory: Callable[[URL], WatchState] = Provide[
+        Container.watch_state_factory.provider
+    ],
 ):
     logger.debug("run")
     change_working_directory(args.working_directory)
-    loader = loader_service.get(args.url)
-    chapter_loader = loader.get_loader_for_chapter()
-    await run(args, loader, chapter_loader, limiter=limiter)
+    if args.replay:
+        await replay_archives(args)
+        return
+    downloader = BookDownloader(
+        args,
+        loader_service,
+        limiter,
+        memory_budget,
+        journal_factory,
+        manifest_factory,
+    )
+    server = None
+    if args.workers or args.job_server is not None:
+        args.state_directory.mkdir(parents=True, exist_ok=True)
+        path = args.state_directory.resolve() / f"jobs-{os.getpid()}.sqlite3"
+        queue = SqliteJobQueue(path)
+        downloader.workers = WorkerPool(
+            queue, args, args.workers, remote=args.job_server is not None
+        )
+        downloader.workers.start()
+        if args.job_server is not None:
+            token = args.job_server.token.get_secret_value()
+            server = JobServer(
+                queue,
+                args.limiter,
+                token,
+                chapter_deadline=args.deadline.chapter,
+                lease=args.job_server.lease,
+            )
+            url = await server.start(args.job_server.host, args.job_server.port)
+            logger.info(f"job server listens on {url}")
+            # printed once, logs outlive the terminal and keep no secrets
+            print(
+                f"start workers with: python src/worker.py {url} --token {token}",
+                file=sys.stderr,
+            )
+    try:
+        await run_books(args, downloader, watch_state_factory)
+    except BaseException:
+        if downloader.workers is not None:
+            downloader.workers.terminate()
+        raise
+    else:
+        if downloader.workers is not None:
+            await downloader.workers.join()
+    finally:
+        if server is not None:
+            await server.stop()
+        if downloader.workers is not None:
+            downloader.workers.remove_database()
+    logger.info(f"memory high-water mark: {memory_budget.high_water / 2**20:.1f} MiB")
     logger.info("done")
 
 
-async def middleware():
+async def run_books(
+    args: Settings,
+    downloader: BookDownloader,
+    watch_state_factory: Callable[[URL], WatchState],
+) -> None:
+    books = asyncio.Semaphore(args.parallel_books)
+    # a url given twice is one book
+    urls = list(dict.fromkeys(args.urls))
+    book_directory = len(urls) > 1
+    if args.daemon is not None:
+        daemon = DownloadDaemon(downloader, books)
+        for url in urls:
+            daemon.submit(JobRequest(url=str(url)))
+        await daemon.serve(args.daemon.host, args.daemon.port)
+        return
+    if args.watch is not None:
+        watcher = BookWatcher(
+            args.watch,
+            downloader,
+            watch_state_factory,
+            books,
+            book_directory=book_directory,
+        )
+        await watcher.watch(urls)
+        return
+
+    async def download(url: URL) -> None:
+        async with books:
+            await downloader.download(url, book_directory=book_directory)
+
+    async with asyncio.TaskGroup() as tg:
+        for url in urls:
+            tg.create_task(download(url))
+
+
+async def middleware(settings: Settings):
     logger.debug("start")
     container = Container()
+    container.settings.override(providers.Object(settings))
     c = container.init_resources()
     if isinstance(c, Awaitable):
         await c
     try:
         container.wire(modules=[__name__])
-        await main()
+        with ParserBackendScope(settings.parser):
+            await main()
     finally:
         shutdown = container.shutdown_resources()
         if isinstance(shutdown, Awaitable):
@@ -72,8 +153,10 @@ async def middleware():
 
 
 def entrypoint() -> None:
+    settings = init_settings()
+    loop_factory = get_loop_factory(settings.event_loop)
     with contextlib.suppress(KeyboardInterrupt):
-        asyncio.run(middleware())
+        asyncio.run(middleware(settings), loop_factory=loop_factory)
 
 
 if __name__ == "__main__":
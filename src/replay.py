@@ -0,0 +1,101 @@
+import asyncio
+import contextlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import cast
+
+import aiohttp
+from dependency_injector import providers
+from loguru import logger
+
+from config import Settings
+from containers import LoaderService, init_image_loader
+from downloader import BookDownloader, BookStatus
+from infra.archive import ArchiveSession, WarcArchive
+from infra.journal import FileBookManifest, FileChapterJournal
+from infra.main_page.document import ParserBackendScope
+from logic import ImageLoader
+from logic.memory_budget import MemoryBudget
+from logic.rate_limit import HostLimiter
+from utils import get_loop_factory
+
+# nothing to protect offline, so the limiter only has to stay out of the way
+UNLIMITED_RATE = 10**9
+
+
+async def replay_archive(
+    path: Path, settings: Settings, book_directory: bool = False
+) -> BookStatus:
+    """Save the book recorded in a WARC archive, without network.
+
+    The archived responses go through the same loaders, parsers and saver as a
+    download. The journal is left alone, a replay always saves the whole book.
+    """
+    archive = WarcArchive.load(path)
+    logger.info(f"replay {archive.book_url} from {path}")
+    # answers every request the loaders make, in place of the HTTP session
+    session = cast(aiohttp.ClientSession, ArchiveSession(archive))
+    settings = settings.model_copy(
+        update={"journal": False, "update": False, "archive": None}
+    )
+    status = BookStatus()
+    # a resource like in the container, urls missing from the archive are not
+    # dead on the site
+    image_loaders = providers.Resource(
+        init_image_loader, session, settings.images, settings.transcode
+    )
+    image_loader: ImageLoader = await image_loaders.init()
+    try:
+        downloader = BookDownloader(
+            settings,
+            LoaderService(image_loader, session),
+            HostLimiter(UNLIMITED_RATE, 1),
+            MemoryBudget(settings.memory_budget),
+            partial(FileChapterJournal.for_book, root=settings.state_directory),
+            partial(FileBookManifest.for_book, root=settings.state_directory),
+        )
+        with ParserBackendScope(settings.parser):
+            await downloader.download_book(archive.book_url, book_directory, status)
+    finally:
+        await image_loaders.shutdown()
+    return status
+
+
+@logger.catch(default=None)
+def run_replay(path: Path, settings: Settings, book_directory: bool) -> Path | None:
+    """Entry point of a replay process, returning where the book was saved.
+
+    Failures are logged here, infra errors don't survive the trip back.
+    """
+    loop_factory = get_loop_factory(settings.event_loop)
+    with contextlib.suppress(KeyboardInterrupt):
+        status = asyncio.run(
+            replay_archive(path, settings, book_directory), loop_factory=loop_factory
+        )
+        return status.artifact
+    return None
+
+
+async def replay_archives(settings: Settings) -> None:
+    """Replay every archive of the settings, one process per book at a time."""
+    paths = settings.replay
+    size = min(len(paths), settings.workers or os.cpu_count() or 1)
+    book_directory = len(paths) > 1
+    logger.info(f"replay {len(paths)} archives in {size} processes")
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(
+        size, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        futures = [
+            loop.run_in_executor(pool, run_replay, i, settings, book_directory)
+            for i in paths
+        ]
+        results = await asyncio.gather(*futures, return_exceptions=True)
+    for path, result in zip(paths, results, strict=True):
+        if isinstance(result, BaseException):
+            logger.opt(exception=result).error(f"replay of {path} failed")
+        elif result is not None:
+            logger.info(f"replayed {path} into {result}")
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from .directroy import change_working_directory
+from .event_loop import get_loop_factory
 from .saver import get_all_saver_classes, get_saver_by_name
 from .trim import trim
 
@@ -9,4 +10,5 @@ __all__ = [
     "get_all_saver_classes",
     "get_saver_by_name",
     "change_working_directory",
+    "get_loop_factory",
 ]
@@ -1,21 +1,31 @@
 import aiohttp
 import fake_useragent as fa
 from aiohttp import ClientSession
-from bs4 import BeautifulSoup
 from yarl import URL
 
-from logic.exceptions.base import RetryableError
-
-
-async def get_soup(session: aiohttp.ClientSession, url: URL) -> BeautifulSoup:
-    html = await get_html(session, url)
-    return BeautifulSoup(html, "lxml")
+from logic.deadline import clamp_timeout
+from logic.exceptions.base import PageNotModifiedError, RetryableError
+from logic.watch import Validators, current_revalidation
 
 
 async def get_html(session: aiohttp.ClientSession, url: URL) -> str:
+    """Text of a page, requested conditionally inside a ``RevalidationScope``."""
+    revalidation = current_revalidation(url)
+    headers = get_headers()
+    if revalidation is not None:
+        headers |= revalidation.validators.headers()
     try:
-        async with session.get(url=url, headers=get_headers()) as r:
+        async with session.get(
+            url=url, headers=headers, timeout=get_timeout(session)
+        ) as r:
+            if revalidation is not None and r.status == 304:
+                raise PageNotModifiedError(page_url=str(url))
             r.raise_for_status()
+            if revalidation is not None:
+                revalidation.received = Validators(
+                    etag=r.headers.get("ETag"),
+                    last_modified=r.headers.get("Last-Modified"),
+                )
             return await r.text()
     except TimeoutError as e:
         raise RetryableError(exception=e) from e
@@ -30,10 +40,28 @@ def get_headers() -> dict[str, str]:
     }
 
 
+def get_timeout(
+    session: ClientSession, total: float | None = None
+) -> aiohttp.ClientTimeout:
+    if total is None:
+        total = session.timeout.total
+    return aiohttp.ClientTimeout(total=clamp_timeout(total))
+
+
 async def get_text_response(session: ClientSession, url: URL):
     try:
-        async with session.get(url) as r:
+        async with session.get(url, timeout=get_timeout(session)) as r:
             r.raise_for_status()
             return await r.text()
     except TimeoutError as e:
         raise RetryableError(exception=e) from e
+
+
+async def get_bytes_response(session: ClientSession, url: URL) -> bytes:
+    """Raw body, for JSON validated from bytes without decoding it to text."""
+    try:
+        async with session.get(url, timeout=get_timeout(session)) as r:
+            r.raise_for_status()
+            return await r.read()
+    except TimeoutError as e:
+        raise RetryableError(exception=e) from e
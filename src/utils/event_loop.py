@@ -0,0 +1,26 @@
+import asyncio
+from collections.abc import Callable
+
+from loguru import logger
+
+from .exceptions import EventLoopUnavailableError
+
+LoopFactory = Callable[[], asyncio.AbstractEventLoop]
+
+
+def get_loop_factory(name: str) -> LoopFactory | None:
+    """Return a loop factory for ``asyncio.run``; ``None`` keeps the default loop.
+
+    ``auto`` picks uvloop when it is installed, ``uvloop`` requires it.
+    """
+    if name == "asyncio":
+        return None
+    try:
+        import uvloop
+    except ImportError as exc:
+        if name == "uvloop":
+            raise EventLoopUnavailableError(loop_name=name) from exc
+        logger.debug("uvloop is not installed, fall back to asyncio loop")
+        return None
+    logger.debug("use uvloop event loop")
+    return uvloop.new_event_loop
@@ -8,7 +8,7 @@ from infra.exceptions.base import BaseInfraError
 from logic.exceptions.base import BaseAppError
 
 
-@dataclass(frozen=True, slots=True, kw_only=True)
+@dataclass(eq=False, slots=True, kw_only=True)
 class FzfError(BaseInfraError):
     placeholder: str
     raw_value: str | None = None
@@ -21,7 +21,7 @@ class FzfError(BaseInfraError):
         return base
 
 
-@dataclass(frozen=True, slots=True, kw_only=True)
+@dataclass(eq=False, slots=True, kw_only=True)
 class FindSaverError(BaseAppError):
     saver_name: str
     available_savers: Sequence[str] | None = None
@@ -36,10 +36,22 @@ class FindSaverError(BaseAppError):
         return f"Can't find saver with name {self.saver_name!r}.{available}"
 
 
-@dataclass(frozen=True, slots=True, kw_only=True)
+@dataclass(eq=False, slots=True, kw_only=True)
 class DirectoryPlaceTakenByFileError(BaseInfraError):
     path: Path
 
     @property
     def message(self) -> str:
         return f"{self.path} exists but is not a directory."
+
+
+@dataclass(eq=False, slots=True, kw_only=True)
+class EventLoopUnavailableError(BaseInfraError):
+    loop_name: str
+
+    @property
+    def message(self) -> str:
+        return (
+            f"Event loop {self.loop_name!r} is not available. "
+            "Install the 'speedups' extra to enable it."
+        )
@@ -0,0 +1,24 @@
+import os
+import shutil
+from pathlib import Path
+
+from domain import AnyLoadedImage, SpooledImage
+
+
+def link_file(source: Path, target: Path) -> None:
+    """Make target a hardlink of source, or a copy where links are impossible."""
+    target.unlink(missing_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+def write_image(image: AnyLoadedImage, path: Path) -> None:
+    """Write an image to path, linking the file of a spooled one to it."""
+    if isinstance(image, SpooledImage):
+        link_file(image.path, path)
+        return
+    # the file may be a link to an image that must stay as it is
+    path.unlink(missing_ok=True)
+    path.write_bytes(image.data)
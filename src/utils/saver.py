@@ -36,11 +36,13 @@ def inheritors(klass: type[SaverType]) -> set[type[SaverType]]:
 
 
 def get_all_saver_classes() -> Iterable[type[Saver]]:
-    return inheritors(Saver)
+    """Savers selectable with ``--saver``: the ones defined in ``infra.saver``."""
+    package = saver_pkg.__name__ + "."
+    return {i for i in inheritors(Saver) if i.__module__.startswith(package)}
 
 
 def get_saver_by_name(saver_name: str) -> type[Saver]:
-    saver_classes = inheritors(Saver)
+    saver_classes = get_all_saver_classes()
     all_savers = tuple(sorted(i.__name__ for i in saver_classes))
     for saver in saver_classes:
         if saver.__name__ == saver_name:
@@ -0,0 +1,214 @@
+import asyncio
+import contextlib
+import multiprocessing
+import os
+from collections.abc import Awaitable, Sequence
+from dataclasses import dataclass, field
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+
+import aiohttp
+from dependency_injector import providers
+from loguru import logger
+from tqdm import tqdm
+from yarl import URL
+
+from config import Settings
+from config.data import (
+    DeadlineSettings,
+    LimiterSettings,
+    RemoteWorkerSettings,
+    WorkerSettings,
+)
+from containers import Container
+from domain import Chapter
+from infra.console.worker_settings_provider import ConsoleWorkerSettingsProvider
+from infra.jobs import HttpJobSource, SqliteJobQueue
+from infra.main_page.document import ParserBackendScope
+from logic import SaverLoaderConnector
+from logic.exceptions.base import WorkersExitedError
+from logic.jobs import JobSource, JobWorker
+from logic.rate_limit import HostLimiter
+from utils import get_loop_factory
+
+
+async def serve(
+    source: JobSource, settings: WorkerSettings, owner: str, lease: float = 60.0
+) -> None:
+    container = Container()
+    container.settings.override(providers.Object(settings))
+    c = container.init_resources()
+    if isinstance(c, Awaitable):
+        await c
+    try:
+        loader_service = container.loader_service()
+        if isinstance(loader_service, Awaitable):
+            # the session is an async resource, so is everything built on it
+            loader_service = await loader_service
+        limiter: HostLimiter = container.limiter()
+        worker = JobWorker(
+            source,
+            owner,
+            lambda book: loader_service.get(book).get_loader_for_chapter(),
+            limiter,
+            chapter_deadline=settings.deadline.chapter,
+            concurrency=settings.chunk_size,
+            lease=lease,
+        )
+        with ParserBackendScope(settings.parser):
+            await worker.run()
+    finally:
+        shutdown = container.shutdown_resources()
+        if isinstance(shutdown, Awaitable):
+            await shutdown
+
+
+async def serve_local(path: Path, settings: WorkerSettings, owner: str) -> None:
+    queue = SqliteJobQueue(path)
+    try:
+        await serve(queue, settings, owner)
+    finally:
+        queue.disconnect()
+
+
+def run_worker(path: Path, settings: WorkerSettings, owner: str) -> None:
+    """Entry point of a worker process started by the coordinator."""
+    loop_factory = get_loop_factory(settings.event_loop)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve_local(path, settings, owner), loop_factory=loop_factory)
+
+
+async def serve_remote(settings: RemoteWorkerSettings) -> None:
+    async with aiohttp.ClientSession() as session:
+        source = HttpJobSource(
+            session, settings.coordinator, settings.token.get_secret_value()
+        )
+        budget = await source.register(settings.name)
+        logger.info(f"joined {settings.coordinator} as {budget.owner}")
+        worker_settings = WorkerSettings(
+            session=settings.session,
+            limiter=budget.limiter,
+            deadline=DeadlineSettings(chapter=budget.chapter_deadline),
+            chunk_size=settings.concurrency,
+            event_loop=settings.event_loop,
+            parser=settings.parser,
+        )
+        await serve(source, worker_settings, budget.owner, lease=budget.lease)
+
+
+def remote_entrypoint() -> None:
+    """Entry point of a worker on another machine."""
+    settings = ConsoleWorkerSettingsProvider().get()
+    loop_factory = get_loop_factory(settings.event_loop)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve_remote(settings), loop_factory=loop_factory)
+
+
+@dataclass
+class WorkerPool:
+    """Worker processes loading the chapter jobs enqueued by the coordinator."""
+
+    queue: SqliteJobQueue
+    settings: Settings
+    size: int
+    remote: bool = False
+    poll_interval: float = 0.2
+    result_batch: int = 16
+    _processes: dict[str, BaseProcess] = field(default_factory=dict[str, BaseProcess])
+    _spawned: int = 0
+
+    @property
+    def max_spawns(self) -> int:
+        return self.size * 4
+
+    def start(self) -> None:
+        if self.size:
+            logger.info(f"start {self.size} workers on {self.queue.path}")
+        for _ in range(self.size):
+            self._spawn()
+
+    def _spawn(self) -> None:
+        self._spawned += 1
+        owner = f"{os.getpid()}-{self._spawned}"
+        # every worker gets an equal share of the rate limit of the run
+        limiter = LimiterSettings(
+            max_rate=self.settings.limiter.max_rate / self.size,
+            time_period=self.settings.limiter.time_period,
+        )
+        settings = WorkerSettings(
+            session=self.settings.session,
+            limiter=limiter,
+            deadline=self.settings.deadline,
+            chunk_size=self.settings.chunk_size,
+            state_directory=self.settings.state_directory,
+            images=self.settings.images,
+            transcode=self.settings.transcode,
+            event_loop=self.settings.event_loop,
+            parser=self.settings.parser,
+        )
+        process = multiprocessing.get_context("spawn").Process(
+            target=run_worker,
+            args=(self.queue.path, settings, owner),
+            name=f"worker-{owner}",
+            daemon=True,
+        )
+        process.start()
+        self._processes[owner] = process
+
+    async def reap(self, book: URL) -> None:
+        """Release the leases of crashed workers and replace them."""
+        for owner, process in list(self._processes.items()):
+            if process.is_alive():
+                continue
+            del self._processes[owner]
+            released = await self.queue.release(owner)
+            logger.warning(
+                f"worker {owner} exited with code {process.exitcode}, "
+                f"{released} jobs released"
+            )
+            if self._spawned < self.max_spawns:
+                self._spawn()
+        if not self._processes and not self.remote:
+            raise WorkersExitedError(outstanding=await self.queue.outstanding(book))
+
+    async def collect(
+        self,
+        book: URL,
+        chapters: Sequence[Chapter],
+        connector: SaverLoaderConnector,
+        progress: tqdm,
+    ) -> None:
+        """Enqueue the chapters of a book and store what the workers load."""
+        await self.queue.enqueue(book, chapters)
+        while await self.queue.outstanding(book):
+            results = await self.queue.take_results(book, self.result_batch)
+            if not results:
+                await self.reap(book)
+                await asyncio.sleep(self.poll_interval)
+                continue
+            for result in results:
+                if result.loaded_chapter is None:
+                    logger.warning(f"{result.job.chapter.base_name}: {result.error}")
+                    connector.deferred.append(result.job.chapter)
+                else:
+                    await connector.store(result.loaded_chapter)
+                progress.update(1)
+
+    async def join(self) -> None:
+        await self.queue.close()
+        for process in self._processes.values():
+            await asyncio.to_thread(process.join)
+        self.queue.disconnect()
+
+    def terminate(self) -> None:
+        for process in self._processes.values():
+            process.terminate()
+        self.queue.disconnect()
+
+    def remove_database(self) -> None:
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{self.queue.path}{suffix}").unlink(missing_ok=True)
+
+
+if __name__ == "__main__":
+    remote_entrypoint()
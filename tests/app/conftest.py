@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+from yarl import URL
+
+from containers import FindLoaderException
+from domain import Chapter, LoadedChapter, MainPageInfo
+from logic import ChapterLoader, MainPageLoader
+
+
+class FakeChapterLoader(ChapterLoader):
+    delay: float = 0
+
+    async def load_chapter(self, chapter: Chapter) -> LoadedChapter:
+        await asyncio.sleep(self.delay)
+        return LoadedChapter(
+            id=chapter.id,
+            name=chapter.name,
+            url=chapter.url,
+            paragraphs=[f"text {chapter.id}"],
+            images=[],
+            title=chapter.name,
+        )
+
+
+class FakeMainPageLoader(MainPageLoader):
+    async def load(self) -> MainPageInfo:
+        chapters = [Chapter(i, f"Chapter {i}", self.url / str(i)) for i in range(1, 4)]
+        return MainPageInfo(chapters=chapters, title=self.url.name, covers=[])
+
+    def get_loader_for_chapter(self) -> ChapterLoader:
+        loader = FakeChapterLoader(self.session)
+        loader.delay = 10 if self.url.name == "slow" else 0
+        return loader
+
+
+class FakeLoaderService:
+    def get(self, url: URL) -> MainPageLoader:
+        if url.host != "e.com":
+            raise FindLoaderException(url)
+        return FakeMainPageLoader(url, None, None)  # type: ignore[arg-type]
+
+
+@pytest.fixture
+def loader_service() -> FakeLoaderService:
+    return FakeLoaderService()
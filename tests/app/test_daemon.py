@@ -0,0 +1,124 @@
+import asyncio
+import zipfile
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+from yarl import URL
+
+import main
+from config import Settings, TrimSettings
+from config.data import DaemonSettings, LimiterSettings
+from containers import LoaderService
+from daemon import DownloadDaemon
+from downloader import BookDownloader
+from infra.journal import FileBookManifest, FileChapterJournal
+from infra.saver import FilesSaver
+from logic.memory_budget import MemoryBudget
+from logic.rate_limit import HostLimiter
+
+
+@pytest.fixture
+def daemon(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, loader_service: LoaderService
+) -> DownloadDaemon:
+    monkeypatch.chdir(tmp_path)
+    args = Settings(
+        trim_args=TrimSettings(from_=0, to=100, interactive=False),
+        saver=FilesSaver,
+        limiter=LimiterSettings(max_rate=100, time_period=1),
+    )
+    root = tmp_path / "state"
+    downloader = BookDownloader(
+        args,
+        loader_service,
+        HostLimiter(100, 1),
+        MemoryBudget(),
+        lambda url: FileChapterJournal.for_book(url, root),
+        lambda url: FileBookManifest.for_book(url, root),
+    )
+    return DownloadDaemon(downloader, asyncio.Semaphore(2))
+
+
+async def wait_for(client: TestClient, job_id: str, state: str) -> dict:
+    for _ in range(100):
+        response = await client.get(f"/jobs/{job_id}")
+        job = await response.json()
+        if job["state"] == state:
+            return job
+        await asyncio.sleep(0.02)
+    raise AssertionError(job)
+
+
+@pytest.mark.asyncio
+async def test_daemon_runs_job_and_serves_artifact(daemon: DownloadDaemon) -> None:
+    async with TestClient(TestServer(daemon.application())) as client:
+        response = await client.post("/jobs", json={"url": "http://e.com/book"})
+        assert response.status == 201
+        job = await wait_for(client, (await response.json())["id"], "done")
+        assert (job["title"], job["done"], job["total"]) == ("book", 3, 3)
+
+        response = await client.get(f"/jobs/{job['id']}/artifact")
+        assert response.status == 200
+        archive = zipfile.ZipFile(BytesIO(await response.read()))
+        assert sorted(archive.namelist()) == [
+            "1. Chapter 1.txt",
+            "2. Chapter 2.txt",
+            "3. Chapter 3.txt",
+        ]
+
+
+@pytest.mark.asyncio
+async def test_daemon_cancels_job(daemon: DownloadDaemon) -> None:
+    async with TestClient(TestServer(daemon.application())) as client:
+        response = await client.post("/jobs", json={"url": "http://e.com/slow"})
+        job_id = (await response.json())["id"]
+        await wait_for(client, job_id, "running")
+
+        response = await client.delete(f"/jobs/{job_id}")
+        assert response.status == 202
+        await wait_for(client, job_id, "cancelled")
+        assert (await client.get(f"/jobs/{job_id}/artifact")).status == 409
+
+
+@pytest.mark.asyncio
+async def test_daemon_rejects_unknown_site(daemon: DownloadDaemon) -> None:
+    async with TestClient(TestServer(daemon.application())) as client:
+        response = await client.post("/jobs", json={"url": "http://other.com/book"})
+        assert response.status == 400
+        assert (await client.get("/jobs")).status == 200
+        assert await (await client.get("/jobs")).json() == []
+
+
+@pytest.mark.asyncio
+async def test_daemon_refuses_a_book_already_downloading(
+    daemon: DownloadDaemon,
+) -> None:
+    async with TestClient(TestServer(daemon.application())) as client:
+        slow = {"url": "http://e.com/slow"}
+        assert (await client.post("/jobs", json=slow)).status == 201
+        response = await client.post("/jobs", json=slow)
+        assert response.status == 409
+        assert len(await (await client.get("/jobs")).json()) == 1
+
+
+@pytest.mark.asyncio
+async def test_urls_given_twice_start_one_job(
+    daemon: DownloadDaemon, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    submitted: list[URL] = []
+
+    async def serve(self: DownloadDaemon, host: str, port: int) -> None:
+        submitted.extend(i.url for i in self.jobs.values())
+        await self._cancel_all(self.application())
+
+    monkeypatch.setattr(DownloadDaemon, "serve", serve)
+    url = URL("http://e.com/slow")
+    args = daemon.downloader.args.model_copy(
+        update={"urls": [url, url], "daemon": DaemonSettings()}
+    )
+
+    await main.run_books(args, daemon.downloader, lambda url: None)  # type: ignore
+
+    assert submitted == [url]
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+import pytest
+
+from containers import LoaderService
+from infra.saver import FilesSaver
+from library import RequestsU, default_settings
+from logic.exceptions.base import ClientClosedError
+
+
+@pytest.fixture
+def client(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, loader_service: LoaderService
+) -> RequestsU:
+    monkeypatch.setattr(LoaderService, "get", lambda _, url: loader_service.get(url))
+    return RequestsU(default_settings(working_directory=tmp_path / "books"))
+
+
+@pytest.mark.asyncio
+async def test_library_downloads_books_into_working_directory(
+    client: RequestsU, tmp_path: Path
+) -> None:
+    cwd = Path.cwd()
+    async with client:
+        first = await client.download("http://e.com/first", saver=FilesSaver)
+        second = await client.download("http://e.com/second", to=2)
+
+    assert Path.cwd() == cwd
+    assert first.artifact == tmp_path / "books" / "first"
+    assert sorted(i.name for i in first.artifact.iterdir()) == [
+        "1. Chapter 1.txt",
+        "2. Chapter 2.txt",
+        "3. Chapter 3.txt",
+    ]
+    assert second.artifact is not None and second.artifact.suffix == ".epub"
+    assert second.artifact.is_file()
+    assert (tmp_path / "books" / ".requests_u" / "journals").is_dir()
+
+
+@pytest.mark.asyncio
+async def test_library_streams_chapters_in_order(client: RequestsU) -> None:
+    async with client:
+        chapters = [i async for i in client.stream("http://e.com/book", from_=1)]
+
+    assert [i.id for i in chapters] == [2, 3]
+    assert chapters[0].paragraphs == ["text 2"]
+    with pytest.raises(ClientClosedError):
+        await client.download("http://e.com/book")
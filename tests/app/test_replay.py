@@ -0,0 +1,55 @@
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+from loguru import logger
+from yarl import URL
+
+import replay
+from config import Settings, TrimSettings
+from config.data import LimiterSettings
+from downloader import BookDownloader
+from infra.archive import WarcWriter
+from infra.main_page.exceptions import MainPageParsingError
+from infra.saver import FilesSaver
+
+BOOK = URL("https://tl.rulate.ru/book/1")
+
+
+async def fail(*_: object) -> None:
+    raise MainPageParsingError(detail="no title", page_url=BOOK)
+
+
+def test_replay_logs_the_error_of_the_download(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "book.warc.gz"
+    with WarcWriter(path, BOOK) as writer:
+        writer.write_response(BOOK, 200, "OK", {}, b"<html></html>")
+    closed: list[bool] = []
+
+    async def image_loader(*_: object) -> AsyncIterator[object]:
+        try:
+            yield object()
+        finally:
+            closed.append(True)
+
+    monkeypatch.setattr(replay, "init_image_loader", image_loader)
+    monkeypatch.setattr(BookDownloader, "download_book", fail)
+    messages: list[str] = []
+    sink = logger.add(messages.append, level="ERROR")
+    settings = Settings(
+        trim_args=TrimSettings(from_=0, to=100, interactive=False),
+        saver=FilesSaver,
+        limiter=LimiterSettings(max_rate=1, time_period=1),
+        state_directory=tmp_path / "state",
+    )
+
+    try:
+        assert replay.run_replay(path, settings, book_directory=False) is None
+    finally:
+        logger.remove(sink)
+
+    (message,) = messages
+    assert "MainPageParsingError" in message and "TypeError" not in message
+    assert closed == [True]
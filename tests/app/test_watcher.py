@@ -0,0 +1,75 @@
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+from yarl import URL
+
+from config.data import WatchSettings
+from domain import MainPageInfo
+from downloader import BookWatcher, WatchedBook
+from logic import ChapterLoader, MainPageLoader
+from logic.watch import SeenIndex, Validators, WatchState
+from utils.bs4 import get_html
+
+
+class PageLoader(MainPageLoader):
+    async def load(self) -> MainPageInfo:
+        await get_html(self.session, self.url)
+        return MainPageInfo(chapters=[], title="Book", covers=[])
+
+    def get_loader_for_chapter(self) -> ChapterLoader:
+        raise NotImplementedError
+
+
+class MemoryWatchState(WatchState):
+    def load(self) -> tuple[SeenIndex, Validators]:
+        return SeenIndex(), Validators()
+
+    async def save(self, seen: SeenIndex, validators: Validators) -> None:
+        pass
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("etag", "statuses"), [('"v1"', [200, 304, 304]), (None, [200, 200, 200])]
+)
+async def test_poll_loads_the_page_once(etag: str | None, statuses: list[int]) -> None:
+    answered: list[int] = []
+
+    async def page(request: web.Request) -> web.Response:
+        if etag is not None and request.headers.get("If-None-Match") == etag:
+            answered.append(304)
+            return web.Response(status=304)
+        answered.append(200)
+        headers = {"ETag": etag} if etag is not None else {}
+        return web.Response(text="<html></html>", headers=headers)
+
+    app = web.Application()
+    app.router.add_get("/book", page)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    url = URL(f"http://127.0.0.1:{runner.addresses[0][1]}/book")
+    watcher = BookWatcher(
+        WatchSettings(polls_per_minute=600),
+        None,  # type: ignore[arg-type]  # no new chapters to download
+        lambda url: MemoryWatchState(),
+        asyncio.Semaphore(1),
+    )
+    try:
+        async with aiohttp.ClientSession() as session:
+            book = WatchedBook(
+                PageLoader(url, None, session),  # type: ignore[arg-type]
+                MemoryWatchState(),
+                SeenIndex(),
+                Validators(),
+            )
+            for _ in statuses:
+                await watcher.poll(book)
+    finally:
+        await runner.cleanup()
+
+    assert answered == statuses
+    assert book.validators == Validators(etag=etag)
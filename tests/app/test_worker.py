@@ -0,0 +1,94 @@
+from pathlib import Path
+
+import pytest
+from tqdm import tqdm
+from yarl import URL
+
+import containers
+import worker
+from config import Settings, TrimSettings
+from config.data import LimiterSettings, WorkerSettings
+from domain import Chapter, LoadedChapter, MainPageInfo, SaverContext
+from infra.jobs import SqliteJobQueue
+from infra.saver import FilesSaver
+from logic import ChapterLoader, MainPageLoader, Saver, SaverLoaderConnector
+from logic.memory_budget import MemoryBudget
+
+BOOK = URL("http://e.com/book")
+
+
+class EchoChapterLoader(ChapterLoader):
+    async def load_chapter(self, chapter: Chapter) -> LoadedChapter:
+        return LoadedChapter(
+            id=chapter.id,
+            name=chapter.name,
+            url=chapter.url,
+            paragraphs=[f"text {chapter.id}"],
+            images=[],
+            title=chapter.name,
+        )
+
+
+class EchoMainPageLoader(MainPageLoader):
+    async def load(self) -> MainPageInfo:
+        raise NotImplementedError
+
+    def get_loader_for_chapter(self) -> ChapterLoader:
+        return EchoChapterLoader(self.session)
+
+
+def get_echo_loader(self: containers.LoaderService, url: URL) -> MainPageLoader:
+    assert isinstance(self, containers.LoaderService)
+    return EchoMainPageLoader(url, self.image_loader, self.session, self.limiter)
+
+
+def run_echo_worker(path: Path, settings: WorkerSettings, owner: str) -> None:
+    """Worker process with the real container, loading chapters offline."""
+    containers.LoaderService.get = get_echo_loader
+    worker.run_worker(path, settings, owner)
+
+
+class ListSaver(Saver):
+    def __init__(self) -> None:
+        super().__init__(SaverContext(title="t", language="ru", covers=[]))
+        self.saved: list[LoadedChapter] = []
+
+    def __exit__(self, *_) -> bool:
+        return True
+
+    async def save_chapter(self, loaded_chapter: LoadedChapter) -> None:
+        self.saved.append(loaded_chapter)
+
+
+@pytest.mark.asyncio
+async def test_pool_loads_chapters_in_spawned_workers(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(worker, "run_worker", run_echo_worker)
+    settings = Settings(
+        trim_args=TrimSettings(from_=0, to=100, interactive=False),
+        saver=FilesSaver,
+        limiter=LimiterSettings(max_rate=100, time_period=1),
+    )
+    pool = worker.WorkerPool(SqliteJobQueue(tmp_path / "jobs.sqlite3"), settings, 2)
+    saver = ListSaver()
+    connector = SaverLoaderConnector(
+        saver,
+        EchoChapterLoader(None),  # type: ignore[arg-type]
+        memory_budget=MemoryBudget(),
+    )
+    chapters = [Chapter(i, f"Chapter {i}", BOOK / str(i)) for i in range(1, 6)]
+
+    pool.start()
+    try:
+        with tqdm(total=len(chapters), disable=True) as progress:
+            await pool.collect(BOOK, chapters, connector, progress)
+        await pool.join()
+    except BaseException:
+        pool.terminate()
+        raise
+
+    assert connector.deferred == []
+    assert sorted(i.id for i in saver.saved) == [1, 2, 3, 4, 5]
+    assert all(i.paragraphs == [f"text {i.id}"] for i in saver.saved)
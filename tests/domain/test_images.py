@@ -18,3 +18,12 @@ def test_loaded_image_data():
         url=URL("http://example.com/image.jpg"), data=b"fake_image_data"
     )
     assert loaded_image.data == b"fake_image_data"
+
+
+def test_loaded_image_digest_depends_on_content_only():
+    first = LoadedImage(url=URL("http://a.com/logo.png"), data=b"logo")
+    second = LoadedImage(url=URL("http://b.com/banner.png"), data=b"logo")
+    other = LoadedImage(url=URL("http://a.com/logo.png"), data=b"other")
+
+    assert first.digest == second.digest
+    assert first.digest != other.digest
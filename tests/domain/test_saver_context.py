@@ -15,3 +15,9 @@ def test_saver_context():
     assert saver_context.language == "English"
     assert saver_context.covers[0].url == URL("http://example.com/image.jpg")
     assert saver_context.author == "nikmosi"
+
+
+def test_saver_context_file_stem():
+    saver_context = SaverContext(title="Book: part 1/2?", language="ru", covers=[])
+
+    assert saver_context.file_stem == "Book:_part_1:2"
@@ -0,0 +1,101 @@
+from pathlib import Path
+
+import aiohttp
+import pytest
+from aiohttp import web
+from yarl import URL
+
+from infra.archive import (
+    ArchiveRecorder,
+    ArchiveSession,
+    RecordingScope,
+    WarcArchive,
+    WarcWriter,
+    archive_name,
+)
+from infra.archive.exceptions import WarcFormatError
+
+BOOK = URL("https://e.com/book/1")
+
+
+def test_archive_reads_back_written_responses(tmp_path: Path) -> None:
+    path = tmp_path / "book.warc.gz"
+    chapter = URL("https://e.com/книга/глава")
+    with WarcWriter(path, BOOK) as writer:
+        writer.write_response(
+            BOOK, 200, "OK", {"Content-Encoding": "gzip"}, b"<html>main</html>"
+        )
+        writer.write_response(chapter, 200, "OK", {}, "текст".encode())
+
+    archive = WarcArchive.load(path)
+
+    assert writer.count == 2
+    assert archive.book_url == BOOK
+    assert archive.responses[BOOK].body == b"<html>main</html>"
+    assert "Content-Encoding" not in archive.responses[BOOK].headers
+    assert archive.responses[BOOK].headers["Content-Length"] == "17"
+    assert archive.responses[chapter].body.decode() == "текст"
+
+
+def test_archive_without_warcinfo_is_rejected(tmp_path: Path) -> None:
+    path = tmp_path / "empty.warc.gz"
+    path.write_bytes(b"")
+
+    with pytest.raises(WarcFormatError):
+        WarcArchive.load(path)
+
+
+def test_archive_name_is_derived_from_the_book_url() -> None:
+    assert archive_name(BOOK) == "e.com_book_1.warc.gz"
+
+
+@pytest.mark.asyncio
+async def test_session_follows_redirects_and_misses_with_404(tmp_path: Path) -> None:
+    path = tmp_path / "book.warc.gz"
+    with WarcWriter(path, BOOK) as writer:
+        writer.write_response(BOOK, 301, "Moved", {"Location": "/book/2"}, b"")
+        writer.write_response(
+            URL("https://e.com/book/2"),
+            200,
+            "OK",
+            {"Content-Type": "text/html; charset=windows-1251"},
+            "глава".encode("cp1251"),
+        )
+    session = ArchiveSession(WarcArchive.load(path))
+
+    async with session.get(BOOK) as response:
+        assert response.url == URL("https://e.com/book/2")
+        assert await response.text() == "глава"
+    async with session.get("https://e.com/missing") as response:
+        assert response.status == 404
+        with pytest.raises(aiohttp.ClientResponseError):
+            response.raise_for_status()
+
+
+@pytest.mark.asyncio
+async def test_recorder_archives_responses_inside_the_scope(tmp_path: Path) -> None:
+    async def page(request: web.Request) -> web.Response:
+        return web.Response(text=f"page {request.match_info['id']}")
+
+    app = web.Application()
+    app.router.add_get("/{id}", page)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    path = tmp_path / "book.warc.gz"
+    try:
+        async with aiohttp.ClientSession(middlewares=(ArchiveRecorder(),)) as session:
+            writer = WarcWriter(path, BOOK)
+            with writer, RecordingScope(writer):
+                async with session.get(f"http://127.0.0.1:{port}/1") as response:
+                    assert await response.text() == "page 1"
+            async with session.get(f"http://127.0.0.1:{port}/2") as response:
+                await response.read()
+    finally:
+        await runner.cleanup()
+
+    archive = WarcArchive.load(path)
+
+    assert [i.body for i in archive.responses.values()] == [b"page 1"]
@@ -0,0 +1,39 @@
+import pytest
+
+from infra.console.settings_provider import ConsoleSettingsProvider
+
+
+def parse(monkeypatch: pytest.MonkeyPatch, *argv: str):
+    monkeypatch.setattr("sys.argv", ["main.py", "http://e.com/book", *argv])
+    return ConsoleSettingsProvider().get()
+
+
+def test_job_server_listens_on_loopback_with_a_token(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    settings = parse(monkeypatch, "--serve-jobs", "8701")
+
+    assert settings.job_server is not None
+    assert (settings.job_server.host, settings.job_server.port) == ("127.0.0.1", 8701)
+    assert len(settings.job_server.token.get_secret_value()) >= 16
+    remote = parse(monkeypatch, "--serve-jobs", "0.0.0.0:8701").job_server
+    assert remote is not None and remote.host == "0.0.0.0"
+
+
+def test_given_jobs_token_is_used(monkeypatch: pytest.MonkeyPatch) -> None:
+    token = "a-token-of-sixteen-chars"
+    settings = parse(monkeypatch, "--serve-jobs", "8701", "--jobs-token", token)
+
+    assert settings.job_server is not None
+    assert settings.job_server.token.get_secret_value() == token
+
+
+@pytest.mark.parametrize("address", ["host:", "eighty", "127.0.0.1:80x"])
+def test_bad_address_is_a_usage_error(
+    monkeypatch: pytest.MonkeyPatch, address: str, capsys: pytest.CaptureFixture[str]
+) -> None:
+    with pytest.raises(SystemExit) as exited:
+        parse(monkeypatch, "--serve-jobs", address)
+
+    assert exited.value.code == 2
+    assert "expected [HOST:]PORT" in capsys.readouterr().err
@@ -0,0 +1,180 @@
+import asyncio
+import multiprocessing
+import sys
+from pathlib import Path
+
+import aiohttp
+import pytest
+from yarl import URL
+
+import containers
+import worker
+from config.data import LimiterSettings
+from domain import Chapter, LoadedChapter, LoadedImage
+from infra.jobs import HttpJobSource, JobServer, SqliteJobQueue
+from infra.jobs.http import chapter_from_json, chapter_to_json
+from logic import ChapterLoader, MainPageLoader
+from logic.jobs import JobWorker
+from logic.rate_limit import HostLimiter
+
+BOOK = URL("http://e.com/book")
+TOKEN = "s3cret-token-of-the-run"
+
+
+def make_chapters(count: int) -> list[Chapter]:
+    return [
+        Chapter(i, f"Chapter {i}", URL(f"http://e.com/{i}"))
+        for i in range(1, count + 1)
+    ]
+
+
+def load(chapter: Chapter) -> LoadedChapter:
+    return LoadedChapter(
+        id=chapter.id,
+        name=chapter.name,
+        url=chapter.url,
+        paragraphs=[f"text {chapter.id}"],
+        images=[LoadedImage(url=URL("http://e.com/a.png"), data=b"\x89PNG")],
+        title=chapter.name,
+    )
+
+
+class FakeChapterLoader(ChapterLoader):
+    async def load_chapter(self, chapter: Chapter) -> LoadedChapter:
+        await asyncio.sleep(0)
+        return load(chapter)
+
+
+class FakeMainPageLoader(MainPageLoader):
+    async def load(self):
+        raise NotImplementedError
+
+    def get_loader_for_chapter(self) -> ChapterLoader:
+        return FakeChapterLoader(self.session)
+
+
+def get_fake_loader(self: containers.LoaderService, url: URL) -> MainPageLoader:
+    return FakeMainPageLoader(url, self.image_loader, self.session, self.limiter)
+
+
+def run_remote_worker(argv: list[str]) -> None:
+    """Remote worker process started from its command line, loading offline."""
+    containers.LoaderService.get = get_fake_loader
+    sys.argv = argv
+    worker.remote_entrypoint()
+
+
+def test_loaded_chapter_survives_json() -> None:
+    loaded = load(make_chapters(1)[0])
+
+    assert chapter_from_json(chapter_to_json(loaded)) == loaded
+
+
+@pytest.mark.asyncio
+async def test_remote_workers_drain_the_queue(tmp_path: Path) -> None:
+    queue = SqliteJobQueue(tmp_path / "jobs.sqlite3")
+    server = JobServer(queue, LimiterSettings(max_rate=1000, time_period=1), TOKEN)
+    url = await server.start("127.0.0.1", 0)
+    await queue.enqueue(BOOK, make_chapters(20))
+    await queue.close()
+
+    async with aiohttp.ClientSession() as session:
+        workers: list[JobWorker] = []
+        for name in ("a", "b"):
+            source = HttpJobSource(session, url, TOKEN)
+            budget = await source.register(name)
+            workers.append(
+                JobWorker(
+                    source,
+                    budget.owner,
+                    lambda book: FakeChapterLoader(None),  # type: ignore[arg-type]
+                    HostLimiter(budget.limiter.max_rate, budget.limiter.time_period),
+                    concurrency=3,
+                    poll_interval=0.01,
+                )
+            )
+        await asyncio.gather(*(i.run() for i in workers))
+
+    results = await queue.take_results(BOOK, limit=100)
+    assert sorted(i.job.chapter.id for i in results) == list(range(1, 21))
+    assert all(i.loaded_chapter == load(i.job.chapter) for i in results)
+    await server.stop()
+    queue.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_silent_worker_loses_its_jobs(tmp_path: Path) -> None:
+    queue = SqliteJobQueue(tmp_path / "jobs.sqlite3")
+    server = JobServer(
+        queue, LimiterSettings(max_rate=1, time_period=1), TOKEN, lease=0.2
+    )
+    url = await server.start("127.0.0.1", 0)
+    (chapter,) = make_chapters(1)
+    await queue.enqueue(BOOK, [chapter])
+
+    async with aiohttp.ClientSession() as session:
+        source = HttpJobSource(session, url, TOKEN)
+        silent = (await source.register("silent")).owner
+        alive = (await source.register("alive")).owner
+        job = await source.claim(silent, lease=0.2)
+        assert job is not None
+
+        await asyncio.sleep(0.5)
+        reassigned = await source.claim(alive, lease=0.2)
+        assert reassigned is not None and reassigned.id == job.id
+
+        await source.complete(job, silent, load(chapter))
+        await source.complete(reassigned, alive, load(chapter))
+        await source.complete(reassigned, alive, load(chapter))
+
+    results = await queue.take_results(BOOK, limit=10)
+    assert len(results) == 1
+    await server.stop()
+    queue.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_requests_without_the_token_are_refused(tmp_path: Path) -> None:
+    queue = SqliteJobQueue(tmp_path / "jobs.sqlite3")
+    server = JobServer(queue, LimiterSettings(max_rate=1, time_period=1), TOKEN)
+    url = await server.start("127.0.0.1", 0)
+    await queue.enqueue(BOOK, make_chapters(1))
+
+    async with aiohttp.ClientSession() as session:
+        for headers in ({}, {"Authorization": "Bearer wrong"}):
+            async with session.post(
+                url / "claim", json={"owner": "x"}, headers=headers
+            ) as r:
+                assert r.status == 401
+            async with session.get(url / "drained", headers=headers) as r:
+                assert r.status == 401
+
+    assert await queue.claim("y", lease=60) is not None
+    await server.stop()
+    queue.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_remote_worker_process_drains_the_queue(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    queue = SqliteJobQueue(tmp_path / "jobs.sqlite3")
+    server = JobServer(queue, LimiterSettings(max_rate=1000, time_period=1), TOKEN)
+    url = await server.start("127.0.0.1", 0)
+    await queue.enqueue(BOOK, make_chapters(5))
+    await queue.close()
+
+    process = multiprocessing.get_context("spawn").Process(
+        target=run_remote_worker,
+        args=(["worker.py", str(url), "--token", TOKEN, "--name", "box"],),
+    )
+    process.start()
+    await asyncio.to_thread(process.join, 60)
+
+    assert process.exitcode == 0
+    results = await queue.take_results(BOOK, limit=10)
+    assert sorted(i.job.chapter.id for i in results) == [1, 2, 3, 4, 5]
+    assert all(i.loaded_chapter == load(i.job.chapter) for i in results)
+    await server.stop()
+    queue.disconnect()
@@ -0,0 +1,127 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+from yarl import URL
+
+from domain import Chapter, LoadedChapter
+from infra.jobs import SqliteJobQueue
+from logic import ChapterLoader
+from logic.jobs import JobWorker
+from logic.rate_limit import HostLimiter
+
+BOOK = URL("http://e.com/book")
+
+
+def make_chapters(count: int) -> list[Chapter]:
+    return [
+        Chapter(i, f"Chapter {i}", URL(f"http://e.com/{i}"))
+        for i in range(1, count + 1)
+    ]
+
+
+def load(chapter: Chapter) -> LoadedChapter:
+    return LoadedChapter(
+        id=chapter.id,
+        name=chapter.name,
+        url=chapter.url,
+        paragraphs=[f"text {chapter.id}"],
+        images=[],
+        title=chapter.name,
+    )
+
+
+class FakeChapterLoader(ChapterLoader):
+    async def load_chapter(self, chapter: Chapter) -> LoadedChapter:
+        await asyncio.sleep(0)
+        return load(chapter)
+
+
+@pytest.mark.asyncio
+async def test_queue_hands_out_each_job_once(tmp_path: Path) -> None:
+    queue = SqliteJobQueue(tmp_path / "jobs.sqlite3")
+    await queue.enqueue(BOOK, make_chapters(2))
+
+    first = await queue.claim("a", lease=60)
+    second = await queue.claim("b", lease=60)
+
+    assert first is not None and second is not None
+    assert {first.chapter.id, second.chapter.id} == {1, 2}
+    assert await queue.claim("c", lease=60) is None
+    assert await queue.outstanding(BOOK) == 2
+
+    await queue.complete(first, "a", load(first.chapter))
+    await queue.fail(second, "b", "boom")
+    results = await queue.take_results(BOOK, limit=10)
+
+    assert {i.job.chapter.id: i.error for i in results} == {
+        first.chapter.id: None,
+        second.chapter.id: "boom",
+    }
+    assert [i.loaded_chapter for i in results if i.error is None] == [
+        load(first.chapter)
+    ]
+    assert await queue.outstanding(BOOK) == 0
+    queue.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_reclaimed_and_late_result_dropped(
+    tmp_path: Path,
+) -> None:
+    queue = SqliteJobQueue(tmp_path / "jobs.sqlite3")
+    (chapter,) = make_chapters(1)
+    await queue.enqueue(BOOK, [chapter])
+
+    crashed = await queue.claim("crashed", lease=-1)
+    reclaimed = await queue.claim("alive", lease=60)
+    assert crashed is not None and reclaimed is not None
+    assert reclaimed.id == crashed.id
+
+    await queue.complete(crashed, "crashed", load(chapter))
+    assert await queue.take_results(BOOK, limit=10) == []
+
+    await queue.complete(reclaimed, "alive", load(chapter))
+    assert len(await queue.take_results(BOOK, limit=10)) == 1
+    queue.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_release_returns_jobs_of_dead_worker(tmp_path: Path) -> None:
+    queue = SqliteJobQueue(tmp_path / "jobs.sqlite3")
+    await queue.enqueue(BOOK, make_chapters(1))
+    await queue.claim("dead", lease=60)
+
+    assert await queue.release("dead") == 1
+    assert await queue.claim("alive", lease=60) is not None
+    queue.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_workers_drain_the_queue(tmp_path: Path) -> None:
+    path = tmp_path / "jobs.sqlite3"
+    queue = SqliteJobQueue(path)
+    chapters = make_chapters(20)
+    await queue.enqueue(BOOK, chapters)
+    await queue.close()
+    workers = [
+        JobWorker(
+            SqliteJobQueue(path),
+            owner,
+            lambda book: FakeChapterLoader(None),  # type: ignore[arg-type]
+            HostLimiter(1000, 1),
+            concurrency=3,
+            poll_interval=0.01,
+        )
+        for owner in ("a", "b")
+    ]
+
+    await asyncio.gather(*(i.run() for i in workers))
+
+    results = await queue.take_results(BOOK, limit=100)
+    assert sorted(i.job.chapter.id for i in results) == list(range(1, 21))
+    assert all(i.loaded_chapter is not None for i in results)
+    for worker in workers:
+        assert isinstance(worker.queue, SqliteJobQueue)
+        worker.queue.disconnect()
+    queue.disconnect()
@@ -0,0 +1,109 @@
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+from yarl import URL
+
+from domain import Chapter, LoadedChapter, LoadedImage, SaverContext
+from infra.journal import FileChapterJournal
+from logic import Saver
+from logic.journal import restore_from_journal
+
+
+class ListSaver(Saver):
+    def __init__(self) -> None:
+        super().__init__(SaverContext(title="t", language="ru", covers=[]))
+        self.saved: list[LoadedChapter] = []
+
+    def __exit__(self, *_) -> bool:
+        return True
+
+    async def save_chapter(self, loaded_chapter: LoadedChapter) -> None:
+        self.saved.append(loaded_chapter)
+
+
+def make_loaded(index: int) -> LoadedChapter:
+    return LoadedChapter(
+        id=index,
+        name=f"Chapter {index}",
+        url=URL(f"http://example.com/{index}"),
+        paragraphs=["Первый", "Second"],
+        images=[LoadedImage(url=URL("http://example.com/a.png"), data=b"png")],
+        title=f"Title {index}",
+    )
+
+
+@pytest.mark.asyncio
+async def test_journal_round_trip(tmp_path: Path) -> None:
+    journal = FileChapterJournal.for_book(URL("http://example.com/book"), tmp_path)
+    await journal.record(make_loaded(1))
+    await journal.record(make_loaded(2))
+
+    reopened = FileChapterJournal.for_book(URL("http://example.com/book"), tmp_path)
+    replayed = [i async for i in reopened.replay()]
+
+    expected = [make_loaded(1), make_loaded(2)]
+    # images come back file-backed, read from the journal when saved
+    assert [replace(i, images=()) for i in replayed] == [
+        replace(i, images=()) for i in expected
+    ]
+    assert [[(j.url, j.data) for j in i.images] for i in replayed] == [
+        [(j.url, j.data) for j in i.images] for i in expected
+    ]
+    assert len(list(journal.images_directory.iterdir())) == 1
+
+
+@pytest.mark.asyncio
+async def test_journal_survives_truncated_record(tmp_path: Path) -> None:
+    journal = FileChapterJournal(tmp_path)
+    await journal.record(make_loaded(1))
+    with journal.path.open("a") as f:
+        f.write('{"id": 2, "na')
+
+    reopened = FileChapterJournal(tmp_path)
+    await reopened.record(make_loaded(3))
+
+    assert [i.id async for i in reopened.replay()] == [1, 3]
+
+
+@pytest.mark.asyncio
+async def test_restore_skips_completed_chapters(tmp_path: Path) -> None:
+    journal = FileChapterJournal(tmp_path)
+    await journal.record(make_loaded(2))
+    chapters = [
+        Chapter(id=1, name="New", url=URL("http://example.com/0")),
+        Chapter(id=2, name="Renamed", url=URL("http://example.com/2")),
+    ]
+    saver = ListSaver()
+
+    pending = await restore_from_journal(journal, saver, chapters)
+
+    assert pending == {chapters[0]}
+    assert [(i.id, i.name) for i in saver.saved] == [(2, "Renamed")]
+
+
+@pytest.mark.asyncio
+async def test_prune_keeps_latest_records_of_the_catalog(tmp_path: Path) -> None:
+    journal = FileChapterJournal(tmp_path)
+    await journal.record(make_loaded(1))
+    await journal.record(make_loaded(2))
+    edited = replace(
+        make_loaded(1),
+        images=[LoadedImage(url=URL("http://example.com/b.png"), data=b"new")],
+    )
+    await journal.record(edited)
+    removed = replace(
+        make_loaded(3),
+        images=[LoadedImage(url=URL("http://example.com/c.png"), data=b"gone")],
+    )
+    await journal.record(removed)
+
+    await journal.prune({"http://example.com/1", "http://example.com/2"})
+
+    replayed = [i async for i in FileChapterJournal(tmp_path).replay()]
+    assert [i.id for i in replayed] == [2, 1]
+    assert [j.data for i in replayed for j in i.images] == [b"png", b"new"]
+    assert len(journal.path.read_text().splitlines()) == 2
+    assert len(list(journal.images_directory.iterdir())) == 2
+    await journal.record(make_loaded(4))
+    assert [i.id async for i in journal.replay()] == [2, 1, 4]
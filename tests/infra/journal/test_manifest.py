@@ -0,0 +1,76 @@
+import hashlib
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+from yarl import URL
+
+from domain import Chapter, LoadedChapter, LoadedImage, SaverContext, SpooledImage
+from infra.journal import FileBookManifest
+from infra.saver import FilesSaver
+from logic.manifest import ManifestEntry, content_hash, diff_catalog, record_saved
+
+
+def make_chapter(index: int, name: str | None = None) -> Chapter:
+    return Chapter(
+        id=index, name=name or f"Chapter {index}", url=URL(f"http://e.com/{index}")
+    )
+
+
+def make_loaded(chapter: Chapter, text: str) -> LoadedChapter:
+    return LoadedChapter(
+        id=chapter.id,
+        name=chapter.name,
+        url=chapter.url,
+        paragraphs=[text],
+        images=[],
+        title="Title",
+    )
+
+
+def test_diff_catalog_splits_new_changed_and_unchanged() -> None:
+    entries = {
+        "http://e.com/1": ManifestEntry("Chapter 1", "h1", "out"),
+        "http://e.com/2": ManifestEntry("Old name", "h2", "out"),
+    }
+    chapters = [make_chapter(1), make_chapter(2), make_chapter(3)]
+
+    diff = diff_catalog(entries, chapters)
+
+    assert diff.unchanged == [chapters[0]]
+    assert diff.changed == [chapters[1]]
+    assert diff.new == [chapters[2]]
+    assert diff.stale == [chapters[2], chapters[1]]
+
+
+@pytest.mark.asyncio
+async def test_manifest_records_hash_and_location(tmp_path: Path) -> None:
+    manifest = FileBookManifest.for_book(URL("http://e.com/book"), tmp_path)
+    saver = FilesSaver(SaverContext(title="Book", language="ru", covers=[]))
+    loaded = make_loaded(make_chapter(1), "text")
+
+    assert record_saved(manifest, saver, loaded)
+    assert not record_saved(manifest, saver, loaded)
+    assert record_saved(manifest, saver, make_loaded(make_chapter(1), "edited"))
+    await manifest.save()
+
+    reopened = FileBookManifest.for_book(URL("http://e.com/book"), tmp_path)
+    entry = reopened.entries()["http://e.com/1"]
+    assert entry.output == "1. Chapter 1.txt"
+    assert entry.content_hash == content_hash(make_loaded(make_chapter(1), "edited"))
+
+
+def test_spooled_image_is_hashed_without_reading_it(tmp_path: Path) -> None:
+    url = URL("http://e.com/a.png")
+    data = b"\x89PNG" * 100
+    loaded = make_loaded(make_chapter(1), "text")
+    in_memory = replace(loaded, images=[LoadedImage(url=url, data=data)])
+    # the spool file is gone, the hash comes from the digest taken while spooling
+    spooled = SpooledImage(
+        url=url,
+        path=tmp_path / "missing",
+        size=len(data),
+        digest=hashlib.sha256(data).hexdigest(),
+    )
+
+    assert content_hash(replace(loaded, images=[spooled])) == content_hash(in_memory)
@@ -0,0 +1,22 @@
+from pathlib import Path
+
+import pytest
+from yarl import URL
+
+from infra.journal import FileWatchState
+from logic.watch import SeenIndex, Validators
+
+
+@pytest.mark.asyncio
+async def test_watch_state_round_trip(tmp_path: Path) -> None:
+    url = URL("http://e.com/book")
+    state = FileWatchState.for_book(url, tmp_path)
+    seen = SeenIndex()
+    seen.add([URL("http://e.com/1"), URL("http://e.com/2")])
+
+    assert state.load()[0].digests == set()
+    await state.save(seen, Validators(etag='"v1"'))
+
+    restored_seen, validators = FileWatchState.for_book(url, tmp_path).load()
+    assert restored_seen.digests == seen.digests
+    assert validators == Validators(etag='"v1"')
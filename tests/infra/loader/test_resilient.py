@@ -0,0 +1,119 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import aiohttp
+import pytest
+import pytest_asyncio
+from aiohttp import web
+from yarl import URL
+
+from config.data import ImageSettings
+from domain import Image, LoadedImage
+from infra.journal import FileDeadUrls
+from infra.loader import ResilientImageLoader
+from infra.loader.magic import image_format
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 32
+SETTINGS = ImageSettings(timeout=5, attempts=3, backoff=0, per_host=2)
+
+
+class Site:
+    def __init__(self) -> None:
+        self.requests: dict[str, int] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def handle(self, request: web.Request) -> web.Response:
+        name = request.match_info["name"]
+        self.requests[name] = self.requests.get(name, 0) + 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.02)
+        finally:
+            self.in_flight -= 1
+        match name:
+            case "flaky.png" if self.requests[name] < 3:
+                return web.Response(status=503)
+            case "gone.png":
+                return web.Response(status=404)
+            case "page.png":
+                return web.Response(text="<html>hotlinking</html>")
+        return web.Response(body=PNG, content_type="image/png")
+
+
+@pytest_asyncio.fixture
+async def site() -> AsyncIterator[tuple[Site, URL]]:
+    site = Site()
+    app = web.Application()
+    app.router.add_get("/{name}", site.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    try:
+        yield site, URL(f"http://127.0.0.1:{runner.addresses[0][1]}")
+    finally:
+        await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried(site: tuple[Site, URL]) -> None:
+    server, base = site
+    async with aiohttp.ClientSession() as session:
+        loader = ResilientImageLoader(session, SETTINGS)
+        loaded = await loader.load_image(Image(base / "flaky.png"))
+
+    assert loaded == LoadedImage(url=base / "flaky.png", data=PNG)
+    assert server.requests["flaky.png"] == 3
+
+
+@pytest.mark.asyncio
+async def test_dead_urls_are_remembered(site: tuple[Site, URL], tmp_path: Path) -> None:
+    server, base = site
+    async with aiohttp.ClientSession() as session:
+        dead_urls = FileDeadUrls.for_state(tmp_path, ttl=3600)
+        loader = ResilientImageLoader(session, SETTINGS, dead_urls)
+        assert await loader.load_image(Image(base / "gone.png")) is None
+        assert await loader.load_image(Image(base / "gone.png")) is None
+        assert await loader.load_image(Image(base / "page.png")) is None
+
+    assert server.requests == {"gone.png": 1, "page.png": 1}
+    assert FileDeadUrls.for_state(tmp_path, ttl=3600).is_dead(base / "gone.png")
+    assert not dead_urls.is_dead(base / "page.png")
+
+
+@pytest.mark.asyncio
+async def test_expired_dead_urls_are_dropped(tmp_path: Path) -> None:
+    dead_urls = FileDeadUrls.for_state(tmp_path, ttl=-1)
+    await dead_urls.mark_dead(URL("http://e.com/a.png"), "404")
+
+    reopened = FileDeadUrls.for_state(tmp_path, ttl=3600)
+
+    assert not reopened.is_dead(URL("http://e.com/a.png"))
+    assert reopened.path.read_text() == ""
+
+
+@pytest.mark.asyncio
+async def test_requests_per_host_are_capped(site: tuple[Site, URL]) -> None:
+    server, base = site
+    async with aiohttp.ClientSession() as session:
+        loader = ResilientImageLoader(session, SETTINGS)
+        started = time.monotonic()
+        loaded = await asyncio.gather(
+            *(loader.load_image(Image(base / f"{i}.png")) for i in range(6))
+        )
+
+    assert all(i is not None for i in loaded)
+    assert server.max_in_flight == 2
+    assert time.monotonic() - started >= 0.06
+
+
+def test_image_format_tells_images_from_pages() -> None:
+    assert image_format(PNG) == "png"
+    assert image_format(b"\xff\xd8\xff\xe0\x00\x10JFIF") == "jpeg"
+    assert image_format(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == "webp"
+    assert image_format(b'<?xml version="1.0"?>\n<svg xmlns="...">') == "svg"
+    assert image_format(b"<!DOCTYPE html><html>") is None
+    assert image_format(b"") is None
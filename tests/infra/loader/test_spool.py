@@ -0,0 +1,84 @@
+import hashlib
+from pathlib import Path
+
+import aiohttp
+import pytest
+from aiohttp import web
+from ebooklib import ITEM_IMAGE, epub
+from yarl import URL
+
+from domain import Image, LoadedChapter, LoadedImage, SaverContext, SpooledImage
+from infra.loader import BasicImageLoader
+from infra.loader.spool import SpoolScope
+from infra.saver import EbookSaver, FilesSaver
+
+BODY = b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 1024
+
+
+async def serve_image() -> tuple[web.AppRunner, URL]:
+    async def image(request: web.Request) -> web.Response:
+        return web.Response(body=BODY, content_type="image/png")
+
+    app = web.Application()
+    app.router.add_get("/a.png", image)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, URL(f"http://127.0.0.1:{runner.addresses[0][1]}/a.png")
+
+
+@pytest.mark.asyncio
+async def test_loader_streams_images_to_the_spool(tmp_path: Path) -> None:
+    runner, url = await serve_image()
+    try:
+        async with aiohttp.ClientSession() as session:
+            loader = BasicImageLoader(session)
+            with SpoolScope(tmp_path) as spool:
+                spooled = await loader.load_image(Image(url))
+                assert isinstance(spooled, SpooledImage)
+                assert spooled.path.parent == spool
+                assert spooled.data == BODY
+            in_memory = await loader.load_image(Image(url))
+    finally:
+        await runner.cleanup()
+
+    assert spooled.digest == hashlib.sha256(BODY).hexdigest()
+    assert (spooled.size, spooled.nbytes) == (len(BODY), 0)
+    assert not spool.exists()
+    assert in_memory == LoadedImage(url=url, data=BODY)
+
+
+def spooled_chapter(tmp_path: Path) -> LoadedChapter:
+    path = tmp_path / "spooled"
+    path.write_bytes(BODY)
+    image = SpooledImage(
+        url=URL("http://e.com/a.png"),
+        path=path,
+        size=len(BODY),
+        digest=hashlib.sha256(BODY).hexdigest(),
+    )
+    return LoadedChapter(
+        id=1,
+        name="Chapter",
+        url=URL("http://e.com/1"),
+        paragraphs=["text"],
+        images=[image],
+        title="Chapter",
+    )
+
+
+@pytest.mark.asyncio
+async def test_savers_read_spooled_images(tmp_path: Path) -> None:
+    context = SaverContext(
+        title="Book", language="ru", covers=[], directory=tmp_path / "out"
+    )
+    with EbookSaver(context) as saver:
+        await saver.save_chapter(spooled_chapter(tmp_path))
+    with FilesSaver(context) as saver:
+        await saver.save_chapter(spooled_chapter(tmp_path))
+
+    book = epub.read_epub(str(tmp_path / "out" / "Book.epub"))  # type: ignore
+    (image,) = book.get_items_of_type(ITEM_IMAGE)  # type: ignore
+    assert image.get_content() == BODY  # type: ignore
+    assert (tmp_path / "out" / "1. Chapter_1.png").read_bytes() == BODY
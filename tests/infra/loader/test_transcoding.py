@@ -0,0 +1,136 @@
+import hashlib
+import io
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from yarl import URL
+
+from config.data import TRANSCODE_PROFILES, TranscodeSettings
+from domain import AnyLoadedImage, Image, LoadedImage, SpooledImage
+from infra.loader import TranscodingImageLoader, transcoding
+from infra.loader.transcoding import TranscodedImage, TranscodeReport, transcode
+from logic import ImageLoader
+
+IMAGE = Image(url=URL("http://e.com/art.png"))
+
+
+class FixedImageLoader(ImageLoader):
+    def __init__(self, data: bytes | None) -> None:
+        super().__init__(None)  # type: ignore[arg-type]
+        self.data = data
+
+    async def load_image(self, image: Image) -> LoadedImage | None:
+        if self.data is None:
+            return None
+        return LoadedImage(url=image.url, data=self.data)
+
+
+class SpooledImageLoader(ImageLoader):
+    def __init__(self, path: Path) -> None:
+        super().__init__(None)  # type: ignore[arg-type]
+        self.path = path
+
+    async def load_image(self, image: Image) -> AnyLoadedImage | None:
+        data = self.path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        return SpooledImage(
+            url=image.url, path=self.path, size=len(data), digest=digest
+        )
+
+
+def png(size: tuple[int, int], mode: str = "RGB") -> bytes:
+    pil = pytest.importorskip("PIL.Image")
+    output = io.BytesIO()
+    pil.new(mode, size, "red").save(output, "PNG")
+    return output.getvalue()
+
+
+def test_report_counts_kept_images_at_their_size() -> None:
+    report = TranscodeReport()
+
+    report.add(3 * 2**20, TranscodedImage(b"x" * 2**20, ".jpg", 0.5))
+    report.add(2**20, None)
+
+    assert report.summary == "transcoded 1 of 2 images in 0.5 s: 4.0 MiB -> 2.0 MiB"
+
+
+@pytest.mark.asyncio
+async def test_loader_renames_transcoded_images(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        transcoding,
+        "transcode",
+        lambda data, settings: TranscodedImage(data[:1], ".jpg", 0.0),
+    )
+    with ThreadPoolExecutor(1) as pool:
+        loader = TranscodingImageLoader(
+            FixedImageLoader(b"png"), TranscodeSettings(), pool
+        )
+        loaded = await loader.load_image(IMAGE)
+        missing = await TranscodingImageLoader(
+            FixedImageLoader(None), TranscodeSettings(), pool
+        ).load_image(IMAGE)
+
+    assert loaded == LoadedImage(url=URL("http://e.com/art.jpg"), data=b"p")
+    assert missing is None
+    assert loader.report.images == 1
+
+
+@pytest.mark.asyncio
+async def test_spooled_image_is_read_in_the_pool(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "spooled"
+    path.write_bytes(b"png")
+    received: list[bytes | Path] = []
+
+    def fake_transcode(
+        content: bytes | Path, settings: TranscodeSettings
+    ) -> TranscodedImage | None:
+        received.append(content)
+        return None
+
+    monkeypatch.setattr(transcoding, "transcode", fake_transcode)
+    with ThreadPoolExecutor(1) as pool:
+        loader = TranscodingImageLoader(
+            SpooledImageLoader(path), TranscodeSettings(), pool
+        )
+        loaded = await loader.load_image(IMAGE)
+
+    assert received == [path]
+    assert isinstance(loaded, SpooledImage) and loaded.path == path
+
+
+def test_transcode_reads_a_spool_file(tmp_path: Path) -> None:
+    path = tmp_path / "spooled"
+    path.write_bytes(png((4000, 3000), "RGBA"))
+
+    transcoded = transcode(path, TRANSCODE_PROFILES["ereader"])
+
+    assert transcoded is not None and transcoded.extension == ".jpg"
+
+
+def test_transcode_downscales_into_the_target_format() -> None:
+    settings = TRANSCODE_PROFILES["ereader"]
+
+    transcoded = transcode(png((4000, 3000), "RGBA"), settings)
+
+    assert transcoded is not None
+    assert transcoded.extension == ".jpg"
+    pil = pytest.importorskip("PIL.Image")
+    with pil.open(io.BytesIO(transcoded.data)) as result:
+        assert result.format == "JPEG"
+        assert result.size == (1264, 948)
+
+
+def test_transcode_keeps_pages_and_animations() -> None:
+    pil = pytest.importorskip("PIL.Image")
+    frames = [pil.new("L", (8, 8), i) for i in (0, 255)]
+    animation = io.BytesIO()
+    frames[0].save(animation, "GIF", save_all=True, append_images=frames[1:])
+    settings = TRANSCODE_PROFILES["ereader"]
+
+    assert transcode(b"<html>not found</html>", settings) is None
+    assert transcode(animation.getvalue(), settings) is None
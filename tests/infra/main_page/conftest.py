@@ -0,0 +1,16 @@
+from collections.abc import Callable
+
+import pytest
+
+from infra.main_page.document import PARSER_BACKENDS, Node, ParserBackend
+
+
+@pytest.fixture(params=sorted(PARSER_BACKENDS))
+def backend(request: pytest.FixtureRequest) -> ParserBackend:
+    return PARSER_BACKENDS[request.param]
+
+
+@pytest.fixture
+def parse(backend: ParserBackend) -> Callable[[str], Node]:
+    """Parse html with every backend, so site parsers behave the same on both."""
+    return backend.parse
@@ -0,0 +1,48 @@
+from yarl import URL
+
+from infra.main_page.document import ParserBackend, Region
+from infra.main_page.ranobes import RanobesChapterParser
+
+PAGE = """
+<html><head><script>var sidebar = 1;</script></head><body>
+<header><h1>Site</h1><div class="menu"><a href="/a">A</a></div></header>
+<div class="wrap"><div id="dle-content" class="story">
+    <h1>Chapter 1</h1><p>first</p><div class="note">inner</div><p>second</p>
+</div>tail</div>
+<!-- comment -->
+<footer><div class="note">footer note</div></footer>
+</body></html>
+"""
+
+
+def test_filtered_parse_keeps_only_outermost_regions(backend: ParserBackend) -> None:
+    regions = (Region("div", id="dle-content"), Region("div", class_="note"))
+
+    document = backend.parse(PAGE, regions)
+
+    assert [i.get("id") for i in document.find_all("div", id="dle-content")] == [
+        "dle-content"
+    ]
+    assert [i.text for i in document.find_all("div", class_="note")] == [
+        "inner",
+        "footer note",
+    ]
+    assert document.find("header") is None
+    assert document.find("div", class_="menu") is None
+    assert "tail" not in document.get_text()
+    assert "sidebar" not in document.get_text()
+
+
+def test_chapter_parser_reads_the_same_from_its_regions(
+    backend: ParserBackend,
+) -> None:
+    url = URL("https://ranobes.com/chapters/1")
+
+    full = RanobesChapterParser(backend.parse(PAGE), url).parse()
+    filtered = RanobesChapterParser(
+        backend.parse(PAGE, RanobesChapterParser.regions), url
+    ).parse()
+
+    assert filtered == full
+    assert filtered.title == "Chapter 1"
+    assert filtered.paragraphs == ["first", "second"]
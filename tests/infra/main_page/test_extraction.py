@@ -0,0 +1,77 @@
+from collections.abc import Callable
+
+import pytest
+from yarl import URL
+
+from infra.main_page.document import Node
+from infra.main_page.exceptions import MainPageParsingError
+from infra.main_page.extraction import Attr, Each, Exists, Record, Select, Text
+
+Parse = Callable[[str], Node]
+
+PAGE = """
+<html><body>
+<div class="book"><h1> Title </h1>
+    <ul>
+        <li class="row"><a href="/1">One</a></li>
+        <li class="row locked"><span class="lock"></span><a>Two</a></li>
+        <li class="row"><a href="/3">Three</a></li>
+    </ul>
+</div>
+</body></html>
+"""
+
+PLAN = Record(
+    path=Select("div", class_="book", detail="book missing"),
+    fields={
+        "title": Text(Select("h1", detail="title missing"), detail="title empty"),
+        "cover": Attr("src", Select("img")),
+        "chapters": Each(
+            Select("li", class_="row"),
+            Record(
+                path=Select("a", detail="row anchor missing"),
+                fields={"href": Attr("href", detail="href missing"), "name": Text()},
+            ),
+            where=(Exists(Select("span", class_="lock"), present=False),),
+        ),
+    },
+)
+
+
+def test_plan_reads_fields_of_a_page(parse: Parse) -> None:
+    assert PLAN.evaluate(parse(PAGE)) == {
+        "title": "Title",
+        "cover": None,
+        "chapters": [
+            {"href": "/1", "name": "One"},
+            {"href": "/3", "name": "Three"},
+        ],
+    }
+
+
+@pytest.mark.parametrize(
+    ("html", "detail"),
+    [
+        ("<div class='other'></div>", "book missing"),
+        ("<div class='book'><p>text</p></div>", "title missing"),
+        ("<div class='book'><h1> </h1></div>", "title empty"),
+        (
+            "<div class='book'><h1>T</h1><li class='row'>x</li></div>",
+            "row anchor missing",
+        ),
+        (
+            "<div class='book'><h1>T</h1><li class='row'><a>x</a></li></div>",
+            "href missing",
+        ),
+    ],
+)
+def test_plan_raises_detail_of_first_missing_field(
+    parse: Parse, html: str, detail: str
+) -> None:
+    url = URL("https://example.com/book")
+
+    with pytest.raises(MainPageParsingError) as exc:
+        PLAN.evaluate(parse(f"<html><body>{html}</body></html>"), url)
+
+    assert exc.value.detail == detail
+    assert exc.value.page_url == url
@@ -1,6 +1,8 @@
-from bs4 import BeautifulSoup
+from collections.abc import Callable
+
 from yarl import URL
 
+from infra.main_page.document import Node
 from infra.main_page.exceptions import (
     CaptchaDetectedError,
     ChapterAccessRestrictedError,
@@ -12,12 +14,10 @@ from infra.main_page.ifreedom import (
     IfreedomMainPageParser,
 )
 
-
-def make_soup(html: str) -> BeautifulSoup:
-    return BeautifulSoup(html, "lxml")
+Parse = Callable[[str], Node]
 
 
-def test_ifreedom_chapter_parser_collects_paragraphs() -> None:
+def test_ifreedom_chapter_parser_collects_paragraphs(parse: Parse) -> None:
     html = """
     <div class="block"><h1>Chapter title</h1></div>
     <div class="chapter-content">
@@ -25,7 +25,7 @@ def test_ifreedom_chapter_parser_collects_paragraphs() -> None:
         <p>  Second  </p>
     </div>
     """
-    parser = IfreedomChapterParser(make_soup(html), URL("https://ifreedom.su/ch/1"))
+    parser = IfreedomChapterParser(parse(html), URL("https://ifreedom.su/ch/1"))
 
     parsed = parser.parse()
 
@@ -33,13 +33,13 @@ def test_ifreedom_chapter_parser_collects_paragraphs() -> None:
     assert parsed.paragraphs == ["First", "  Second  "]
 
 
-def test_ifreedom_chapter_parser_detects_captcha() -> None:
+def test_ifreedom_chapter_parser_detects_captcha(parse: Parse) -> None:
     html = """
     <form class="wpcf7-form init"></form>
     <div class="block"><h1>Title</h1></div>
     <div class="chapter-content"><p>Paragraph</p></div>
     """
-    parser = IfreedomChapterParser(make_soup(html), URL("https://ifreedom.su/ch/1"))
+    parser = IfreedomChapterParser(parse(html), URL("https://ifreedom.su/ch/1"))
 
     try:
         parser.parse()
@@ -49,14 +49,14 @@ def test_ifreedom_chapter_parser_detects_captcha() -> None:
         raise AssertionError("CaptchaDetectedError was not raised")
 
 
-def test_ifreedom_chapter_parser_rejects_restricted_content() -> None:
+def test_ifreedom_chapter_parser_rejects_restricted_content(parse: Parse) -> None:
     html = """
     <div class="block"><h1>Title</h1></div>
     <div class="chapter-content">
         <div class="single-notice"></div>
     </div>
     """
-    parser = IfreedomChapterParser(make_soup(html), URL("https://ifreedom.su/ch/1"))
+    parser = IfreedomChapterParser(parse(html), URL("https://ifreedom.su/ch/1"))
 
     try:
         parser.parse()
@@ -66,12 +66,12 @@ def test_ifreedom_chapter_parser_rejects_restricted_content() -> None:
         raise AssertionError("ChapterAccessRestrictedError was not raised")
 
 
-def test_ifreedom_chapter_parser_requires_paragraphs() -> None:
+def test_ifreedom_chapter_parser_requires_paragraphs(parse: Parse) -> None:
     html = """
     <div class="block"><h1>Title</h1></div>
     <div class="chapter-content"></div>
     """
-    parser = IfreedomChapterParser(make_soup(html), URL("https://ifreedom.su/ch/1"))
+    parser = IfreedomChapterParser(parse(html), URL("https://ifreedom.su/ch/1"))
 
     try:
         parser.parse()
@@ -81,7 +81,7 @@ def test_ifreedom_chapter_parser_requires_paragraphs() -> None:
         raise AssertionError("EmptyChapterContentError was not raised")
 
 
-def test_ifreedom_main_page_parser_collects_chapters_and_cover() -> None:
+def test_ifreedom_main_page_parser_collects_chapters_and_cover(parse: Parse) -> None:
     html = """
     <div class="book-info"><h1>Novel</h1></div>
     <div class="book-img"><img src="https://example.com/cover.jpg"></div>
@@ -90,7 +90,7 @@ def test_ifreedom_main_page_parser_collects_chapters_and_cover() -> None:
         <div class="chapterinfo"><a href="https://ifreedom.su/2">B</a></div>
     </div>
     """
-    parser = IfreedomMainPageParser(make_soup(html), URL("https://ifreedom.su/book"))
+    parser = IfreedomMainPageParser(parse(html), URL("https://ifreedom.su/book"))
 
     parsed = parser.parse()
 
@@ -99,7 +99,7 @@ def test_ifreedom_main_page_parser_collects_chapters_and_cover() -> None:
     assert [chapter.name for chapter in parsed.chapters] == ["B", "A"]
 
 
-def test_ifreedom_main_page_parser_counts_skipped_links() -> None:
+def test_ifreedom_main_page_parser_counts_skipped_links(parse: Parse) -> None:
     html = """
     <div class="book-info"><h1>Novel</h1></div>
     <div class="book-img"><img src="https://example.com/cover.jpg"></div>
@@ -109,7 +109,7 @@ def test_ifreedom_main_page_parser_counts_skipped_links() -> None:
         <div class="chapterinfo"><a href="https://ifreedom.su/3">Free</a></div>
     </div>
     """
-    parser = IfreedomMainPageParser(make_soup(html), URL("https://ifreedom.su/book"))
+    parser = IfreedomMainPageParser(parse(html), URL("https://ifreedom.su/book"))
 
     parsed = parser.parse()
 
@@ -118,12 +118,12 @@ def test_ifreedom_main_page_parser_counts_skipped_links() -> None:
     assert len(parsed.chapters) == 1
 
 
-def test_ifreedom_main_page_parser_requires_tab_content() -> None:
+def test_ifreedom_main_page_parser_requires_tab_content(parse: Parse) -> None:
     html = """
     <div class="book-info"><h1>Novel</h1></div>
     <div class="book-img"><img src="https://example.com/cover.jpg"></div>
     """
-    parser = IfreedomMainPageParser(make_soup(html), URL("https://ifreedom.su/book"))
+    parser = IfreedomMainPageParser(parse(html), URL("https://ifreedom.su/book"))
 
     try:
         parser.parse()
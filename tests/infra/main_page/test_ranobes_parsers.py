@@ -1,6 +1,8 @@
-from bs4 import BeautifulSoup
+from collections.abc import Callable
+
 from yarl import URL
 
+from infra.main_page.document import Node
 from infra.main_page.exceptions import (
     EmptyChapterContentError,
     MainPageParsingError,
@@ -13,12 +15,10 @@ from infra.main_page.ranobes import (
     RanobesPaginationParser,
 )
 
-
-def make_soup(html: str) -> BeautifulSoup:
-    return BeautifulSoup(html, "lxml")
+Parse = Callable[[str], Node]
 
 
-def test_ranobes_main_page_parser_extracts_fields() -> None:
+def test_ranobes_main_page_parser_extracts_fields(parse: Parse) -> None:
     html = """
     <div class="r-fullstory-poster"><img src="/poster.jpg"></div>
     <div class="r-fullstory-chapters-foot">
@@ -26,7 +26,7 @@ def test_ranobes_main_page_parser_extracts_fields() -> None:
     </div>
     <h1 class="title">Sample</h1>
     """
-    parser = RanobesMainPageParser(make_soup(html), URL("https://ranobes.net/book"))
+    parser = RanobesMainPageParser(parse(html), URL("https://ranobes.net/book"))
 
     parsed = parser.parse()
 
@@ -35,13 +35,13 @@ def test_ranobes_main_page_parser_extracts_fields() -> None:
     assert parsed.chapter_page_url == URL("https://ranobes.net/chapters/2")
 
 
-def test_ranobes_main_page_parser_requires_cover() -> None:
+def test_ranobes_main_page_parser_requires_cover(parse: Parse) -> None:
     html = """
     <div class="r-fullstory-chapters-foot"><a href="first">
     <a href="/chapters/2" /></a></div>
     <h1 class="title">Sample</h1>
     """
-    parser = RanobesMainPageParser(make_soup(html), URL("https://ranobes.net/book"))
+    parser = RanobesMainPageParser(parse(html), URL("https://ranobes.net/book"))
 
     try:
         parser.parse()
@@ -51,7 +51,7 @@ def test_ranobes_main_page_parser_requires_cover() -> None:
         raise AssertionError("MainPageParsingError was not raised")
 
 
-def test_ranobes_pagination_parser_creates_urls() -> None:
+def test_ranobes_pagination_parser_creates_urls(parse: Parse) -> None:
     html = """
     <div class="pages">
         <a href="/chapters/1">1</a>
@@ -59,7 +59,7 @@ def test_ranobes_pagination_parser_creates_urls() -> None:
         <a href="/chapters/3">3</a>
     </div>
     """
-    parser = RanobesPaginationParser(make_soup(html), URL("https://ranobes.net/book"))
+    parser = RanobesPaginationParser(parse(html), URL("https://ranobes.net/book"))
 
     pages = parser.parse()
 
@@ -67,9 +67,9 @@ def test_ranobes_pagination_parser_creates_urls() -> None:
     assert pages[-1] == URL("/chapters/3")
 
 
-def test_ranobes_pagination_parser_requires_links() -> None:
+def test_ranobes_pagination_parser_requires_links(parse: Parse) -> None:
     parser = RanobesPaginationParser(
-        make_soup("<div class='pages'></div>"), URL("https://ranobes.net/book")
+        parse("<div class='pages'></div>"), URL("https://ranobes.net/book")
     )
 
     try:
@@ -80,41 +80,39 @@ def test_ranobes_pagination_parser_requires_links() -> None:
         raise AssertionError("PaginationParsingError was not raised")
 
 
-def test_ranobes_chapter_list_parser_extracts_entries() -> None:
+def test_ranobes_chapter_list_parser_extracts_entries(parse: Parse) -> None:
     html = """
     <div id="dle-content">
         <div class="cat_line"><a href="https://ranobes.net/1" title="Ch 1"></a></div>
         <div class="cat_line"><a href="https://ranobes.net/2" title="Ch 2"></a></div>
     </div>
     """
-    parser = RanobesChapterListParser(
-        make_soup(html), URL("https://ranobes.net/page/1")
-    )
+    parser = RanobesChapterListParser(parse(html), URL("https://ranobes.net/page/1"))
 
     entries = parser.parse()
 
     assert [entry.title for entry in entries] == ["Ch 1", "Ch 2"]
 
 
-def test_ranobes_chapter_parser_falls_back_to_article() -> None:
+def test_ranobes_chapter_parser_falls_back_to_article(parse: Parse) -> None:
     html = """
     <div id="dle-content">
         <h1>Title</h1>
         <div id="arrticle" class="text">Line1\n\nLine2</div>
     </div>
     """
-    parser = RanobesChapterParser(make_soup(html), URL("https://ranobes.net/chapter"))
+    parser = RanobesChapterParser(parse(html), URL("https://ranobes.net/chapter"))
 
     parsed = parser.parse()
 
     assert parsed.paragraphs == ["Line1", "Line2"]
 
 
-def test_ranobes_chapter_parser_requires_content() -> None:
+def test_ranobes_chapter_parser_requires_content(parse: Parse) -> None:
     html = """
     <div id="dle-content"><h1>Title</h1></div>
     """
-    parser = RanobesChapterParser(make_soup(html), URL("https://ranobes.net/chapter"))
+    parser = RanobesChapterParser(parse(html), URL("https://ranobes.net/chapter"))
 
     try:
         parser.parse()
@@ -0,0 +1,42 @@
+import json
+
+import pytest
+from yarl import URL
+
+from infra.main_page.renovels import main_page_loader
+from infra.main_page.renovels.main_page_loader import (
+    CHAPTERS_API,
+    CHAPTERS_PAGE_SIZE,
+    RenovelsLoader,
+)
+
+PAGES = {
+    1: {
+        "next": 2,
+        "previous": None,
+        "results": [{"id": 11, "tome": 1}, {"id": 12, "tome": 1}],
+    },
+    2: {"next": 3, "previous": 1, "results": [{"id": 13, "tome": 2}]},
+    3: {"next": None, "previous": 2, "results": [{"id": 14}]},
+}
+
+
+@pytest.mark.asyncio
+async def test_catalog_follows_next_cursor(monkeypatch: pytest.MonkeyPatch) -> None:
+    requested: list[URL] = []
+
+    async def get_bytes_response(_: object, url: URL) -> bytes:
+        requested.append(url)
+        return json.dumps(PAGES[int(url.query["page"])]).encode()
+
+    monkeypatch.setattr(main_page_loader, "get_bytes_response", get_bytes_response)
+    loader = RenovelsLoader(URL("https://renovels.org/novel/x"), None, None)  # type: ignore[arg-type]
+
+    chapters = await loader.collect_chapters(branch=7)
+
+    assert [i.url for i in chapters] == [CHAPTERS_API / str(i) for i in range(11, 15)]
+    assert [i.id for i in chapters] == [1, 2, 3, 4]
+    assert [i.volume for i in chapters] == [1, 1, 2, None]
+    assert [i.query["page"] for i in requested] == ["1", "2", "3"]
+    assert {i.query["count"] for i in requested} == {str(CHAPTERS_PAGE_SIZE)}
+    assert {i.query["branch_id"] for i in requested} == {"7"}
@@ -0,0 +1,41 @@
+import json
+
+import pytest
+from yarl import URL
+
+from infra.main_page.exceptions import JsonParsingError, JsonValidationError
+from infra.main_page.renovels.models import RenovelsChapter, validate_json
+
+URL_ = URL("https://api.renovels.org/api/v2/titles/chapters/1")
+
+
+def test_lean_chapter_ignores_fields_it_does_not_read() -> None:
+    body = json.dumps(
+        {
+            "id": 1,
+            "name": "Глава 1",
+            "content": "<p>Текст</p>",
+            "upload_date": "not a date",
+            "publishers": [{"id": "not validated"}],
+            "next": None,
+        },
+        ensure_ascii=False,
+    ).encode()
+
+    chapter = validate_json(RenovelsChapter, body, URL_)
+
+    assert chapter == RenovelsChapter(id=1, name="Глава 1", content="<p>Текст</p>")
+
+
+def test_invalid_json_raises_parsing_error() -> None:
+    with pytest.raises(JsonParsingError) as exc:
+        validate_json(RenovelsChapter, b"{'id': 1", URL_)
+
+    assert exc.value.page_url == URL_
+
+
+def test_mismatched_json_raises_validation_error() -> None:
+    with pytest.raises(JsonValidationError) as exc:
+        validate_json(RenovelsChapter, b'{"id": 1, "name": "x"}', URL_)
+
+    assert "content" in exc.value.detail
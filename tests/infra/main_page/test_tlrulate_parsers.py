@@ -1,15 +1,15 @@
-from bs4 import BeautifulSoup
+from collections.abc import Callable
+
 from yarl import URL
 
+from infra.main_page.document import Node
 from infra.main_page.exceptions import MainPageParsingError
 from infra.main_page.tlrulate import TlRulateMainPageParser
 
-
-def make_soup(html: str) -> BeautifulSoup:
-    return BeautifulSoup(html, "lxml")
+Parse = Callable[[str], Node]
 
 
-def test_tlrulate_main_page_parser_returns_chapters_and_covers() -> None:
+def test_tlrulate_main_page_parser_returns_chapters_and_covers(parse: Parse) -> None:
     html = """
     <div class="book-header"><h1>Novel</h1></div>
     <div class="images">
@@ -24,7 +24,7 @@ def test_tlrulate_main_page_parser_returns_chapters_and_covers() -> None:
     </div>
     """
     parser = TlRulateMainPageParser(
-        make_soup(html), URL("https://tl.rulate.ru/book"), URL("https://tl.rulate.ru")
+        parse(html), URL("https://tl.rulate.ru/book"), URL("https://tl.rulate.ru")
     )
 
     parsed = parser.parse()
@@ -34,9 +34,9 @@ def test_tlrulate_main_page_parser_returns_chapters_and_covers() -> None:
     assert [chapter.name for chapter in parsed.chapters] == ["Chapter 1", "Chapter 2"]
 
 
-def test_tlrulate_main_page_parser_requires_header() -> None:
+def test_tlrulate_main_page_parser_requires_header(parse: Parse) -> None:
     parser = TlRulateMainPageParser(
-        make_soup("<div></div>"),
+        parse("<div></div>"),
         URL("https://tl.rulate.ru/book"),
         URL("https://tl.rulate.ru"),
     )
@@ -0,0 +1,119 @@
+import hashlib
+import zipfile
+from pathlib import Path
+
+import pytest
+from ebooklib import ITEM_IMAGE, epub
+from yarl import URL
+
+from domain import LoadedChapter, LoadedImage, SaverContext, SpooledImage
+from infra.saver import EbookSaver, StreamingEbookSaver, zip_writer
+from infra.saver.zip_writer import ZipWriter
+from logic import Saver
+
+PHOTO = LoadedImage(url=URL("http://e.com/a.jpg"), data=b"\xff\xd8\xff" * 1000)
+SPOOLED = b"\x89PNG\r\n\x1a\n" * 1000
+
+
+def chapter(tmp_path: Path) -> LoadedChapter:
+    path = tmp_path / "spooled"
+    path.write_bytes(SPOOLED)
+    spooled = SpooledImage(
+        url=URL("http://e.com/b.png"),
+        path=path,
+        size=len(SPOOLED),
+        digest=hashlib.sha256(SPOOLED).hexdigest(),
+    )
+    return LoadedChapter(
+        id=1,
+        name="Chapter",
+        url=URL("http://e.com/1"),
+        paragraphs=["text " * 1000],
+        images=[PHOTO, spooled],
+        title="Chapter",
+    )
+
+
+def context(tmp_path: Path, level: int) -> SaverContext:
+    return SaverContext(
+        title="Book",
+        language="ru",
+        covers=[],
+        directory=tmp_path / "out",
+        compress_level=level,
+    )
+
+
+def compression(path: Path) -> dict[str, int]:
+    with zipfile.ZipFile(path) as book:
+        assert book.testzip() is None
+        return {
+            Path(i.filename).suffix or i.filename: i.compress_type
+            for i in book.infolist()
+        }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("saver_type", [EbookSaver, StreamingEbookSaver])
+async def test_media_is_stored_and_text_deflated(
+    tmp_path: Path, saver_type: type[Saver]
+) -> None:
+    with saver_type(context(tmp_path, 9)) as saver:
+        await saver.save_chapter(chapter(tmp_path))
+
+    path = tmp_path / "out" / "Book.epub"
+    types = compression(path)
+    assert types["mimetype"] == zipfile.ZIP_STORED
+    assert types[".jpg"] == types[".png"] == zipfile.ZIP_STORED
+    assert types[".xhtml"] == types[".opf"] == zipfile.ZIP_DEFLATED
+    book = epub.read_epub(str(path))  # type: ignore
+    contents = {i.get_content() for i in book.get_items_of_type(ITEM_IMAGE)}  # type: ignore
+    assert contents == {PHOTO.data, SPOOLED}
+    page = book.get_item_with_href("chapters/1. Chapter.xhtml")  # type: ignore
+    assert b"text text" in page.get_content()  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_level_zero_stores_everything(tmp_path: Path) -> None:
+    with EbookSaver(context(tmp_path, 0)) as saver:
+        await saver.save_chapter(chapter(tmp_path))
+
+    types = compression(tmp_path / "out" / "Book.epub")
+    assert set(types.values()) == {zipfile.ZIP_STORED}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("saver_type", [EbookSaver, StreamingEbookSaver])
+async def test_zip64_records_are_readable(
+    tmp_path: Path, saver_type: type[Saver], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # every entry past the first few, and the directory, need ZIP64 records
+    monkeypatch.setattr(zip_writer, "ZIP64_LIMIT", 1000)
+    monkeypatch.setattr(zip_writer, "ZIP_FILECOUNT_LIMIT", 3)
+    with saver_type(context(tmp_path, 9)) as saver:
+        await saver.save_chapter(chapter(tmp_path))
+
+    path = tmp_path / "out" / "Book.epub"
+    assert compression(path)[".png"] == zipfile.ZIP_STORED
+    book = epub.read_epub(str(path))  # type: ignore
+    contents = {i.get_content() for i in book.get_items_of_type(ITEM_IMAGE)}  # type: ignore
+    assert contents == {PHOTO.data, SPOOLED}
+
+
+def test_names_and_contents_survive_zipfile(tmp_path: Path) -> None:
+    spooled = tmp_path / "spooled"
+    spooled.write_bytes(SPOOLED)
+    out = ZipWriter(tmp_path / "a.zip", level=9)
+    out.writestr("mimetype", "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+    out.writestr("Глава 1.xhtml", "текст " * 100)
+    out.write_deflated("b.txt", b"b" * 100, zip_writer.deflate(b"b" * 100, 1))
+    out.write_file("b.png", spooled, len(SPOOLED))
+    out.close()
+
+    with zipfile.ZipFile(tmp_path / "a.zip") as book:
+        assert book.testzip() is None
+        assert book.namelist() == ["mimetype", "Глава 1.xhtml", "b.txt", "b.png"]
+        assert book.read("Глава 1.xhtml") == ("текст " * 100).encode()
+        assert book.read("b.txt") == b"b" * 100
+        assert book.read("b.png") == SPOOLED
+        assert book.getinfo("Глава 1.xhtml").compress_type == zipfile.ZIP_DEFLATED
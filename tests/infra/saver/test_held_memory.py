@@ -0,0 +1,93 @@
+import time
+from pathlib import Path
+
+import pytest
+from yarl import URL
+
+from domain import Chapter, LoadedChapter, LoadedImage, SaverContext, VolumeSplit
+from infra.saver import EbookSaver, StreamingEbookSaver
+from logic import ChapterLoader, SaverLoaderConnector
+from logic.memory_budget import MemoryBudget
+
+IMAGE = b"\xff\xd8\xff" + bytes(997)
+
+
+def chapter(id: int) -> LoadedChapter:
+    return LoadedChapter(
+        id=id,
+        name=f"Chapter {id}",
+        url=URL(f"http://e.com/{id}"),
+        paragraphs=["text " * 20],
+        images=[LoadedImage(url=URL(f"http://e.com/{id}.jpg"), data=IMAGE)],
+        title=f"Chapter {id}",
+    )
+
+
+def context(directory: Path, **fields: object) -> SaverContext:
+    return SaverContext(
+        title="Book", language="ru", covers=[], directory=directory, **fields
+    )
+
+
+class NoChapterLoader(ChapterLoader):
+    async def load_chapter(self, chapter: Chapter) -> LoadedChapter:
+        raise NotImplementedError
+
+
+async def store(budget: MemoryBudget, saver: EbookSaver, ids: range) -> None:
+    connector = SaverLoaderConnector(
+        saver,
+        NoChapterLoader(None),  # type: ignore[arg-type]
+        memory_budget=budget,
+    )
+    for id in ids:
+        await connector.store(chapter(id))
+
+
+@pytest.mark.asyncio
+async def test_ebook_saver_holds_its_chapters_until_exit(tmp_path: Path) -> None:
+    budget = MemoryBudget(limit=3 * chapter(1).nbytes)
+
+    with EbookSaver(context(tmp_path)) as saver, budget.holding(saver):
+        await store(budget, saver, range(1, 4))
+        assert budget.used == 0
+        assert budget.held == 3 * chapter(1).nbytes
+        assert budget.exceeded
+
+    assert budget.held == 0 and not budget.exceeded
+    assert budget.high_water == 3 * chapter(1).nbytes
+
+
+@pytest.mark.asyncio
+async def test_written_volumes_leave_the_budget(tmp_path: Path) -> None:
+    budget = MemoryBudget()
+    plan = [Chapter(i, f"Chapter {i}", URL(f"http://e.com/{i}")) for i in range(1, 6)]
+    split = VolumeSplit(chapters=2)
+    saver = EbookSaver(context(tmp_path, chapters=plan, volumes=split))
+
+    with saver, budget.holding(saver):
+        # chapter 2 closes the first volume, 5 waits for 4
+        await store(budget, saver, range(1, 4))
+        await store(budget, saver, range(5, 6))
+        deadline = time.monotonic() + 5
+        while budget.held > 2 * chapter(1).nbytes and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert budget.held == 2 * chapter(1).nbytes
+
+    assert budget.held == 0
+
+
+@pytest.mark.asyncio
+async def test_streaming_saver_holds_only_its_reorder_buffer(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(StreamingEbookSaver, "reorder_window", 2)
+    budget = MemoryBudget()
+
+    with StreamingEbookSaver(context(tmp_path)) as saver, budget.holding(saver):
+        await store(budget, saver, range(1, 6))
+        # images are in the zip already, the last two pages wait for their turn
+        assert budget.held == 2 * chapter(1).text_nbytes
+
+    assert budget.held == 0
+    assert budget.high_water < 2 * chapter(1).nbytes
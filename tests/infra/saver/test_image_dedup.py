@@ -0,0 +1,68 @@
+from pathlib import Path
+
+import pytest
+from ebooklib import ITEM_IMAGE, epub
+from yarl import URL
+
+from domain import LoadedChapter, LoadedImage, SaverContext
+from infra.saver import EbookSaver, FilesSaver
+
+BANNER = LoadedImage(url=URL("http://e.com/banner.png"), data=b"\x89PNG banner")
+
+
+def chapter(id: int, *images: LoadedImage) -> LoadedChapter:
+    return LoadedChapter(
+        id=id,
+        name=f"Chapter {id}",
+        url=URL(f"http://e.com/{id}"),
+        paragraphs=["text"],
+        images=list(images),
+        title=f"Chapter {id}",
+    )
+
+
+@pytest.mark.asyncio
+async def test_files_saver_links_repeated_images(tmp_path: Path) -> None:
+    other = LoadedImage(url=URL("http://e.com/map.png"), data=b"\x89PNG map")
+    context = SaverContext(title="Book", language="ru", covers=[], directory=tmp_path)
+
+    with FilesSaver(context) as saver:
+        await saver.save_chapter(chapter(1, BANNER, other))
+        await saver.save_chapter(chapter(2, BANNER))
+
+    first, second = tmp_path / "1. Chapter 1_1.png", tmp_path / "2. Chapter 2_1.png"
+    assert second.read_bytes() == BANNER.data
+    assert first.stat().st_ino == second.stat().st_ino
+    assert (tmp_path / "1. Chapter 1_2.png").stat().st_nlink == 1
+
+
+@pytest.mark.asyncio
+async def test_files_saver_shares_the_store_across_books(tmp_path: Path) -> None:
+    store = tmp_path / "images"
+    for title in ("First", "Second"):
+        context = SaverContext(
+            title=title,
+            language="ru",
+            covers=[],
+            directory=tmp_path / title,
+            image_store=store,
+        )
+        with FilesSaver(context) as saver:
+            await saver.save_chapter(chapter(1, BANNER))
+
+    (stored,) = store.glob("*/*.png")
+    assert stored.stat().st_nlink == 3
+    assert (tmp_path / "Second" / "1. Chapter 1_1.png").read_bytes() == BANNER.data
+
+
+@pytest.mark.asyncio
+async def test_ebook_saver_adds_repeated_images_once(tmp_path: Path) -> None:
+    context = SaverContext(title="Book", language="ru", covers=[], directory=tmp_path)
+
+    with EbookSaver(context) as saver:
+        for id in range(1, 4):
+            await saver.save_chapter(chapter(id, BANNER))
+
+    book = epub.read_epub(str(tmp_path / "Book.epub"))  # type: ignore
+    images = list(book.get_items_of_type(ITEM_IMAGE))  # type: ignore
+    assert len(images) == 1
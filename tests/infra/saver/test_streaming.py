@@ -0,0 +1,88 @@
+import random
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+from ebooklib import ITEM_DOCUMENT, ITEM_IMAGE, epub
+from yarl import URL
+
+from domain import LoadedChapter, LoadedImage, SaverContext, SpooledImage
+from infra.saver import StreamingEbookSaver
+
+BANNER = LoadedImage(url=URL("http://e.com/banner.png"), data=b"\x89PNG banner")
+
+
+def chapter(id: int, *images: LoadedImage) -> LoadedChapter:
+    return LoadedChapter(
+        id=id,
+        name=f"Chapter {id}",
+        url=URL(f"http://e.com/{id}"),
+        paragraphs=[f"text {id}"],
+        images=list(images),
+        title=f"Chapter {id}",
+    )
+
+
+def context(directory: Path) -> SaverContext:
+    return SaverContext(title="Book", language="ru", covers=[], directory=directory)
+
+
+def spine_files(book: epub.EpubBook) -> list[str]:
+    spine = [book.get_item_with_id(i) for i, _ in book.spine[1:]]  # type: ignore
+    return [i.file_name for i in spine]  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_chapters_are_written_in_order(tmp_path: Path) -> None:
+    ids = list(range(1, 201))
+    random.Random(1).shuffle(ids)
+
+    with StreamingEbookSaver(context(tmp_path)) as saver:
+        for id in ids:
+            await saver.save_chapter(chapter(id, BANNER))
+        assert saver.get_part_path().exists()
+
+    book = epub.read_epub(str(tmp_path / "Book.epub"))  # type: ignore
+    assert spine_files(book) == [
+        f"chapters/{i}. Chapter {i}.xhtml" for i in range(1, 201)
+    ]
+    (image,) = book.get_items_of_type(ITEM_IMAGE)  # type: ignore
+    assert image.get_content() == BANNER.data  # type: ignore
+    page = book.get_item_with_href("chapters/7. Chapter 7.xhtml")  # type: ignore
+    assert b"<p>text 7</p>" in page.get_content()  # type: ignore
+    assert not (tmp_path / "Book.epub.part").exists()
+
+
+@pytest.mark.asyncio
+async def test_failed_book_keeps_the_saved_chapters(tmp_path: Path) -> None:
+    with pytest.raises(RuntimeError), StreamingEbookSaver(context(tmp_path)) as saver:
+        await saver.save_chapter(chapter(2))
+        await saver.save_chapter(chapter(1))
+        raise RuntimeError
+
+    assert not (tmp_path / "Book.epub").exists()
+    book = epub.read_epub(str(tmp_path / "Book.epub.part"))  # type: ignore
+    assert spine_files(book) == [
+        "chapters/1. Chapter 1.xhtml",
+        "chapters/2. Chapter 2.xhtml",
+    ]
+    assert len(list(book.get_items_of_type(ITEM_DOCUMENT))) == 3  # type: ignore
+
+
+@pytest.mark.asyncio
+async def test_covers_and_spooled_images_are_copied(tmp_path: Path) -> None:
+    path = tmp_path / "spooled"
+    path.write_bytes(b"\x89PNG spooled")
+    spooled = SpooledImage(
+        url=URL("http://e.com/map.png"), path=path, size=12, digest="map"
+    )
+    cover = LoadedImage(url=URL("http://e.com/cover.jpg"), data=b"\xff\xd8 cover")
+    saver_context = replace(context(tmp_path / "out"), covers=[cover])
+
+    with StreamingEbookSaver(saver_context) as saver:
+        await saver.save_chapter(chapter(1, spooled))
+
+    book = epub.read_epub(str(tmp_path / "out" / "Book.epub"))  # type: ignore
+    contents = {i.get_content() for i in book.get_items_of_type(ITEM_IMAGE)}  # type: ignore
+    assert contents == {spooled.data, cover.data}
+    assert spine_files(book) == ["covers.xhtml", "chapters/1. Chapter 1.xhtml"]
@@ -0,0 +1,119 @@
+import time
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+from ebooklib import epub
+from yarl import URL
+
+from domain import Chapter, LoadedChapter, LoadedImage, SaverContext, VolumeSplit
+from infra.saver import EbookSaver
+
+
+def chapter(id: int, *images: LoadedImage) -> LoadedChapter:
+    return LoadedChapter(
+        id=id,
+        name=f"Chapter {id}",
+        url=URL(f"http://e.com/{id}"),
+        paragraphs=[f"text {id}"],
+        images=list(images),
+        title=f"Chapter {id}",
+    )
+
+
+def context(directory: Path, split: VolumeSplit, *volumes: int) -> SaverContext:
+    chapters = [
+        Chapter(i, f"Chapter {i}", URL(f"http://e.com/{i}"), volume=volume)
+        for i, volume in enumerate(volumes, 1)
+    ]
+    return SaverContext(
+        title="Book",
+        language="ru",
+        covers=[],
+        directory=directory,
+        chapters=chapters,
+        volumes=split,
+    )
+
+
+def volume_chapters(path: Path) -> list[str]:
+    book = epub.read_epub(str(path))  # type: ignore
+    spine = [book.get_item_with_id(i) for i, _ in book.spine[1:]]  # type: ignore
+    return [Path(i.file_name).stem for i in spine]  # type: ignore
+
+
+def wait_for(path: Path) -> None:
+    deadline = time.monotonic() + 5
+    while not path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_volumes_are_written_once_complete(tmp_path: Path) -> None:
+    split = VolumeSplit(chapters=2)
+    saver_context = context(tmp_path, split, *[None] * 5)
+
+    with EbookSaver(saver_context) as saver:
+        for id in (2, 4, 1):
+            await saver.save_chapter(chapter(id))
+        wait_for(tmp_path / "Book_vol_01.epub")
+        assert (tmp_path / "Book_vol_01.epub").exists()
+        assert not (tmp_path / "Book_vol_02.epub").exists()
+        for id in (5, 3):
+            await saver.save_chapter(chapter(id))
+
+    assert [volume_chapters(tmp_path / f"Book_vol_0{i}.epub") for i in (1, 2, 3)] == [
+        ["1. Chapter 1", "2. Chapter 2"],
+        ["3. Chapter 3", "4. Chapter 4"],
+        ["5. Chapter 5"],
+    ]
+    assert saver.artifact() == tmp_path
+    assert saver.output_location(chapter(3)) == (
+        f"{tmp_path / 'Book_vol_02.epub'}#chapters/3. Chapter 3.xhtml"
+    )
+
+
+@pytest.mark.asyncio
+async def test_volumes_follow_the_site_and_size(tmp_path: Path) -> None:
+    image = LoadedImage(url=URL("http://e.com/a.png"), data=b"\x89PNG" * 100)
+    split = VolumeSplit(nbytes=300, source=True)
+    saver_context = context(tmp_path, split, 1, 1, 1, 2, 2)
+
+    with EbookSaver(saver_context) as saver:
+        for id in range(1, 6):
+            images = [image] if id == 2 else []
+            await saver.save_chapter(chapter(id, *images))
+
+    assert [volume_chapters(i) for i in sorted(tmp_path.glob("*.epub"))] == [
+        ["1. Chapter 1", "2. Chapter 2"],
+        ["3. Chapter 3"],
+        ["4. Chapter 4", "5. Chapter 5"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_missing_chapters_close_volumes_on_exit(tmp_path: Path) -> None:
+    saver_context = context(tmp_path, VolumeSplit(chapters=10), *[None] * 3)
+
+    with EbookSaver(saver_context) as saver:
+        await saver.save_chapter(chapter(1))
+        await saver.save_chapter(chapter(3))
+
+    assert volume_chapters(tmp_path / "Book_vol_01.epub") == [
+        "1. Chapter 1",
+        "3. Chapter 3",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_failed_book_keeps_the_complete_volumes(tmp_path: Path) -> None:
+    saver_context = context(tmp_path, VolumeSplit(chapters=1), *[None] * 3)
+
+    with pytest.raises(RuntimeError), EbookSaver(saver_context) as saver:
+        await saver.save_chapter(chapter(1))
+        await saver.save_chapter(chapter(3))
+        raise RuntimeError
+
+    assert [i.name for i in tmp_path.glob("*.epub")] == ["Book_vol_01.epub"]
+    unsplit = replace(saver_context, volumes=None)
+    assert EbookSaver(unsplit).artifact() == tmp_path / "Book.epub"
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+from yarl import URL
+
+from domain import Chapter, LoadedChapter, SaverContext
+from infra.main_page.exceptions import MainPageParsingError
+from logic import ChapterLoader, Saver, SaverLoaderConnector
+from logic.deadline import DeadlineScope, check_deadline, current_deadline
+from logic.exceptions.base import DeadlineExceededError
+
+
+class SlowChapterLoader(ChapterLoader):
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+
+    async def load_chapter(self, chapter: Chapter) -> LoadedChapter:
+        await asyncio.sleep(self.delay)
+        return LoadedChapter(
+            id=chapter.id,
+            name=chapter.name,
+            url=chapter.url,
+            paragraphs=["text"],
+            images=[],
+            title="title",
+        )
+
+
+class ListSaver(Saver):
+    def __init__(self) -> None:
+        super().__init__(SaverContext(title="t", language="ru", covers=[]))
+        self.saved: list[LoadedChapter] = []
+
+    def __exit__(self, *_) -> bool:
+        return True
+
+    async def save_chapter(self, loaded_chapter: LoadedChapter) -> None:
+        self.saved.append(loaded_chapter)
+
+
+def make_chapter() -> Chapter:
+    return Chapter(id=1, name="First", url=URL("http://example.com/1"))
+
+
+@pytest.mark.asyncio
+async def test_nested_scope_only_shortens_deadline() -> None:
+    with DeadlineScope(1) as outer:
+        with DeadlineScope(100) as inner:
+            assert inner == outer
+        with DeadlineScope(0.5) as inner:
+            assert inner is not None and outer is not None
+            assert inner.when < outer.when
+    assert current_deadline() is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error",
+    [MainPageParsingError(detail="no title"), DeadlineExceededError(scope="saving")],
+)
+async def test_scope_lets_project_errors_through(error: Exception) -> None:
+    with DeadlineScope(1) as outer:
+        with pytest.raises(type(error)) as raised, DeadlineScope(0.5):
+            raise error
+        assert raised.value is error
+        assert current_deadline() == outer
+    assert current_deadline() is None
+
+
+@pytest.mark.asyncio
+async def test_check_deadline_raises_after_expiry() -> None:
+    with DeadlineScope(0.01):
+        await asyncio.sleep(0.02)
+        with pytest.raises(DeadlineExceededError):
+            check_deadline()
+
+
+@pytest.mark.asyncio
+async def test_connector_defers_slow_chapter() -> None:
+    saver = ListSaver()
+    connector = SaverLoaderConnector(
+        saver, SlowChapterLoader(delay=1), chapter_deadline=0.05
+    )
+
+    await connector.handle(make_chapter())
+
+    assert connector.deferred == [make_chapter()]
+    assert saver.saved == []
+
+
+@pytest.mark.asyncio
+async def test_connector_saves_chapter_within_deadline() -> None:
+    saver = ListSaver()
+    connector = SaverLoaderConnector(
+        saver, SlowChapterLoader(delay=0), chapter_deadline=1
+    )
+
+    await connector.handle(make_chapter())
+
+    assert connector.deferred == []
+    assert len(saver.saved) == 1
@@ -0,0 +1,45 @@
+import contextlib
+from collections.abc import AsyncIterator, Iterator
+
+import pytest
+
+from domain.exceptions import BaseDomainError
+from infra.exceptions.base import BaseInfraError
+from infra.main_page.exceptions import MainPageParsingError
+from logic.exceptions.base import DeadlineExceededError, RetryableError
+
+ERRORS = [
+    BaseDomainError(),
+    BaseInfraError(),
+    MainPageParsingError(detail="no title"),
+    DeadlineExceededError(scope="saving"),
+    RetryableError(exception=ValueError()),
+]
+
+
+@contextlib.contextmanager
+def scope() -> Iterator[None]:
+    yield
+
+
+@contextlib.asynccontextmanager
+async def async_scope() -> AsyncIterator[None]:
+    yield
+
+
+@pytest.mark.parametrize("error", ERRORS)
+def test_errors_leave_contextmanager_as_is(error: Exception) -> None:
+    with pytest.raises(type(error)) as raised, scope():
+        raise error
+
+    assert raised.value is error
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", ERRORS)
+async def test_errors_leave_asynccontextmanager_as_is(error: Exception) -> None:
+    with pytest.raises(type(error)) as raised:
+        async with async_scope():
+            raise error
+
+    assert raised.value is error
@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+from yarl import URL
+
+from domain import Image, LoadedImage, MainPageInfo
+from logic import ChapterLoader, ImageLoader, MainPageLoader
+from logic.rate_limit import HostLimiter
+
+
+class DelayedImageLoader(ImageLoader):
+    """Later images arrive first, missing ones fail."""
+
+    def __init__(self) -> None:
+        self.started = 0
+
+    async def load_image(self, image: Image) -> LoadedImage | None:
+        self.started += 1
+        delay = 0.2 / int(image.url.name)
+        await asyncio.sleep(delay)
+        if image.url.name == "404":
+            return None
+        return LoadedImage(url=image.url, data=image.url.name.encode())
+
+
+class CoverLoader(MainPageLoader):
+    async def load(self) -> MainPageInfo:
+        raise NotImplementedError
+
+    def get_loader_for_chapter(self) -> ChapterLoader:
+        raise NotImplementedError
+
+
+@pytest.mark.asyncio
+async def test_covers_load_concurrently_in_order() -> None:
+    image_loader = DelayedImageLoader()
+    limiter = HostLimiter(max_rate=10, time_period=1)
+    loader = CoverLoader(
+        URL("https://e.com/book"),
+        image_loader,
+        None,  # type: ignore[arg-type]
+        limiter,
+    )
+    urls = [URL(f"https://img.e.com/{i}") for i in ("1", "404", "2", "3")]
+
+    # one at a time the covers would take 0.37 seconds
+    covers = await asyncio.wait_for(loader.load_covers(urls), timeout=0.3)
+
+    assert [i.data for i in covers] == [b"1", b"2", b"3"]
+    assert image_loader.started == 4
+    assert not limiter.for_host("img.e.com").has_capacity(10)
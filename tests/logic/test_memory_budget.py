@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+from yarl import URL
+
+from domain import Chapter, LoadedChapter, SaverContext
+from logic import ChapterLoader, Saver, SaverLoaderConnector
+from logic.exceptions.base import RetryableError
+from logic.memory_budget import MemoryBudget
+
+
+class FlakyChapterLoader(ChapterLoader):
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+        self.calls = 0
+
+    async def load_chapter(self, chapter: Chapter) -> LoadedChapter:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RetryableError(exception=ConnectionError("reset"))
+        return LoadedChapter(
+            id=chapter.id,
+            name=chapter.name,
+            url=chapter.url,
+            paragraphs=["text"],
+            images=[],
+            title="title",
+        )
+
+
+class ListSaver(Saver):
+    def __init__(self) -> None:
+        super().__init__(SaverContext(title="t", language="ru", covers=[]))
+        self.saved: list[LoadedChapter] = []
+
+    def __exit__(self, *_) -> bool:
+        return True
+
+    async def save_chapter(self, loaded_chapter: LoadedChapter) -> None:
+        self.saved.append(loaded_chapter)
+
+
+@pytest.mark.asyncio
+async def test_slot_waits_while_budget_exceeded() -> None:
+    budget = MemoryBudget(limit=10)
+    entered = asyncio.Event()
+
+    async def second() -> None:
+        async with budget.slot():
+            entered.set()
+
+    async with budget.slot():
+        budget.charge(20)
+        task = asyncio.create_task(second())
+        await asyncio.sleep(0.01)
+        assert not entered.is_set()
+        budget.release(15)
+        await asyncio.wait_for(entered.wait(), 1)
+    await task
+
+
+@pytest.mark.asyncio
+async def test_slot_always_admits_single_fetch() -> None:
+    budget = MemoryBudget(limit=10)
+    budget.charge(100)
+
+    async with asyncio.timeout(1), budget.slot():
+        pass
+
+
+def test_high_water_mark_tracks_peak() -> None:
+    budget = MemoryBudget()
+    budget.charge(5)
+    budget.charge(7)
+    budget.release(10)
+    budget.charge(1)
+
+    assert budget.used == 3
+    assert budget.high_water == 12
+
+
+@pytest.mark.asyncio
+async def test_retryable_error_leaves_slot_and_is_retried(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    sleep = asyncio.sleep
+    monkeypatch.setattr(asyncio, "sleep", lambda _: sleep(0))
+    saver = ListSaver()
+    loader = FlakyChapterLoader(failures=1)
+    budget = MemoryBudget(limit=10)
+    connector = SaverLoaderConnector(saver, loader, memory_budget=budget)
+
+    await connector.handle(Chapter(id=1, name="First", url=URL("http://e.com/1")))
+
+    assert loader.calls == 2
+    assert [i.id for i in saver.saved] == [1]
+    # the failed attempt gave its slot back
+    budget.charge(100)
+    async with asyncio.timeout(1), budget.slot():
+        pass
@@ -0,0 +1,15 @@
+from yarl import URL
+
+from logic.rate_limit import HostLimiter
+
+
+def test_limiter_is_shared_per_host() -> None:
+    limiter = HostLimiter(max_rate=10, time_period=1)
+
+    first = limiter.for_url(URL("https://tl.rulate.ru/book/1"))
+    second = limiter.for_url(URL("https://tl.rulate.ru/book/2/3"))
+    other = limiter.for_url(URL("https://ranobes.com/ranobe/1"))
+
+    assert first is second
+    assert first is not other
+    assert first.max_rate == 10
@@ -0,0 +1,51 @@
+import random
+
+from yarl import URL
+
+from domain import Chapter
+from logic.watch import SeenIndex, Validators, jittered
+
+
+def make_chapters(count: int) -> list[Chapter]:
+    return [Chapter(i, f"Chapter {i}", URL(f"http://e.com/{i}")) for i in range(count)]
+
+
+def test_seen_index_returns_chapters_after_last_seen() -> None:
+    chapters = make_chapters(10)
+    seen = SeenIndex()
+    seen.add(i.url for i in chapters[:7])
+
+    assert seen.unseen(chapters) == chapters[7:]
+    assert seen.unseen(chapters[:7]) == []
+
+
+def test_seen_index_unknown_book_is_all_new() -> None:
+    chapters = make_chapters(3)
+
+    assert SeenIndex().unseen(chapters) == chapters
+
+
+def test_seen_index_round_trips_through_bytes() -> None:
+    seen = SeenIndex()
+    seen.add(i.url for i in make_chapters(5))
+
+    restored = SeenIndex.from_bytes(seen.to_bytes())
+
+    assert restored.digests == seen.digests
+    assert len(seen.to_bytes()) == 5 * 8
+
+
+def test_validators_build_conditional_headers() -> None:
+    assert Validators().headers() == {}
+    assert Validators(etag='"x"', last_modified="Mon").headers() == {
+        "If-None-Match": '"x"',
+        "If-Modified-Since": "Mon",
+    }
+
+
+def test_jittered_stays_within_bounds() -> None:
+    rng = random.Random(0)
+    delays = [jittered(100, 0.2, rng) for _ in range(100)]
+
+    assert all(80 <= i <= 120 for i in delays)
+    assert len(set(delays)) > 1
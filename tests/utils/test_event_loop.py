@@ -0,0 +1,23 @@
+import sys
+
+import pytest
+
+from utils.event_loop import get_loop_factory
+from utils.exceptions import EventLoopUnavailableError
+
+
+def test_asyncio_loop_keeps_default_factory() -> None:
+    assert get_loop_factory("asyncio") is None
+
+
+def test_auto_falls_back_without_uvloop(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(sys.modules, "uvloop", None)
+
+    assert get_loop_factory("auto") is None
+
+
+def test_uvloop_requires_package(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(sys.modules, "uvloop", None)
+
+    with pytest.raises(EventLoopUnavailableError):
+        get_loop_factory("uvloop")